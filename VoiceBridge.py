@@ -1,168 +1,3902 @@
 import asyncio
 import json
+import sys
 import base64
 import queue
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import sounddevice as sd
 import numpy as np
 import websockets
 from dotenv import load_dotenv
 import os
 import logging
 from google.cloud import speech
-import pyaudio
+import grpc
 import requests
 import time
 from datetime import datetime
 from pathlib import Path
-import struct
 import re
+import random
+import concurrent.futures
+import wave
+import argparse
+import sqlite3
+import multiprocessing
+from multiprocessing import shared_memory
+import uuid
+from collections import Counter, OrderedDict, deque, namedtuple
+
+# PortAudio bindings; without them only the null, WAV-file and loopback audio backends work
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+try:
+    import sounddevice as sd
+except (ImportError, OSError):
+    sd = None
+
+# Optional on-device speech recognition (pip install faster-whisper)
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+# Optional compressed upload of STT audio (pip install soundfile)
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
 
 # Load environment variables
 load_dotenv()
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# API Keys from .env
+MURF_API_KEY = os.getenv("MURF_API_KEY")
+GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+
+# Optional local CPU recognizer: Whisper model size (e.g. "base", "small") and worker count
+LOCAL_STT_MODEL = os.getenv("LOCAL_STT_MODEL")
+LOCAL_STT_WORKERS = int(os.getenv("LOCAL_STT_WORKERS", "1"))
+
+# Audio encoding sent to Google STT: LINEAR16 (raw), FLAC or OGG_OPUS (needs soundfile)
+STT_ENCODING = os.getenv("STT_ENCODING", "LINEAR16").upper()
+
+# Audio frame size (ms) for capture and playback, and audio sent per STT request (ms):
+# 10-20 ms frames cut device latency at the cost of more wakeups and requests
+AUDIO_FRAME_MS = float(os.getenv("AUDIO_FRAME_MS", "100"))
+STT_BATCH_MS = float(os.getenv("STT_BATCH_MS", "100"))
+
+# Adaptive quality: first-audio latency budget per direction (seconds)
+LATENCY_BUDGET_S = float(os.getenv("LATENCY_BUDGET_S", "3.0"))
+
+# Quality tiers the adaptive latency controller steps through, best first.
+# stt: recognizer option overrides (None keeps each direction's own); tts_sample_rate: Murf
+# output rate (None keeps the configured rate); speech_rate: Murf voice rate;
+# max_backlog_age: seconds a transcript may wait behind newer speech before it is skipped
+QUALITY_TIERS = [
+    {"name": "full", "stt": None, "tts_sample_rate": None, "speech_rate": 15, "max_backlog_age": None},
+    {"name": "fast", "stt": {"use_enhanced": False}, "tts_sample_rate": 24000, "speech_rate": 22,
+     "max_backlog_age": 8.0},
+    {"name": "lean", "stt": {"model": "default", "use_enhanced": False}, "tts_sample_rate": 8000,
+     "speech_rate": 30, "max_backlog_age": 3.0}
+]
+
+# Catch-up playback: once a direction has this many utterances waiting, or its audio runs past the
+# latency budget, playback is time-compressed (pitch preserved) by up to CATCHUP_MAX_SPEED and Murf
+# speaks up to CATCHUP_RATE_BOOST faster (0 disables the boost)
+CATCHUP_BACKLOG = int(os.getenv("CATCHUP_BACKLOG", "2"))
+CATCHUP_MAX_SPEED = float(os.getenv("CATCHUP_MAX_SPEED", "1.5"))
+CATCHUP_RATE_BOOST = int(os.getenv("CATCHUP_RATE_BOOST", "10"))
+
+# Output mixer: while speech plays on an output, lower-priority sources on it (test tones,
+# notifications) are ducked by MIXER_DUCK_DB; lower numbers are higher priority
+MIXER_DUCK_DB = float(os.getenv("MIXER_DUCK_DB", "12"))
+MIXER_PRIORITIES = {"speech": 0, "cached": 0, "notification": 1}
+
+# Session store: SQLite database of utterances with a full-text index (empty to disable).
+# Kept in the user's home directory so runs from different directories share one archive
+SESSION_DB = os.path.expanduser(os.getenv("VOICEBRIDGE_DB", "~/.voicebridge/sessions.db"))
+
+# Fuzzy translation memory: entries kept in memory and the n-gram similarity above which a
+# stored translation is reused instead of calling the translation endpoint
+TRANSLATION_MEMORY_SIZE = int(os.getenv("TRANSLATION_MEMORY_SIZE", "5000"))
+TRANSLATION_MEMORY_THRESHOLD = float(os.getenv("TRANSLATION_MEMORY_THRESHOLD", "0.85"))
+
+# Optional tracing: Chrome trace-event JSON output path and sampling interval (ms)
+VOICEBRIDGE_TRACE = os.getenv("VOICEBRIDGE_TRACE")
+VOICEBRIDGE_TRACE_SAMPLE_MS = os.getenv("VOICEBRIDGE_TRACE_SAMPLE_MS")
+
+# Set Google credentials
+if GOOGLE_APPLICATION_CREDENTIALS:
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = GOOGLE_APPLICATION_CREDENTIALS
+
+# Murf URLs
+MURF_WS_URL = "wss://api.murf.ai/v1/speech/stream-input"
+MURF_TRANSLATE_URL = "https://api.murf.ai/v1/text/translate"
+
+# Audio device backend: pyaudio (sound hardware), null (silence in, discard out),
+# loopback (in-memory cable from meeting output back to meeting input) or wav (recorded
+# files as the inputs, outputs written to WAV files; the files come from the command line)
+AUDIO_BACKEND = os.getenv("AUDIO_BACKEND", "pyaudio")
+
+# Connection warmup at session start: hold translation until the remote connections are
+# open (1) or go live at once and warm in the background (0); idle HTTPS keepalive interval
+CONNECTION_WARMUP_WAIT = os.getenv("CONNECTION_WARMUP_WAIT", "1") == "1"
+KEEPALIVE_INTERVAL_S = float(os.getenv("KEEPALIVE_INTERVAL_S", "30"))
+
+# Client-side rate limits shared by every session in the process, as endpoint=requests_per_second[:burst]
+# pairs (unlisted endpoints are unlimited), and which direction's requests go first when one is saturated
+REQUEST_RATE_LIMITS = os.getenv("REQUEST_RATE_LIMITS",
+                                "murf-translate=8:16,murf-tts=8:16,murf-tts-connect=2:4,google-stt=4:8")
+REQUEST_PRIORITY = os.getenv("REQUEST_PRIORITY", "incoming")
+
+# Seconds a pipeline stage may go without a heartbeat before it is restarted
+STAGE_STALL_TIMEOUT_S = float(os.getenv("STAGE_STALL_TIMEOUT_S", "20"))
+
+# Engine layout: "threads" runs everything in one interpreter; "processes" gives each
+# direction its own worker process and the audio devices a hub process of their own
+ENGINE_MODE = os.getenv("ENGINE_MODE", "threads")
+
+# PortAudio sample format and callback flags (PyAudio's values, usable without PyAudio)
+PA_INT16 = 8
+PA_CONTINUE = 0
+PA_INPUT_OVERFLOW = 2
+
+# Output sample rates Murf can synthesize at
+MURF_SAMPLE_RATES = (8000, 24000, 44100, 48000)
+
+# Audio storage folders
+OUTGOING_AUDIO_FOLDER = "outgoing_translations"
+INCOMING_AUDIO_FOLDER = "incoming_translations"
+
+# Stock meeting phrases pre-translated and pre-synthesized at session start
+WARMUP_PHRASES = [
+    "Hello everyone.",
+    "Good morning.",
+    "Can you hear me?",
+    "Yes, I can hear you.",
+    "Sorry, could you please repeat that?",
+    "Please repeat.",
+    "You are on mute.",
+    "Can you see my screen?",
+    "Let me share my screen.",
+    "One moment, please.",
+    "Thank you.",
+    "Okay.",
+    "Yes.",
+    "No.",
+    "Thank you everyone, goodbye."
+]
+
+# Supported languages
+SUPPORTED_LANGUAGES = {
+    "English (US)": {
+        "stt_code": "en-US",
+        "murf_translate_code": "en-US",
+        "voices": {
+            "Natalie (Female)": "en-US-natalie",
+            "Miles (Male)": "en-US-miles",
+            "Ken (Male)": "en-US-ken",
+            "Clint (Male)": "en-US-clint",
+            "Amara (Female)": "en-US-amara"
+        }
+    },
+    "English (UK)": {
+        "stt_code": "en-GB",
+        "murf_translate_code": "en-UK",
+        "voices": {
+            "Ruby (Female)": "en-UK-ruby",
+            "Oliver (Male)": "en-UK-oliver"
+        }
+    },
+    "English (India)": {
+        "stt_code": "en-IN",
+        "murf_translate_code": "en-IN",
+        "voices": {
+            "Priya (Female)": "en-IN-priya",
+            "Rahul (Male)": "en-IN-rahul"
+        }
+    },
+    "Hindi": {
+        "stt_code": "hi-IN",
+        "murf_translate_code": "hi-IN",
+        "voices": {
+            "Kabir (Male)": "hi-IN-kabir",
+            "Ayushi (Female)": "hi-IN-ayushi",
+            "Shaan (Male)": "hi-IN-shaan",
+            "Shweta (Female)": "hi-IN-shweta"
+        }
+    },
+    "Tamil": {
+        "stt_code": "ta-IN",
+        "murf_translate_code": "ta-IN",
+        "voices": {
+            "Iniya (Female)": "ta-IN-iniya",
+            "Suresh (Male)": "ta-IN-suresh"
+        }
+    },
+    "Bengali": {
+        "stt_code": "bn-IN",
+        "murf_translate_code": "bn-IN",
+        "voices": {
+            "Anwesha (Female)": "bn-IN-anwesha",
+            "Abhik (Male)": "bn-IN-abhik"
+        }
+    },
+    "Marathi": {
+        "stt_code": "mr-IN",
+        "murf_translate_code": "mr-IN",
+        "voices": {
+            "Mira (Female)": "mr-IN-mira",
+            "Aarav (Male)": "mr-IN-aarav"
+        }
+    },
+    "Telugu": {
+        "stt_code": "te-IN",
+        "murf_translate_code": "te-IN",
+        "voices": {
+            "Vani (Female)": "te-IN-vani",
+            "Ravi (Male)": "te-IN-ravi"
+        }
+    },
+    "Kannada": {
+        "stt_code": "kn-IN",
+        "murf_translate_code": "kn-IN",
+        "voices": {
+            "Deepa (Female)": "kn-IN-deepa",
+            "Kiran (Male)": "kn-IN-kiran"
+        }
+    },
+    "Gujarati": {
+        "stt_code": "gu-IN",
+        "murf_translate_code": "gu-IN",
+        "voices": {
+            "Diya (Female)": "gu-IN-diya",
+            "Jay (Male)": "gu-IN-jay"
+        }
+    },
+    "Spanish (Spain)": {
+        "stt_code": "es-ES",
+        "murf_translate_code": "es-ES",
+        "voices": {
+            "Sofia (Female)": "es-ES-sofia",
+            "Carlos (Male)": "es-ES-carlos"
+        }
+    },
+    "French": {
+        "stt_code": "fr-FR",
+        "murf_translate_code": "fr-FR",
+        "voices": {
+            "Isabelle (Female)": "fr-FR-isabelle",
+            "Pierre (Male)": "fr-FR-pierre"
+        }
+    },
+    "German": {
+        "stt_code": "de-DE",
+        "murf_translate_code": "de-DE",
+        "voices": {
+            "Anna (Female)": "de-DE-anna",
+            "Klaus (Male)": "de-DE-klaus"
+        }
+    }
+}
+
+
+class _NullSpan:
+    """Shared no-op span returned while tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "async_id", "start")
+
+    def __init__(self, tracer, name, cat, args, async_id):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.async_id = async_id
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        if self.async_id is not None:
+            self.tracer._emit("b", self.name, self.cat, self.start, self.args, id=self.async_id)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        if self.async_id is not None:
+            self.tracer._emit("e", self.name, self.cat, end, self.args, id=self.async_id)
+        else:
+            self.tracer._emit("X", self.name, self.cat, self.start, self.args,
+                              dur=(end - self.start) * 1e6)
+        return False
+
+
+class Tracer:
+    """Opt-in span recorder across threads and event loops, exported as Chrome trace-event JSON.
+
+    While disabled, span() returns a shared no-op context manager, so call sites cost one
+    attribute check. Open the exported file in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self, max_events=500000):
+        self.enabled = False
+        self.events = deque(maxlen=max_events)
+        self.thread_names = {}
+        self.local = threading.local()
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.sampler = None
+        self.sampling = False
+        self.samples = Counter()
+
+    def enable(self):
+        self.enabled = True
+        logger.info("🔬 Tracing enabled")
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name, cat="pipeline", async_id=None, **args):
+        """Context manager timing a block; async_id emits async begin/end events for coroutines"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args, async_id)
+
+    def trace_iter(self, iterable, name, cat="pipeline", **args):
+        """Wrap an iterator so each wait for its next item is recorded as a span"""
+        if not self.enabled:
+            return iterable
+        return self._traced_iter(iter(iterable), name, cat, args)
+
+    def _traced_iter(self, iterator, name, cat, args):
+        while True:
+            with self.span(name, cat, **args):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def set_utterance(self, utterance_id):
+        """Tag subsequent spans on this thread with an utterance id"""
+        if self.enabled:
+            self.local.utterance = utterance_id
+
+    def counter(self, name, **values):
+        if self.enabled:
+            self._emit("C", name, "counter", time.perf_counter(), values)
+
+    def instant(self, name, cat="pipeline", **args):
+        if self.enabled:
+            self._emit("i", name, cat, time.perf_counter(), args, s="t")
+
+    def _emit(self, phase, name, cat, timestamp, args, **extra):
+        thread = threading.current_thread()
+        if thread.ident not in self.thread_names:
+            self.thread_names[thread.ident] = thread.name
+        utterance = getattr(self.local, "utterance", None)
+        if utterance is not None and "utt" not in args:
+            args = dict(args, utt=utterance)
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": phase,
+            "ts": (timestamp - self.origin) * 1e6,
+            "pid": self.pid,
+            "tid": thread.ident,
+            "args": args
+        }
+        event.update(extra)
+        self.events.append(event)
+
+    def start_sampler(self, interval=0.005, thread_filter=None):
+        """Sample Python stacks of matching threads into folded-stack counts for flame graphs"""
+        if self.sampler:
+            return
+        self.sampling = True
+        self.sampler = threading.Thread(target=self._sample_loop, args=(interval, thread_filter),
+                                        name="trace-sampler", daemon=True)
+        self.sampler.start()
+        logger.info(f"🔬 Sampling profiler attached every {interval * 1000:.1f}ms")
+
+    def stop_sampler(self):
+        self.sampling = False
+        if self.sampler:
+            self.sampler.join(timeout=1.0)
+            self.sampler = None
+
+    def _sample_loop(self, interval, thread_filter):
+        own_ident = threading.get_ident()
+        while self.sampling:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident, str(ident))
+                if ident == own_ident or (thread_filter and not any(f in name for f in thread_filter)):
+                    continue
+                stack = []
+                while frame is not None and len(stack) < 64:
+                    stack.append(f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)})")
+                    frame = frame.f_back
+                self.samples[";".join([name] + stack[::-1])] += 1
+            time.sleep(interval)
+
+    def export(self, path):
+        """Write Chrome trace-event JSON (plus <path>.folded when the sampler ran)"""
+        path = Path(path)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": ident, "args": {"name": name}}
+            for ident, name in self.thread_names.items()
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + list(self.events), "displayTimeUnit": "ms"}, f)
+        logger.info(f"🔬 Trace written: {path} ({len(self.events)} events)")
+
+        if self.samples:
+            folded = path.with_suffix(path.suffix + ".folded")
+            with open(folded, "w", encoding="utf-8") as f:
+                for stack, count in self.samples.most_common():
+                    f.write(f"{stack} {count}\n")
+            logger.info(f"🔬 Profile samples written: {folded}")
+
+
+TRACER = Tracer()
+if VOICEBRIDGE_TRACE:
+    TRACER.enable()
+    if VOICEBRIDGE_TRACE_SAMPLE_MS:
+        TRACER.start_sampler(float(VOICEBRIDGE_TRACE_SAMPLE_MS) / 1000.0)
+
+
+class RetryableRequestError(Exception):
+    """A remote call failed in a way that is safe to retry (timeout, 429, 5xx)"""
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+
+class AdmissionAbortedError(Exception):
+    """A request stopped waiting for the scheduler: its deadline passed or its stage stopped"""
+
+
+class LatencyTracker:
+    """Rolling window of call latencies with percentile lookup"""
+
+    def __init__(self, window=100):
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def record(self, latency):
+        with self.lock:
+            self.samples.append(latency)
+
+    def percentile(self, pct):
+        with self.lock:
+            if not self.samples:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def __len__(self):
+        return len(self.samples)
+
+
+class _SchedulerLane:
+    """Token bucket and priority/session wait queues for one endpoint"""
+
+    def __init__(self, rate=None, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate or 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        # priority -> session -> waiting tickets; sessions take turns within a priority
+        self.waiting = {}
+        self.admitted = 0
+        self.throttles = 0
+        self.delays = {}
+
+    def refill(self, now):
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready_in(self, now):
+        """Seconds until a request could be admitted"""
+        wait = max(0.0, self.paused_until - now)
+        if self.rate and self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def enqueue(self, priority, session, ticket):
+        self.waiting.setdefault(priority, OrderedDict()).setdefault(session, deque()).append(ticket)
+
+    def head(self):
+        if not self.waiting:
+            return None
+        sessions = self.waiting[min(self.waiting)]
+        return next(iter(sessions.values()))[0]
+
+    def admit_head(self):
+        priority = min(self.waiting)
+        sessions = self.waiting[priority]
+        session, tickets = next(iter(sessions.items()))
+        tickets.popleft()
+        if tickets:
+            sessions.move_to_end(session)
+        else:
+            del sessions[session]
+            if not sessions:
+                del self.waiting[priority]
+        if self.rate:
+            self.tokens -= 1
+        self.admitted += 1
+
+    def queued(self):
+        return sum(len(tickets) for sessions in self.waiting.values() for tickets in sessions.values())
+
+    def remove(self, priority, session, ticket):
+        """Withdraw a ticket that gave up waiting"""
+        sessions = self.waiting.get(priority, {})
+        tickets = sessions.get(session)
+        if tickets is None or ticket not in tickets:
+            return
+        tickets.remove(ticket)
+        if not tickets:
+            del sessions[session]
+            if not sessions:
+                del self.waiting[priority]
+
+
+class RequestScheduler:
+    """Admission control for outgoing API requests, shared by every session in the process.
+
+    Each endpoint has a token bucket. Waiting requests are admitted strictly by priority
+    (lower first) and round-robin across sessions within a priority, so one busy session
+    cannot starve another. Stage threads set their priority and session once with set_context().
+    A request waits at most max_wait seconds (or its own timeout), and no longer than its
+    thread's active() predicate holds, so a long Retry-After pause cannot hang stop().
+    """
+
+    def __init__(self, limits="", max_wait=None):
+        self.max_wait = max_wait
+        self.lanes = {}
+        self.cond = threading.Condition()
+        self.local = threading.local()
+        for item in filter(None, (part.strip() for part in limits.split(","))):
+            endpoint, _, spec = item.partition("=")
+            rate, _, burst = spec.partition(":")
+            self.configure(endpoint.strip(), float(rate), float(burst) if burst else None)
+
+    def configure(self, endpoint, rate=None, burst=None):
+        """Limit endpoint to rate requests per second with bursts of up to burst (None: unlimited)"""
+        with self.cond:
+            self.lanes[endpoint] = _SchedulerLane(rate or None, burst)
+            self.cond.notify_all()
+
+    def set_context(self, priority, session=None, active=None):
+        """Priority, session and liveness predicate (None: always live) for requests made from this thread"""
+        self.local.context = (priority, session, active)
+
+    def context(self):
+        return getattr(self.local, "context", (0, None, None))
+
+    def _lane(self, endpoint):
+        lane = self.lanes.get(endpoint)
+        if lane is None:
+            lane = self.lanes[endpoint] = _SchedulerLane()
+        return lane
+
+    def _options(self, priority, session, active, timeout):
+        """Fill unset request options from this thread's context and the scheduler's max_wait"""
+        default_priority, default_session, default_active = self.context()
+        return (default_priority if priority is None else priority,
+                default_session if session is None else session,
+                default_active if active is None else active,
+                min(t for t in (timeout, self.max_wait, float("inf")) if t is not None))
+
+    def _try_admit(self, endpoint, lane, ticket, priority, session, active, timeout, start):
+        """Admit a waiting ticket when it is due (None), else the seconds to wait; cond must be held"""
+        now = time.monotonic()
+        lane.refill(now)
+        wait = lane.ready_in(now)
+        if lane.head() is ticket and wait == 0:
+            lane.admit_head()
+            lane.delays.setdefault(priority, LatencyTracker(window=500)).record(now - start)
+            self.cond.notify_all()
+            return None
+        if now - start >= timeout or (active and not active()):
+            lane.remove(priority, session, ticket)
+            self.cond.notify_all()
+            raise AdmissionAbortedError(f"{endpoint}: gave up after {now - start:.1f}s in the queue")
+        return min(max(wait, 0.001), 0.5, max(timeout - (now - start), 0.001))
+
+    def acquire(self, endpoint, priority=None, session=None, active=None, timeout=None):
+        """Block until a request to endpoint may be sent; returns the seconds spent queued.
+        
+        Raises AdmissionAbortedError once timeout (default max_wait) passes or active() turns false.
+        """
+        priority, session, active, timeout = self._options(priority, session, active, timeout)
+        ticket = object()
+        start = time.monotonic()
+
+        with self.cond:
+            lane = self._lane(endpoint)
+            lane.enqueue(priority, session, ticket)
+            while True:
+                wait = self._try_admit(endpoint, lane, ticket, priority, session, active, timeout, start)
+                if wait is None:
+                    break
+                self.cond.wait(timeout=wait)
+        return time.monotonic() - start
+
+    async def acquire_async(self, endpoint, priority=None, session=None, active=None, timeout=None):
+        """acquire() for coroutines: waits on the event loop instead of holding an executor thread"""
+        priority, session, active, timeout = self._options(priority, session, active, timeout)
+        ticket = object()
+        start = time.monotonic()
+
+        with self.cond:
+            lane = self._lane(endpoint)
+            lane.enqueue(priority, session, ticket)
+        try:
+            while True:
+                with self.cond:
+                    wait = self._try_admit(endpoint, lane, ticket, priority, session, active, timeout, start)
+                    if wait is None:
+                        return time.monotonic() - start
+                    # Nothing wakes a coroutine when the queue moves, so re-check often until it heads it
+                    if lane.head() is not ticket:
+                        wait = min(wait, 0.02)
+                await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            # A cancelled hedge gives up its place in the queue
+            with self.cond:
+                lane.remove(priority, session, ticket)
+                self.cond.notify_all()
+            raise
+
+    def throttle(self, endpoint, seconds):
+        """Server pushback (HTTP 429): admit nothing to endpoint for the next seconds"""
+        with self.cond:
+            lane = self._lane(endpoint)
+            lane.paused_until = max(lane.paused_until, time.monotonic() + seconds)
+            lane.throttles += 1
+        logger.warning(f"🚦 {endpoint} throttled for {seconds:.1f}s")
+
+    def queued(self, endpoint):
+        with self.cond:
+            lane = self.lanes.get(endpoint)
+            return lane.queued() if lane else 0
+
+    def snapshot(self):
+        """Admissions, queue length, throttles and queueing delay per endpoint and priority"""
+        with self.cond:
+            lanes = list(self.lanes.items())
+            result = {}
+            for endpoint, lane in lanes:
+                result[endpoint] = {
+                    "rate": lane.rate,
+                    "admitted": lane.admitted,
+                    "queued": lane.queued(),
+                    "throttles": lane.throttles,
+                    "delay_ms": {
+                        priority: {
+                            "p50": round(tracker.percentile(50) * 1000, 1),
+                            "p95": round(tracker.percentile(95) * 1000, 1),
+                            "max": round(max(tracker.samples) * 1000, 1)
+                        }
+                        for priority, tracker in sorted(lane.delays.items()) if len(tracker)
+                    }
+                }
+        return result
+
+
+# Nothing waits for admission long enough for the supervisor to take its stage for stalled
+REQUEST_SCHEDULER = RequestScheduler(REQUEST_RATE_LIMITS, max_wait=STAGE_STALL_TIMEOUT_S * 0.75)
+
+
+class CircuitBreaker:
+    """Closed → open after repeated failures, half-open after a cool-down to probe recovery"""
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=15.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0
+        self.probe_at = 0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if time.time() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = "half_open"
+                logger.info(f"🟡 Circuit half-open: {self.name}")
+            # Half-open admits one probe at a time; a probe that never reports back
+            # (non-retryable error, abandoned caller) is replaced after reset_timeout
+            elif time.time() - self.probe_at < self.reset_timeout:
+                return False
+            self.probe_at = time.time()
+            return True
+
+    def record_success(self):
+        with self.lock:
+            if self.state != "closed":
+                logger.info(f"🟢 Circuit closed: {self.name}")
+            self.state = "closed"
+            self.failures = 0
+            self.probe_at = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning(f"🔴 Circuit open: {self.name} ({self.failures} failures)")
+                self.state = "open"
+                self.opened_at = time.time()
+
+
+class ResilientCaller:
+    """Hedged, retried and circuit-broken calls to one remote endpoint"""
+
+    RETRYABLE = (RetryableRequestError, requests.Timeout, requests.ConnectionError,
+                 asyncio.TimeoutError, OSError, websockets.WebSocketException)
+
+    def __init__(self, name, max_retries=2, backoff_base=0.2, backoff_max=2.0,
+                 default_hedge_delay=1.5, min_hedge_delay=0.25, hedging=True, scheduler=None,
+                 budget=STAGE_STALL_TIMEOUT_S * 0.75):
+        self.name = name
+        # Every attempt and hedge is admitted by the scheduler under the endpoint's name
+        self.scheduler = scheduler
+        # Seconds one call may take across all attempts, queueing and backoff; kept below the
+        # stall timeout so a slow endpoint fails the utterance instead of getting its stage restarted
+        self.budget = budget
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.hedging = hedging
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker(name)
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix=name)
+        self.metrics_lock = threading.Lock()
+        self.metrics = {
+            "calls": 0,
+            "hedges_fired": 0,
+            "hedges_won": 0,
+            "retries": 0,
+            "failures": 0,
+            "short_circuits": 0
+        }
+
+    def _count(self, key):
+        with self.metrics_lock:
+            self.metrics[key] += 1
+
+    def hedge_delay(self):
+        """Fire the hedge once the primary is slower than the recent p95"""
+        if len(self.latency) < 5:
+            return self.default_hedge_delay
+        return max(self.min_hedge_delay, self.latency.percentile(95))
+
+    def _backoff(self, attempt):
+        # Full jitter: spread retries from both directions so they do not synchronise
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _check_breaker(self):
+        if not self.breaker.allow():
+            self._count("short_circuits")
+            raise CircuitOpenError(self.name)
+
+    def _on_failure(self, error):
+        self._count("failures")
+        if isinstance(error, self.RETRYABLE):
+            self.breaker.record_failure()
+
+    def _admitted(self, fn, deadline):
+        if not self.scheduler:
+            return fn
+        # Hedges run on pool threads, so the caller's priority and session travel with the call
+        context = self.scheduler.context()
+
+        def run(*args):
+            self.scheduler.acquire(self.name, *context, timeout=max(0, deadline - time.monotonic()))
+            return fn(*args)
+        return run
+
+    def _should_hedge(self):
+        # A hedge behind a queue would only wait its turn after the primary
+        return self.hedging and not (self.scheduler and self.scheduler.queued(self.name))
+
+    def _over_budget(self):
+        return TimeoutError(f"{self.name} gave up after its {self.budget:.1f}s budget")
+
+    def call(self, fn, *args, discard=None):
+        """Run fn(*args) with hedging, retries and the circuit breaker, within the call budget"""
+        self._check_breaker()
+        self._count("calls")
+        deadline = time.monotonic() + self.budget
+        fn = self._admitted(fn, deadline)
+
+        for attempt in range(self.max_retries + 1):
+            start = time.time()
+            try:
+                result = self._hedged(fn, args, discard, deadline)
+            except Exception as e:
+                backoff = self._backoff(attempt)
+                if (not isinstance(e, self.RETRYABLE) or attempt == self.max_retries
+                        or time.monotonic() + backoff >= deadline):
+                    self._on_failure(e)
+                    raise
+                self._count("retries")
+                logger.warning(f"🔁 {self.name} retry {attempt + 1}/{self.max_retries}: {e}")
+                time.sleep(backoff)
+                continue
+
+            self.latency.record(time.time() - start)
+            self.breaker.record_success()
+            return result
+
+    def _hedged(self, fn, args, discard, deadline):
+        primary = self.executor.submit(fn, *args)
+        futures = [primary]
+
+        hedge_delay = min(self.hedge_delay(), max(0, deadline - time.monotonic()))
+        done, _ = concurrent.futures.wait(futures, timeout=hedge_delay)
+        if not done and self._should_hedge() and time.monotonic() < deadline:
+            self._count("hedges_fired")
+            futures.append(self.executor.submit(fn, *args))
+
+        error = None
+        pending = set(futures)
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=max(0, deadline - time.monotonic()),
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            if not done:
+                # Out of budget: the attempts finish on the pool, late results are discarded
+                if discard:
+                    for other in pending:
+                        other.add_done_callback(lambda f: f.exception() is None and discard(f.result()))
+                raise self._over_budget()
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        self._count("hedges_won")
+                    if discard:
+                        for other in pending:
+                            other.add_done_callback(
+                                lambda f: f.exception() is None and discard(f.result())
+                            )
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    async def call_async(self, factory, discard=None):
+        """Await factory() with hedging, retries and the circuit breaker, within the call budget"""
+        self._check_breaker()
+        self._count("calls")
+        deadline = time.monotonic() + self.budget
+        if self.scheduler:
+            context = self.scheduler.context()
+            unscheduled = factory
+
+            async def factory():
+                await self.scheduler.acquire_async(self.name, *context,
+                                                   timeout=max(0, deadline - time.monotonic()))
+                return await unscheduled()
+
+        for attempt in range(self.max_retries + 1):
+            start = time.time()
+            try:
+                result = await self._hedged_async(factory, discard, deadline)
+            except Exception as e:
+                backoff = self._backoff(attempt)
+                if (not isinstance(e, self.RETRYABLE) or attempt == self.max_retries
+                        or time.monotonic() + backoff >= deadline):
+                    self._on_failure(e)
+                    raise
+                self._count("retries")
+                logger.warning(f"🔁 {self.name} retry {attempt + 1}/{self.max_retries}: {e}")
+                await asyncio.sleep(backoff)
+                continue
+
+            self.latency.record(time.time() - start)
+            self.breaker.record_success()
+            return result
+
+    async def _hedged_async(self, factory, discard, deadline):
+        primary = asyncio.ensure_future(factory())
+        tasks = [primary]
+
+        hedge_delay = min(self.hedge_delay(), max(0, deadline - time.monotonic()))
+        done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+        if not done and self._should_hedge() and time.monotonic() < deadline:
+            self._count("hedges_fired")
+            tasks.append(asyncio.ensure_future(factory()))
+
+        error = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=max(0, deadline - time.monotonic()),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                for other in pending:
+                    other.cancel()
+                raise self._over_budget()
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        self._count("hedges_won")
+                    for other in pending:
+                        other.cancel()
+                    for other in done:
+                        if other is not task and other.exception() is None and discard:
+                            await discard(other.result())
+                    return task.result()
+                error = task.exception()
+        raise error
+
+    def snapshot(self):
+        """Current counters, breaker state and latency percentiles"""
+        with self.metrics_lock:
+            metrics = dict(self.metrics)
+        metrics["breaker"] = self.breaker.state
+        metrics["p50"] = self.latency.percentile(50)
+        metrics["p95"] = self.latency.percentile(95)
+        return metrics
+
+    def shutdown(self):
+        """Release the hedging pool; attempts still in flight finish in the background"""
+        self.executor.shutdown(wait=False)
+
+
+class MurfStreamContext:
+    """Long-lived Murf stream-input connection for one translation direction"""
+
+    def __init__(self, name, sample_rate, channel_type, audio_format, connector=None, scheduler=None):
+        self.name = name
+        self.connector = connector
+        # Each synthesis context is admitted by the scheduler as a murf-tts request
+        self.scheduler = scheduler
+        self.sample_rate = sample_rate
+        self.channel_type = channel_type
+        self.audio_format = audio_format
+        self.ws = None
+        self.context_counter = 0
+
+    @property
+    def url(self):
+        return f"{MURF_WS_URL}?api-key={MURF_API_KEY}&sample_rate={self.sample_rate}&channel_type={self.channel_type}&format={self.audio_format}"
+
+    async def ensure_connected(self):
+        """Open the WebSocket if it is not already open"""
+        if self.ws is not None:
+            return self.ws
+
+        def connect():
+            return asyncio.wait_for(
+                websockets.connect(self.url, ping_interval=20, ping_timeout=10),
+                timeout=5.0
+            )
+
+        with TRACER.span("ws.connect", "network", async_id=f"{self.name}-ws"):
+            if self.connector:
+                self.ws = await self.connector.call_async(connect, discard=lambda ws: ws.close())
+            else:
+                self.ws = await connect()
+        logger.info(f"🔗 Murf stream context opened ({self.name})")
+        return self.ws
+
+    async def begin_context(self, voice_id, voice_config=None):
+        """Start a new synthesis context on the open connection and return its id"""
+        ws = await self.ensure_connected()
+        if self.scheduler:
+            await self.scheduler.acquire_async("murf-tts")
+        self.context_counter += 1
+        context_id = f"{self.name}-{self.context_counter}"
+
+        config = {
+            "voiceId": voice_id,
+            "style": "Conversational",
+            "rate": 15,
+            "pitch": 0,
+            "variation": 1
+        }
+        if voice_config:
+            config.update(voice_config)
+
+        await ws.send(json.dumps({"voice_config": config, "context_id": context_id}))
+        return context_id
+
+    async def send_text(self, context_id, text, end=False):
+        """Push a piece of text into a context; end=True flushes and closes the context"""
+        await self.ws.send(json.dumps({
+            "context_id": context_id,
+            "text": text,
+            "end": end
+        }))
+
+    async def recv(self, timeout):
+        """Receive and decode the next message from Murf"""
+        with TRACER.span("ws.recv", "network", async_id=f"{self.name}-ws"):
+            response = await asyncio.wait_for(self.ws.recv(), timeout=timeout)
+        with TRACER.span("json.parse", "cpu", bytes=len(response)):
+            return json.loads(response)
+
+    async def reset(self):
+        """Drop the connection so the next utterance reconnects"""
+        ws, self.ws = self.ws, None
+        if ws:
+            try:
+                await ws.close()
+            except:
+                pass
+
+    async def close(self):
+        """Close the connection at the end of a session"""
+        if self.ws:
+            logger.info(f"🔌 Murf stream context closed ({self.name})")
+        await self.reset()
+
+
+class RecognitionBackend:
+    """Speech-to-text engine interface"""
+
+    name = "recognition"
+
+    def transcribe_stream(self, audio_chunks, language_code, sample_rate, options):
+        """Consume an iterator of LINEAR16 chunks and yield final transcripts"""
+        raise NotImplementedError
+
+    def warm(self):
+        """Open and check the connection ahead of the first stream (also used as keepalive)"""
+
+
+class TranslationBackend:
+    """Machine translation engine interface"""
+
+    name = "translation"
+
+    def translate(self, text, source_lang_code, target_lang_code):
+        """Return the translation of text, raising on failure"""
+        raise NotImplementedError
+
+    def warm(self):
+        """Open and check the connection ahead of the first request (also used as keepalive)"""
+
+
+class SynthesisBackend:
+    """Text-to-speech engine interface"""
+
+    name = "synthesis"
+
+    def create_session(self, direction, sample_rate):
+        """Per-direction state kept across utterances (connections, contexts)"""
+        return None
+
+    async def synthesize(self, session, voice_id, text_segments, on_audio, voice_config=None):
+        """Speak an async iterator of text segments, passing raw PCM chunks to on_audio.
+
+        voice_config overrides voice settings such as the speech rate. Returns True if any
+        audio was produced.
+        """
+        raise NotImplementedError
+
+    async def warm_session(self, session):
+        """Open the session's connection ahead of the first utterance"""
+
+    async def close_session(self, session):
+        pass
+
+
+# Compressed STT encodings: RecognitionConfig name → libsndfile (container, subtype)
+STT_CODECS = {
+    "FLAC": ("FLAC", "PCM_16"),
+    "OGG_OPUS": ("OGG", "OPUS")
+}
+
+
+class _EncodedSink:
+    """Write-only file object collecting the bytes libsndfile appends.
+
+    Header fix-ups written over earlier bytes (on close) are dropped: those bytes
+    have already been streamed.
+    """
+
+    def __init__(self):
+        self.pending = bytearray()
+        self.size = 0
+        self.position = 0
+
+    def write(self, data):
+        data = bytes(data)
+        if self.position == self.size:
+            self.pending += data
+        self.position += len(data)
+        self.size = max(self.size, self.position)
+        return len(data)
+
+    def seek(self, offset, whence=0):
+        if whence == 0:
+            self.position = offset
+        elif whence == 1:
+            self.position += offset
+        else:
+            self.position = self.size + offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def read(self, size=-1):
+        return b""
+
+    def take(self):
+        data = bytes(self.pending)
+        self.pending.clear()
+        return data
+
+
+class StreamingAudioEncoder:
+    """Incremental FLAC or Ogg Opus encoder for one recognizer stream"""
+
+    def __init__(self, codec, sample_rate, channels=1):
+        if soundfile is None:
+            raise RuntimeError("soundfile is not installed (pip install soundfile)")
+        container, subtype = STT_CODECS[codec]
+        self.codec = codec
+        self.sink = _EncodedSink()
+        self.file = soundfile.SoundFile(self.sink, 'w', sample_rate, channels, subtype, format=container)
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.cpu_seconds = 0.0
+
+    def encode(self, pcm):
+        """Feed LINEAR16 audio; returns whatever compressed bytes the codec has completed"""
+        start = time.thread_time()
+        self.file.buffer_write(pcm, dtype='int16')
+        self.cpu_seconds += time.thread_time() - start
+        self.input_bytes += len(pcm)
+        data = self.sink.take()
+        self.output_bytes += len(data)
+        return data
+
+    def finish(self):
+        """Flush the final partial block"""
+        start = time.thread_time()
+        self.file.close()
+        self.cpu_seconds += time.thread_time() - start
+        data = self.sink.take()
+        self.output_bytes += len(data)
+        return data
+
+
+class EncodedAudioStream:
+    """Encode capture chunks on a worker thread, yielding compressed requests in order"""
+
+    def __init__(self, chunks, codec, sample_rate, on_finish=None, max_pending=50):
+        self.encoder = StreamingAudioEncoder(codec, sample_rate)
+        self.on_finish = on_finish
+        self.output = queue.Queue(maxsize=max_pending)
+        self.closed = False
+        self.worker = threading.Thread(target=self._encode_loop, args=(chunks,),
+                                       name=f"stt-encode-{codec.lower()}", daemon=True)
+        self.worker.start()
+
+    def _put(self, item):
+        while not self.closed:
+            try:
+                self.output.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _encode_loop(self, chunks):
+        try:
+            for chunk in chunks:
+                if self.closed:
+                    break
+                data = self.encoder.encode(chunk)
+                if data and not self._put(data):
+                    break
+            self._put(self.encoder.finish())
+        except Exception as e:
+            logger.error(f"❌ STT audio encoder error ({self.encoder.codec}): {e}")
+        finally:
+            self._put(None)
+            if self.on_finish:
+                self.on_finish(self.encoder)
+
+    def __iter__(self):
+        try:
+            while True:
+                data = self.output.get()
+                if data is None:
+                    return
+                if data:
+                    yield data
+        finally:
+            self.closed = True
+
+
+class GoogleRecognitionBackend(RecognitionBackend):
+    """Google Cloud Speech-to-Text streaming recognizer, optionally uploading FLAC or Ogg Opus"""
+
+    name = "google"
+
+    def __init__(self, client, encoding="LINEAR16", scheduler=None):
+        self.client = client
+        self.encoding = encoding
+        # Each stream is admitted by the scheduler as a google-stt request
+        self.scheduler = scheduler
+        if encoding != "LINEAR16" and (encoding not in STT_CODECS or soundfile is None):
+            logger.warning(f"⚠️ STT encoding {encoding} unavailable, sending LINEAR16")
+            self.encoding = "LINEAR16"
+        self.encoding_stats = {"streams": 0, "input_bytes": 0, "output_bytes": 0, "cpu_seconds": 0.0}
+        self.encoding_lock = threading.Lock()
+
+    def _record_encoder(self, encoder):
+        with self.encoding_lock:
+            self.encoding_stats["streams"] += 1
+            self.encoding_stats["input_bytes"] += encoder.input_bytes
+            self.encoding_stats["output_bytes"] += encoder.output_bytes
+            self.encoding_stats["cpu_seconds"] += encoder.cpu_seconds
+
+    def warm(self, timeout=5.0):
+        # Connect the gRPC channel (DNS, TCP, TLS, HTTP/2) without starting a billable stream
+        grpc.channel_ready_future(self.client.transport.grpc_channel).result(timeout=timeout)
+
+    def encoding_snapshot(self):
+        with self.encoding_lock:
+            stats = dict(self.encoding_stats)
+        stats["encoding"] = self.encoding
+        stats["cpu_seconds"] = round(stats["cpu_seconds"], 3)
+        stats["ratio"] = round(stats["input_bytes"] / stats["output_bytes"], 2) if stats["output_bytes"] else None
+        return stats
+
+    def transcribe_stream(self, audio_chunks, language_code, sample_rate, options):
+        if self.encoding != "LINEAR16":
+            audio_chunks = EncodedAudioStream(audio_chunks, self.encoding, sample_rate, self._record_encoder)
+        
+        config = speech.RecognitionConfig(
+            encoding=getattr(speech.RecognitionConfig.AudioEncoding, self.encoding),
+            sample_rate_hertz=sample_rate,
+            language_code=language_code,
+            enable_automatic_punctuation=True,
+            **options
+        )
+        
+        streaming_config = speech.StreamingRecognitionConfig(
+            config=config,
+            interim_results=False,
+            single_utterance=False
+        )
+        
+        requests_iter = (speech.StreamingRecognizeRequest(audio_content=content)
+                         for content in audio_chunks)
+        
+        if self.scheduler:
+            self.scheduler.acquire("google-stt")
+        for response in self.client.streaming_recognize(streaming_config, requests_iter):
+            for result in response.results:
+                if result.is_final:
+                    yield result.alternatives[0].transcript
+
+
+class MurfTranslationBackend(TranslationBackend):
+    """Murf text translation REST API"""
+
+    name = "murf"
+
+    def __init__(self, caller, timeout=8):
+        self.caller = caller
+        self.timeout = timeout
+        # Pooled keep-alive connection, so requests after the first skip the TLS handshake
+        self.http = requests.Session()
+
+    def _request(self, text, target_lang_code):
+        """Single Murf translate call; raises RetryableRequestError for transient failures"""
+        headers = {
+            "api-key": MURF_API_KEY,
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "target_language": target_lang_code,
+            "texts": [text]
+        }
+        
+        with TRACER.span("murf.translate.http", "network", chars=len(text)):
+            response = self.http.post(
+                MURF_TRANSLATE_URL,
+                headers=headers,
+                json=payload,
+                timeout=self.timeout
+            )
+        
+        if response.status_code == 429:
+            try:
+                retry_after = float(response.headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+            if self.caller.scheduler:
+                self.caller.scheduler.throttle(self.caller.name, retry_after)
+        
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RetryableRequestError(f"HTTP {response.status_code}: {response.text[:200]}")
+        
+        if response.status_code != 200:
+            raise ValueError(f"HTTP {response.status_code}: {response.text[:200]}")
+        
+        translations = response.json().get("translations", [])
+        if translations and translations[0].get("translated_text"):
+            return translations[0]["translated_text"]
+        
+        raise ValueError("Translation response empty")
+
+    def translate(self, text, source_lang_code, target_lang_code):
+        return self.caller.call(self._request, text, target_lang_code)
+
+    def warm(self):
+        # Any response proves the pooled connection is up; server errors mean it is not usable
+        response = self.http.head(MURF_TRANSLATE_URL, timeout=self.timeout)
+        if response.status_code >= 500:
+            raise RetryableRequestError(f"HTTP {response.status_code}")
+
+
+class MurfSynthesisBackend(SynthesisBackend):
+    """Murf stream-input WebSocket TTS, one long-lived connection per direction"""
+
+    name = "murf"
+
+    def __init__(self, connector, channel_type="MONO", audio_format="WAV", scheduler=None):
+        self.connector = connector
+        self.channel_type = channel_type
+        self.audio_format = audio_format
+        # Synthesis contexts share the connector's scheduler unless given their own
+        self.scheduler = scheduler or (connector.scheduler if connector else None)
+
+    def create_session(self, direction, sample_rate):
+        return MurfStreamContext(direction, sample_rate, self.channel_type, self.audio_format,
+                                 connector=self.connector, scheduler=self.scheduler)
+
+    async def synthesize(self, session, voice_id, text_segments, on_audio, voice_config=None):
+        try:
+            context_id = await session.begin_context(voice_id, voice_config)
+        except Exception as e:
+            logger.warning(f"⚠️ Murf stream context unavailable ({session.name}), reconnecting: {e}")
+            await session.reset()
+            context_id = await session.begin_context(voice_id, voice_config)
+
+        chunk_count = 0
+
+        async def sender():
+            async for segment in text_segments:
+                if segment.strip():
+                    await session.send_text(context_id, segment, end=False)
+            await session.send_text(context_id, "", end=True)
+
+        async def receiver():
+            nonlocal chunk_count
+            first_chunk = True
+
+            while True:
+                try:
+                    data = await session.recv(timeout=8.0)
+                except asyncio.TimeoutError:
+                    if sender_task.done():
+                        return
+                    continue
+
+                if data.get("context_id", context_id) != context_id:
+                    continue
+
+                if "error" in data:
+                    logger.error(f"❌ WebSocket error: {data['error']}")
+                    return
+
+                audio_b64 = data.get("audio")
+                if audio_b64:
+                    with TRACER.span("base64.decode", "cpu", bytes=len(audio_b64)):
+                        audio_bytes = memoryview(base64.b64decode(audio_b64))
+
+                    if first_chunk and len(audio_bytes) > 44:
+                        # Skip the WAV header without copying the chunk
+                        audio_bytes = audio_bytes[44:]
+                        first_chunk = False
+
+                    if len(audio_bytes) > 0:
+                        chunk_count += 1
+                        on_audio(audio_bytes)
+
+                if data.get("final"):
+                    return
+
+        sender_task = asyncio.ensure_future(sender())
+        try:
+            await receiver()
+            await sender_task
+        except Exception:
+            sender_task.cancel()
+            await session.reset()
+            raise
+
+        return chunk_count > 0
+
+    async def warm_session(self, session):
+        await session.ensure_connected()
+
+    async def close_session(self, session):
+        await session.close()
+
+
+class StubRecognitionBackend(RecognitionBackend):
+    """In-process recognizer for tests: emits one transcript per burst of voiced audio"""
+
+    name = "stub"
+
+    def __init__(self, transcripts=None, voice_threshold=300, silence_ms=500):
+        self.transcripts = list(transcripts or [])
+        self.voice_threshold = voice_threshold
+        self.silence_s = silence_ms / 1000
+        self.count = 0
+
+    def _next_transcript(self):
+        self.count += 1
+        if self.transcripts:
+            return self.transcripts[(self.count - 1) % len(self.transcripts)]
+        return f"Test utterance number {self.count}."
+
+    def transcribe_stream(self, audio_chunks, language_code, sample_rate, options):
+        voiced = False
+        # Silence is measured in seconds, so endpointing does not depend on the STT request size
+        silent_s = 0.0
+
+        for chunk in audio_chunks:
+            level = np.abs(np.frombuffer(chunk, dtype=np.int16)).mean() if chunk else 0
+            if level >= self.voice_threshold:
+                voiced = True
+                silent_s = 0.0
+            elif voiced:
+                silent_s += len(chunk) / 2 / sample_rate
+                if silent_s >= self.silence_s:
+                    voiced = False
+                    yield self._next_transcript()
+
+        if voiced:
+            yield self._next_transcript()
+
+
+class StubTranslationBackend(TranslationBackend):
+    """In-process translator for tests: tags text with the target language"""
+
+    name = "stub"
+
+    def __init__(self, delay=0.0, failure_rate=0.0):
+        self.delay = delay
+        self.failure_rate = failure_rate
+
+    def translate(self, text, source_lang_code, target_lang_code):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise RetryableRequestError("stub translation failure")
+        return f"[{target_lang_code}] {text}"
+
+
+class StubSynthesisBackend(SynthesisBackend):
+    """In-process TTS for tests: emits a quiet tone whose length follows the text"""
+
+    name = "stub"
+
+    def __init__(self, delay=0.0, seconds_per_char=0.06, chunk_ms=100):
+        self.delay = delay
+        self.seconds_per_char = seconds_per_char
+        self.chunk_ms = chunk_ms
+
+    def create_session(self, direction, sample_rate):
+        return {"direction": direction, "sample_rate": sample_rate}
+
+    async def synthesize(self, session, voice_id, text_segments, on_audio, voice_config=None):
+        sample_rate = session["sample_rate"]
+        chunk_frames = int(sample_rate * self.chunk_ms / 1000)
+        produced = False
+
+        async for segment in text_segments:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            total_frames = int(len(segment) * self.seconds_per_char * sample_rate)
+            t = np.arange(total_frames) / sample_rate
+            tone = (np.sin(2 * np.pi * 220 * t) * 3000).astype(np.int16).tobytes()
+            for offset in range(0, len(tone), chunk_frames * 2):
+                on_audio(tone[offset:offset + chunk_frames * 2])
+                produced = True
+                await asyncio.sleep(0)
+
+        return produced
+
+
+def read_wav_pcm(path, target_rate=16000):
+    """Read a WAV file as mono int16 PCM bytes at target_rate"""
+    with wave.open(str(path), 'rb') as wav:
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+
+    if sample_width != 2:
+        raise ValueError(f"{path}: only 16-bit PCM WAV is supported")
+
+    audio = np.frombuffer(frames, dtype=np.int16)
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1).astype(np.int16)
+
+    if rate != target_rate and len(audio) > 0:
+        new_length = int(len(audio) * target_rate / rate)
+        audio = np.interp(
+            np.linspace(0, len(audio) - 1, new_length),
+            np.arange(len(audio)),
+            audio
+        ).astype(np.int16)
+
+    return audio.tobytes()
+
+
+class LocalRecognizerPool:
+    """Worker pool running a CPU Whisper model, batching segments from both directions"""
+
+    def __init__(self, model_size="base", workers=1, max_batch=4, batch_window=0.05, compute_type="int8"):
+        if WhisperModel is None:
+            raise RuntimeError("faster-whisper is not installed (pip install faster-whisper)")
+
+        logger.info(f"🧠 Loading local Whisper model '{model_size}' ({compute_type}, {workers} worker(s))...")
+        self.model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=0)
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.jobs = queue.Queue()
+        self.running = True
+        self.lock = threading.Lock()
+        self.stats = {"segments": 0, "batches": 0, "audio_seconds": 0.0, "compute_seconds": 0.0}
+        self.rtf = LatencyTracker(window=200)
+
+        self.workers = [
+            threading.Thread(target=self._worker, name=f"local-stt-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+        logger.info("✅ Local Whisper recognizer ready")
+
+    def submit(self, pcm_bytes, language_code):
+        """Queue a 16 kHz int16 segment for recognition; returns a Future with the transcript"""
+        future = concurrent.futures.Future()
+        audio = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+        self.jobs.put((audio, language_code.split("-")[0].lower(), future))
+        return future
+
+    def _take_batch(self):
+        try:
+            batch = [self.jobs.get(timeout=0.2)]
+        except queue.Empty:
+            return []
+
+        # Give the other direction a moment to contribute to the same batch
+        deadline = time.time() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.jobs.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self):
+        while self.running:
+            batch = self._take_batch()
+            if not batch:
+                continue
+
+            start = time.time()
+            try:
+                texts = self._transcribe_batch([(audio, language) for audio, language, _ in batch])
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            elapsed = time.time() - start
+
+            audio_seconds = sum(len(audio) for audio, _, _ in batch) / 16000.0
+            with self.lock:
+                self.stats["segments"] += len(batch)
+                self.stats["batches"] += 1
+                self.stats["audio_seconds"] += audio_seconds
+                self.stats["compute_seconds"] += elapsed
+            if audio_seconds > 0:
+                self.rtf.record(elapsed / audio_seconds)
+
+            for (_, _, future), text in zip(batch, texts):
+                future.set_result(text)
+
+    def _transcribe_batch(self, items):
+        """Encode and decode a batch in one CTranslate2 call, falling back to one-by-one"""
+        if len(items) > 1:
+            try:
+                return self._generate_batch(items)
+            except Exception as e:
+                logger.warning(f"⚠️ Batched local inference failed, decoding individually: {e}")
+
+        texts = []
+        for audio, language in items:
+            segments, _ = self.model.transcribe(audio, language=language, beam_size=1,
+                                                condition_on_previous_text=False)
+            texts.append(" ".join(segment.text.strip() for segment in segments).strip())
+        return texts
+
+    def _generate_batch(self, items):
+        from faster_whisper.audio import pad_or_trim
+        from faster_whisper.tokenizer import Tokenizer
+
+        features = np.stack([
+            pad_or_trim(self.model.feature_extractor(audio)) for audio, _ in items
+        ])
+        encoded = self.model.encode(features)
+
+        tokenizers = [
+            Tokenizer(self.model.hf_tokenizer, self.model.model.is_multilingual,
+                      task="transcribe", language=language)
+            for _, language in items
+        ]
+        prompts = [tokenizer.sot_sequence + [tokenizer.no_timestamps] for tokenizer in tokenizers]
+
+        results = self.model.model.generate(encoded, prompts, beam_size=1, max_length=224)
+        return [
+            tokenizer.decode(result.sequences_ids[0]).strip()
+            for tokenizer, result in zip(tokenizers, results)
+        ]
+
+    def snapshot(self):
+        """Throughput and real-time factor (compute seconds per audio second)"""
+        with self.lock:
+            stats = dict(self.stats)
+        stats["rtf_mean"] = stats["compute_seconds"] / stats["audio_seconds"] if stats["audio_seconds"] else None
+        stats["rtf_p95"] = self.rtf.percentile(95)
+        stats["queued"] = self.jobs.qsize()
+        return stats
+
+    def shutdown(self):
+        self.running = False
+
+
+class LocalWhisperRecognitionBackend(RecognitionBackend):
+    """On-device recognizer: energy endpointing feeding a shared LocalRecognizerPool"""
+
+    name = "local-whisper"
+
+    def __init__(self, pool, voice_threshold=300, endpoint_ms=600, max_segment_s=15.0):
+        self.pool = pool
+        self.voice_threshold = voice_threshold
+        self.endpoint_s = endpoint_ms / 1000
+        self.max_segment_s = max_segment_s
+
+    def transcribe_stream(self, audio_chunks, language_code, sample_rate, options):
+        segment = bytearray()
+        # Trailing silence in seconds, whatever size the STT requests are
+        silent_s = 0.0
+        pending = deque()
+        max_bytes = int(self.max_segment_s * sample_rate) * 2
+
+        def finished():
+            # Yield completed transcripts in submission order without blocking capture
+            while pending and pending[0].done():
+                text = pending.popleft().result()
+                if text:
+                    yield text
+
+        for chunk in audio_chunks:
+            level = np.abs(np.frombuffer(chunk, dtype=np.int16)).mean() if chunk else 0
+
+            if level >= self.voice_threshold:
+                segment.extend(chunk)
+                silent_s = 0.0
+            elif segment:
+                segment.extend(chunk)
+                silent_s += len(chunk) / 2 / sample_rate
+
+            if segment and (silent_s >= self.endpoint_s or len(segment) >= max_bytes):
+                pending.append(self.pool.submit(bytes(segment), language_code))
+                segment = bytearray()
+                silent_s = 0.0
+
+            yield from finished()
+
+        if segment:
+            pending.append(self.pool.submit(bytes(segment), language_code))
+        for future in pending:
+            text = future.result()
+            if text:
+                yield text
+
+
+def benchmark_recognizer(backend, wav_path, language_code, chunk_ms=100):
+    """Run a recognizer over a WAV file as fast as possible and report its real-time factor"""
+    pcm = read_wav_pcm(wav_path, 16000)
+    chunk_bytes = int(16000 * chunk_ms / 1000) * 2
+    audio_seconds = len(pcm) / 2 / 16000
+
+    chunks = (pcm[i:i + chunk_bytes] for i in range(0, len(pcm), chunk_bytes))
+    start = time.time()
+    transcripts = list(backend.transcribe_stream(chunks, language_code, 16000, {}))
+    elapsed = time.time() - start
+
+    report = {
+        "backend": backend.name,
+        "audio_seconds": round(audio_seconds, 2),
+        "wall_seconds": round(elapsed, 2),
+        "rtf": round(elapsed / audio_seconds, 3) if audio_seconds else None,
+        "transcripts": transcripts
+    }
+    if hasattr(backend, "pool"):
+        report["pool"] = backend.pool.snapshot()
+    return report
+
+
+def benchmark_stt_encoding(wav_path, codecs=("LINEAR16", "FLAC", "OGG_OPUS"), chunk_ms=100):
+    """Encode a recording as STT upload chunks per codec and report CPU cost against bytes saved.
+    
+    buffered_ms is the most audio the codec held back before emitting it, which adds directly
+    to recognition latency.
+    """
+    pcm = read_wav_pcm(wav_path, 16000)
+    chunk_bytes = int(16000 * chunk_ms / 1000) * 2
+    audio_seconds = len(pcm) / 2 / 16000
+    report = {"audio_seconds": round(audio_seconds, 2), "chunk_ms": chunk_ms, "codecs": {}}
+
+    for codec in codecs:
+        if codec == "LINEAR16":
+            report["codecs"][codec] = {
+                "bytes": len(pcm), "kbit_per_s": round(len(pcm) * 8 / audio_seconds / 1000, 1),
+                "ratio": 1.0, "cpu_seconds": 0.0, "cpu_percent": 0.0, "buffered_ms": 0.0
+            }
+            continue
+        try:
+            encoder = StreamingAudioEncoder(codec, 16000)
+        except Exception as e:
+            report["codecs"][codec] = {"error": str(e)}
+            continue
+
+        fed_ms = 0.0
+        emitted_at_ms = 0.0
+        buffered_ms = 0.0
+        for offset in range(0, len(pcm), chunk_bytes):
+            chunk = pcm[offset:offset + chunk_bytes]
+            fed_ms += len(chunk) / 2 / 16
+            if encoder.encode(chunk):
+                emitted_at_ms = fed_ms
+            buffered_ms = max(buffered_ms, fed_ms - emitted_at_ms)
+        encoder.finish()
+
+        report["codecs"][codec] = {
+            "bytes": encoder.output_bytes,
+            "kbit_per_s": round(encoder.output_bytes * 8 / audio_seconds / 1000, 1),
+            "ratio": round(len(pcm) / encoder.output_bytes, 2) if encoder.output_bytes else None,
+            "cpu_seconds": round(encoder.cpu_seconds, 4),
+            "cpu_percent": round(encoder.cpu_seconds / audio_seconds * 100, 2),
+            "buffered_ms": round(buffered_ms, 1)
+        }
+    return report
+
+
+class AdaptiveLatencyController:
+    """Steps one direction through quality tiers to hold its first-audio latency budget.
+
+    Degrades one tier when smoothed latency exceeds the budget or transcripts queue up, and
+    recovers one tier after latency has stayed well under budget with an empty queue.
+    """
+
+    def __init__(self, name, tiers, budget, queue_limit=2, degrade_hold=3.0, recover_hold=15.0,
+                 recover_ratio=0.6, smoothing=0.3):
+        self.name = name
+        self.tiers = tiers
+        self.budget = budget
+        self.queue_limit = queue_limit
+        self.degrade_hold = degrade_hold
+        self.recover_hold = recover_hold
+        self.recover_ratio = recover_ratio
+        self.smoothing = smoothing
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.level = 0
+            self.latency = None
+            self.last_sample_at = 0.0
+            self.queue_depth = 0
+            self.last_change = 0.0
+            self.calm_since = None
+            self.degrades = 0
+            self.recoveries = 0
+            self.dropped = 0
+
+    @property
+    def tier(self):
+        with self.lock:
+            self._evaluate()
+            return self.tiers[self.level]
+
+    def observe_latency(self, latency):
+        with self.lock:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.smoothing * (latency - self.latency)
+            self.last_sample_at = time.time()
+            self._evaluate()
+
+    def observe_queue(self, depth):
+        with self.lock:
+            self.queue_depth = depth
+            self._evaluate()
+
+    def record_drop(self):
+        with self.lock:
+            self.dropped += 1
+
+    def _evaluate(self):
+        now = time.time()
+        over = (self.latency is not None and self.latency > self.budget) or self.queue_depth > self.queue_limit
+
+        if over:
+            self.calm_since = None
+            if self.level < len(self.tiers) - 1 and now - self.last_change >= self.degrade_hold:
+                self.level += 1
+                self.degrades += 1
+                self.last_change = now
+                # Judge the new tier on fresh measurements
+                self.latency = None
+                logger.warning(f"🐢 {self.name} over latency budget, quality → {self.tiers[self.level]['name']}")
+            return
+
+        quiet = self.latency is None or self.latency <= self.budget * self.recover_ratio \
+            or now - self.last_sample_at >= self.recover_hold
+        if not quiet or self.queue_depth > 0:
+            self.calm_since = None
+            return
+        if self.calm_since is None:
+            self.calm_since = now
+        if self.level > 0 and now - self.calm_since >= self.recover_hold \
+                and now - self.last_change >= self.recover_hold:
+            self.level -= 1
+            self.recoveries += 1
+            self.last_change = now
+            self.calm_since = now
+            logger.info(f"🐇 {self.name} load eased, quality → {self.tiers[self.level]['name']}")
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "tier": self.tiers[self.level]["name"],
+                "latency": round(self.latency, 3) if self.latency is not None else None,
+                "queue": self.queue_depth,
+                "degrades": self.degrades,
+                "recoveries": self.recoveries,
+                "dropped": self.dropped
+            }
+
+
+class BackendRouter:
+    """Pick a backend per utterance from live latency and error statistics"""
+
+    def __init__(self, kind, backends=(), explore_rate=0.05, error_penalty=4.0, smoothing=0.2):
+        self.kind = kind
+        self.explore_rate = explore_rate
+        self.error_penalty = error_penalty
+        self.smoothing = smoothing
+        self.backends = []
+        self.stats = {}
+        self.lock = threading.Lock()
+        for backend in backends:
+            self.register(backend)
+
+    def register(self, backend):
+        with self.lock:
+            self.backends = [b for b in self.backends if b.name != backend.name] + [backend]
+            self.stats[backend.name] = {"latency": None, "error_rate": 0.0, "calls": 0, "errors": 0}
+        logger.info(f"🔌 {self.kind} backend registered: {backend.name}")
+
+    def unregister(self, name):
+        with self.lock:
+            self.backends = [b for b in self.backends if b.name != name]
+            self.stats.pop(name, None)
+
+    def _score(self, backend):
+        stats = self.stats[backend.name]
+        if stats["latency"] is None:
+            return float("inf")
+        return stats["latency"] * (1 + self.error_penalty * stats["error_rate"])
+
+    def ranked(self):
+        """Backends best-first; unmeasured backends keep registration order and are explored occasionally"""
+        with self.lock:
+            if not self.backends:
+                raise RuntimeError(f"No {self.kind} backend registered")
+            ranked = sorted(self.backends, key=self._score)
+        if len(ranked) > 1 and random.random() < self.explore_rate:
+            ranked.insert(0, ranked.pop(random.randrange(1, len(ranked))))
+        return ranked
+
+    def choose(self):
+        return self.ranked()[0]
+
+    def record(self, backend, latency, ok):
+        with self.lock:
+            stats = self.stats.get(backend.name)
+            if stats is None:
+                return
+            stats["calls"] += 1
+            stats["error_rate"] += self.smoothing * ((0.0 if ok else 1.0) - stats["error_rate"])
+            if ok and latency is not None:
+                if stats["latency"] is None:
+                    stats["latency"] = latency
+                else:
+                    stats["latency"] += self.smoothing * (latency - stats["latency"])
+            if not ok:
+                stats["errors"] += 1
+
+    def call(self, fn):
+        """Call fn(backend) on the best backend, failing over to the next on error"""
+        error = None
+        for backend in self.ranked():
+            start = time.time()
+            try:
+                result = fn(backend)
+            except Exception as e:
+                self.record(backend, None, False)
+                logger.warning(f"⚠️ {self.kind} backend '{backend.name}' failed: {e}")
+                error = e
+                continue
+            self.record(backend, time.time() - start, True)
+            return result
+        raise error
+
+    def snapshot(self):
+        with self.lock:
+            return {name: dict(stats) for name, stats in self.stats.items()}
+
+
+def normalize_text(text):
+    """Lower-case text with punctuation and repeated whitespace removed"""
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip().lower()
+
+
+class AudioCache:
+    """Byte-bounded LRU of synthesized PCM keyed by voice, language pair and normalized text"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(voice_id, source_lang_code, target_lang_code, sample_rate, text):
+        return (voice_id, source_lang_code, target_lang_code, sample_rate, normalize_text(text))
+
+    def get(self, key, count=True):
+        """Return (translated_text, pcm_bytes) or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            if count:
+                if entry is not None:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            return entry
+
+    def put(self, key, translated_text, pcm_bytes):
+        if not key[-1] or not pcm_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= len(self.entries.pop(key)[1])
+            self.entries[key] = (translated_text, pcm_bytes)
+            self.total_bytes += len(pcm_bytes)
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def snapshot(self):
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.total_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+
+# Disfluencies a speaker can add or drop without changing what needs translating, by source
+# language (the part of the code before the dash). Only sounds that are never words count:
+# "er" is a word in German, "also" a word in English
+FILLER_WORDS = {
+    "en": frozenset(["um", "umm", "uh", "uhh", "uhm", "er", "erm", "hmm"]),
+    "es": frozenset(["eh", "em", "emm", "hmm"]),
+    "fr": frozenset(["euh", "heu", "hmm"]),
+    "de": frozenset(["äh", "ähm", "öh", "hmm"])
+}
+
+
+class TranslationMemory:
+    """Bounded fuzzy translation memory per language pair over a character n-gram index.
+
+    A lookup reuses a stored translation when the normalized text matches exactly, or when
+    a stored sentence is at least threshold-similar (Dice over character n-grams) and the two
+    differ only by filler words, or by numbers that can be patched into the translation.
+    Anything else is a miss, so "can" vs "can't" never reuses the wrong sentence.
+    """
+
+    def __init__(self, max_entries=TRANSLATION_MEMORY_SIZE, threshold=TRANSLATION_MEMORY_THRESHOLD,
+                 ngram=3, min_fuzzy_chars=12, store=None):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ngram = ngram
+        self.min_fuzzy_chars = min_fuzzy_chars
+        self.store = store
+        # (source_code, target_code, normalized text) -> (translated_text, n-grams), in LRU order
+        self.entries = OrderedDict()
+        # (source_code, target_code) -> n-gram -> keys of the entries containing it
+        self.index = {}
+        self.lookup_latency = LatencyTracker(window=500)
+        self.stats = {"lookups": 0, "exact": 0, "fuzzy": 0, "patched": 0, "misses": 0}
+        self.lock = threading.Lock()
+
+        if store:
+            for source_code, target_code, source_text, translated_text in store.load_translation_memory(max_entries):
+                self._insert((source_code, target_code, source_text), translated_text)
+            if self.entries:
+                logger.info(f"🧠 Translation memory: {len(self.entries)} entries loaded")
+
+    def _grams(self, text):
+        padded = f" {text} "
+        return frozenset(padded[i:i + self.ngram] for i in range(max(1, len(padded) - self.ngram + 1)))
+
+    def _insert(self, key, translated_text):
+        if key in self.entries:
+            self._remove(key)
+        grams = self._grams(key[2])
+        self.entries[key] = (translated_text, grams)
+        postings = self.index.setdefault(key[:2], {})
+        for gram in grams:
+            postings.setdefault(gram, set()).add(key)
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        _, grams = self.entries.pop(key)
+        postings = self.index[key[:2]]
+        for gram in grams:
+            keys = postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del postings[gram]
+
+    def _best_match(self, pair, text):
+        """Stored (key, similarity) most similar to text within the pair, or (None, 0.0) below the threshold"""
+        postings = self.index.get(pair)
+        if not postings:
+            return None, 0.0
+        grams = self._grams(text)
+        # Reaching the threshold takes at least `need` shared n-grams, so a match must contain one
+        # of the len(grams) - need + 1 rarest ones; only their postings are scanned
+        need = int(self.threshold * len(grams) / (2.0 - self.threshold))
+        rarest = sorted(grams, key=lambda gram: len(postings.get(gram, ())))[:max(1, len(grams) - need + 1)]
+        candidates = set()
+        for gram in rarest:
+            candidates.update(postings.get(gram, ()))
+        best, best_score = None, 0.0
+        for key in candidates:
+            stored = self.entries[key][1]
+            score = 2.0 * len(grams & stored) / (len(grams) + len(stored))
+            if score > best_score:
+                best, best_score = key, score
+        return best, best_score
+
+    @staticmethod
+    def _patch(stored_text, text, translated_text, source_code):
+        """Adapt translated_text of stored_text to text, or None if the difference is not safe to patch"""
+        fillers = FILLER_WORDS.get(source_code.split("-")[0].lower(), frozenset())
+        stored_words = [w for w in stored_text.split() if w not in fillers]
+        words = [w for w in text.split() if w not in fillers]
+        if stored_words == words:
+            return translated_text
+        if len(stored_words) != len(words):
+            return None
+        patched = translated_text
+        for old, new in zip(stored_words, words):
+            if old == new:
+                continue
+            # Only numbers are patched, and only when the translation carries the old one once
+            if not (old.isdigit() and new.isdigit()):
+                return None
+            pattern = rf"(?<!\d){re.escape(old)}(?!\d)"
+            if len(re.findall(pattern, patched)) != 1:
+                return None
+            patched = re.sub(pattern, new, patched)
+        return patched
+
+    def lookup(self, text, source_code, target_code):
+        """Reusable translation of text, or None"""
+        started = time.perf_counter()
+        normalized = normalize_text(text)
+        pair = (source_code, target_code)
+        result, kind = None, "misses"
+        with self.lock:
+            self.stats["lookups"] += 1
+            key = pair + (normalized,)
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                result, kind = self.entries[key][0], "exact"
+            elif len(normalized) >= self.min_fuzzy_chars:
+                best, score = self._best_match(pair, normalized)
+                if best is not None and score >= self.threshold:
+                    stored_translation = self.entries[best][0]
+                    result = self._patch(best[2], normalized, stored_translation, source_code)
+                    if result is not None:
+                        self.entries.move_to_end(best)
+                        kind = "fuzzy" if result == stored_translation else "patched"
+            self.stats[kind] += 1
+        self.lookup_latency.record(time.perf_counter() - started)
+        if kind in ("fuzzy", "patched"):
+            logger.info(f"🧠 Translation memory {kind} match: '{text[:30]}'")
+        return result
+
+    def add(self, text, source_code, target_code, translated_text):
+        normalized = normalize_text(text)
+        if not normalized or not translated_text:
+            return
+        with self.lock:
+            self._insert((source_code, target_code, normalized), translated_text)
+        if self.store:
+            self.store.record_translation(source_code, target_code, normalized, translated_text)
+
+    def snapshot(self):
+        with self.lock:
+            stats = dict(self.stats, entries=len(self.entries))
+        reused = stats["exact"] + stats["fuzzy"] + stats["patched"]
+        stats["reuse_rate"] = round(reused / stats["lookups"], 3) if stats["lookups"] else None
+        for pct in (50, 95):
+            latency = self.lookup_latency.percentile(pct)
+            stats[f"lookup_p{pct}_ms"] = round(latency * 1000, 3) if latency is not None else None
+        return stats
+
+
+def resample_pcm(audio_data, original_rate, target_rate):
+    """Linear-interpolation resample of mono int16 PCM"""
+    if original_rate == target_rate or not audio_data:
+        return audio_data
+    audio = np.frombuffer(audio_data, dtype=np.int16)
+    new_length = int(len(audio) * target_rate / original_rate)
+    return np.interp(
+        np.linspace(0, len(audio) - 1, new_length),
+        np.arange(len(audio)),
+        audio
+    ).astype(np.int16).tobytes()
+
+
+class WsolaStretcher:
+    """Streaming pitch-preserving time compression of mono int16 PCM (WSOLA).
+
+    Output frames overlap by half. Each frame is taken from within search_ms of its nominal
+    input position, at the offset that best continues the previous frame, so the waveform
+    stays in phase and the pitch is unchanged. speed > 1 shortens the audio by that factor.
+    """
+
+    def __init__(self, sample_rate, frame_ms=25, search_ms=8):
+        self.frame = max(16, int(sample_rate * frame_ms / 1000)) // 2 * 2
+        self.hop = self.frame // 2
+        self.search = max(1, int(sample_rate * search_ms / 1000))
+        # The search runs on every step-th sample (about 8 kHz) and is then refined around the best hit
+        self.step = max(1, sample_rate // 8000)
+        # Periodic Hann: windows overlapped by half sum to one
+        self.window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(self.frame) / self.frame)).astype(np.float32)
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.offset = 0          # input index of buffer[0]
+        self.position = 0.0      # nominal input index of the next frame
+        self.previous = None     # input index of the last frame taken
+        self.tail = np.zeros(self.hop, dtype=np.float32)
+        self.input_samples = 0
+        self.output_samples = 0
+
+    def _frames(self, speed, limit=None):
+        out = []
+        end = self.offset + len(self.buffer)
+        while limit is None or self.position < limit:
+            nominal = int(self.position)
+            if self.previous is None:
+                if nominal + self.frame > end:
+                    break
+                start = nominal
+            else:
+                natural = self.previous + self.hop
+                lo = max(nominal - self.search, self.offset)
+                hi = nominal + self.search
+                if max(hi, natural) + self.frame > end:
+                    break
+                template = self.buffer[natural - self.offset:natural - self.offset + self.frame]
+                region = self.buffer[lo - self.offset:hi - self.offset + self.frame]
+                # Normalized cross-correlation of every candidate offset at once
+                candidates = np.lib.stride_tricks.sliding_window_view(region, self.frame)
+                power = np.concatenate(([0.0], np.cumsum(region * region, dtype=np.float64)))
+                norm = np.sqrt(power[self.frame:] - power[:-self.frame] + 1e-3)
+                step = self.step
+                coarse = step * int(np.argmax((candidates[::step, ::step] @ template[::step]) / norm[::step]))
+                fine = slice(max(0, coarse - step + 1), min(len(norm), coarse + step))
+                start = lo + fine.start + int(np.argmax((candidates[fine] @ template) / norm[fine]))
+            segment = self.buffer[start - self.offset:start - self.offset + self.frame] * self.window
+            out.append(self.tail + segment[:self.hop])
+            self.tail = segment[self.hop:]
+            self.previous = start
+            self.position += self.hop * speed
+
+        # Drop input that no later frame can reach
+        keep_from = int(self.position) - self.search
+        if self.previous is not None:
+            keep_from = min(keep_from, self.previous + self.hop)
+        if keep_from > self.offset:
+            self.buffer = self.buffer[keep_from - self.offset:]
+            self.offset = keep_from
+        return out
+
+    def _emit(self, frames):
+        if not frames:
+            return b""
+        samples = np.concatenate(frames)
+        self.output_samples += len(samples)
+        return np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+
+    def process(self, pcm, speed):
+        """Compress a chunk of PCM; returns the compressed PCM that is ready so far"""
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        self.input_samples += len(samples)
+        self.buffer = np.concatenate((self.buffer, samples))
+        return self._emit(self._frames(speed))
+
+    def flush(self, speed):
+        """Compress whatever input is left and return the rest of the output"""
+        end = self.offset + len(self.buffer)
+        self.buffer = np.concatenate((self.buffer, np.zeros(self.frame + 2 * self.search + self.hop,
+                                                            dtype=np.float32)))
+        frames = self._frames(speed, limit=end)
+        frames.append(self.tail)
+        self.tail = np.zeros(self.hop, dtype=np.float32)
+        return self._emit(frames)
+
+
+class MixerSource:
+    """One stream of PCM feeding an AudioMixer: an utterance, a cached phrase or a notification"""
+
+    def __init__(self, mixer, name, priority, sample_rate, expires_at=None):
+        self.mixer = mixer
+        self.name = name
+        self.priority = priority
+        self.sample_rate = sample_rate
+        self.expires_at = expires_at
+        self.chunks = deque()
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.position = 0.0          # fractional read offset into buffer, in source samples
+        self.pending = 0             # source samples in chunks, not yet in buffer
+        self.gain = 1.0
+        self.closed = False
+        self.cancelled = False
+        self.started = False
+        self.played = False
+        self.played_samples = 0      # device samples mixed so far
+        self.finished = threading.Event()
+
+    def write(self, pcm):
+        """Queue mono int16 PCM at the source's sample rate"""
+        if pcm:
+            self.mixer._feed(self, pcm)
+
+    def close(self):
+        """No more audio: the source finishes once what is queued has played"""
+        self.mixer._close(self)
+
+    def cancel(self):
+        """Stop now, fading out whatever is playing"""
+        self.mixer._cancel(self)
+
+    def available(self):
+        return len(self.buffer) - self.position + self.pending
+
+
+class AudioMixer:
+    """Real-time mixer for one output stream, written by a single thread.
+
+    Sources are mixed in float32 blocks of frame_ms. While a source plays, sources of
+    lower priority (higher numbers) are ducked by duck_gain; a source still playing after
+    its expiry time is stale and is faded out. Each source is resampled to the stream's
+    current rate as it is mixed, so the stream can change device (and rate) mid-utterance.
+    target() returns the (stream, rate) to write to.
+    """
+
+    def __init__(self, name, target, frame_ms=AUDIO_FRAME_MS, duck_db=MIXER_DUCK_DB):
+        self.name = name
+        self.target = target
+        self.frame_ms = frame_ms
+        self.duck_gain = 10 ** (-duck_db / 20)
+        self.sources = []
+        self.condition = threading.Condition()
+        self.running = True
+        self.thread = None
+        # A writer stuck in a device write is replaced by a new generation (see recover())
+        self.writer_generation = 0
+        self.writing_since = None
+        self.stats = {"sources": 0, "blocks": 0, "overlapped_blocks": 0, "ducked_blocks": 0,
+                      "expired": 0, "cancelled": 0, "write_errors": 0, "writer_restarts": 0, "max_sources": 0}
+
+    def add_source(self, name, priority, sample_rate, expires_in=None):
+        """Start a source; lower priority numbers duck higher ones"""
+        source = MixerSource(self, name, priority, sample_rate,
+                             time.monotonic() + expires_in if expires_in is not None else None)
+        with self.condition:
+            self.sources.append(source)
+            self.stats["sources"] += 1
+            self.stats["max_sources"] = max(self.stats["max_sources"], len(self.sources))
+            if self.thread is None:
+                self._start_writer()
+            self.condition.notify_all()
+        return source
+
+    def _start_writer(self):
+        self.writer_generation += 1
+        self.thread = threading.Thread(target=self._run, args=(self.writer_generation,),
+                                       name=f"mixer-{self.name}", daemon=True)
+        self.thread.start()
+
+    def recover(self, stuck_after):
+        """Start a new writer if the current one has been stuck in a device write for stuck_after seconds"""
+        with self.condition:
+            if self.writing_since is None or time.monotonic() - self.writing_since < stuck_after:
+                return False
+            logger.warning(f"⚠️ {self.name} device write stuck, starting a new mixer writer")
+            self.writing_since = None
+            self.stats["writer_restarts"] += 1
+            self._start_writer()
+            return True
+
+    def _feed(self, source, pcm):
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        with self.condition:
+            if source.cancelled:
+                return
+            source.chunks.append(samples)
+            source.pending += len(samples)
+            self.condition.notify_all()
+
+    def _close(self, source):
+        with self.condition:
+            source.closed = True
+            self.condition.notify_all()
+
+    def _cancel(self, source):
+        with self.condition:
+            if not source.cancelled and not source.finished.is_set():
+                source.cancelled = True
+                self.stats["cancelled"] += 1
+            self.condition.notify_all()
+
+    def _finish(self, source):
+        self.sources.remove(source)
+        source.chunks.clear()
+        source.finished.set()
+
+    def _ready(self, source, frames, rate):
+        # Mix a source once it has a full block, or whatever is left of it when it is ending
+        if source.cancelled or source.closed:
+            return True
+        return source.available() >= frames * source.sample_rate / rate + 1
+
+    def _pull(self, source, frames, rate):
+        """The source's next block at the device rate, linearly interpolated (shorter if it ends)"""
+        ratio = source.sample_rate / rate
+        needed = int(source.position + frames * ratio) + 2
+        if len(source.buffer) < needed and source.chunks:
+            start = int(source.position)
+            source.buffer = np.concatenate([source.buffer[start:]] + list(source.chunks))
+            source.position -= start
+            source.chunks.clear()
+            source.pending = 0
+        last = len(source.buffer) - 1
+        count = min(frames, int((last - source.position) / ratio) + 1) if last >= source.position else 0
+        if count <= 0:
+            return np.zeros(0, dtype=np.float32)
+        if ratio == 1.0 and source.position.is_integer():
+            start = int(source.position)
+            block = source.buffer[start:start + count]
+        else:
+            positions = source.position + np.arange(count) * ratio
+            index = positions.astype(np.int64)
+            fraction = (positions - index).astype(np.float32)
+            following = np.minimum(index + 1, last)
+            block = source.buffer[index] * (1 - fraction) + source.buffer[following] * fraction
+        source.position += count * ratio
+        return block
+
+    def _mix(self, frames, rate):
+        """Mix one block from the ready sources: (pcm, sources mixed, sources ending), or None"""
+        now = time.monotonic()
+        for source in list(self.sources):
+            if source.expires_at is not None and now > source.expires_at and not source.cancelled:
+                source.cancelled = True
+                self.stats["expired"] += 1
+            if source.cancelled and (not source.started or source.gain == 0.0):
+                self._finish(source)
+        ready = [source for source in self.sources if self._ready(source, frames, rate)]
+        if not ready:
+            return None
+        
+        with TRACER.span("mix", "cpu", output=self.name, sources=len(ready)):
+            audible = [source.priority for source in self.sources if not source.cancelled]
+            top = min(audible) if audible else 0
+            mixed = np.zeros(frames, dtype=np.float32)
+            length = 0
+            ducked = False
+            ending = []
+            for source in ready:
+                block = self._pull(source, frames, rate)
+                count = len(block)
+                if source.cancelled:
+                    target_gain = 0.0
+                elif source.priority > top:
+                    target_gain = self.duck_gain
+                    ducked = True
+                else:
+                    target_gain = 1.0
+                if count:
+                    source.started = True
+                    source.played_samples += count
+                    if target_gain != source.gain:
+                        # Ramp across the block so gain changes do not click
+                        block = block * np.linspace(source.gain, target_gain, count, dtype=np.float32)
+                    elif source.gain != 1.0:
+                        block = block * np.float32(source.gain)
+                    mixed[:count] += block
+                    length = max(length, count)
+                source.gain = target_gain
+                if source.cancelled or (count < frames and source.closed and not source.chunks):
+                    ending.append(source)
+            
+            self.stats["blocks"] += 1
+            if len(ready) > 1:
+                self.stats["overlapped_blocks"] += 1
+            if ducked:
+                self.stats["ducked_blocks"] += 1
+            mixed = np.clip(mixed[:length], -1.0, 32767 / 32768)
+            return (mixed * 32768).astype(np.int16).tobytes(), ready, ending
+
+    def _run(self, generation):
+        missing_stream = False
+        while True:
+            stream, rate = self.target()
+            frames = max(1, int(rate * self.frame_ms / 1000))
+            with self.condition:
+                while self.running and generation == self.writer_generation:
+                    block = self._mix(frames, rate)
+                    if block is not None:
+                        break
+                    # Idle, or waiting on sources still streaming in: nothing is written
+                    self.condition.wait(0.5 if self.sources else None)
+                if not self.running or generation != self.writer_generation:
+                    return
+            
+            pcm, sources, ending = block
+            if pcm and not stream:
+                if not missing_stream:
+                    logger.error(f"❌ {self.name} stream not initialized!")
+                missing_stream = True
+            elif pcm:
+                missing_stream = False
+                try:
+                    self.writing_since = time.monotonic()
+                    with TRACER.span("device.write", "audio", device=self.name, bytes=len(pcm)):
+                        stream.write(pcm)
+                    for source in sources:
+                        source.played = True
+                except Exception as e:
+                    self.stats["write_errors"] += 1
+                    logger.error(f"❌ Error playing audio to {self.name}: {e}")
+            
+            # Sources finish only once their last block is written, so waiters see it played
+            with self.condition:
+                if generation != self.writer_generation:
+                    # Replaced while stuck: the new writer owns the sources now
+                    return
+                self.writing_since = None
+                for source in ending:
+                    if source in self.sources:
+                        self._finish(source)
+
+    def snapshot(self):
+        with self.condition:
+            return dict(self.stats, active=len(self.sources))
+
+    def stop(self):
+        """Stop the writer; sources still queued end unplayed"""
+        with self.condition:
+            self.running = False
+            for source in list(self.sources):
+                self._finish(source)
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join(2.0)
+
+
+class PacedSource:
+    """Base for simulated capture sources that hand out audio no faster than a device would"""
+
+    next_wall = None
+
+    def _pace(self, seconds, speed):
+        """Seconds to sleep so reads keep to speed x real time (no pacing when speed is None)"""
+        now = time.time()
+        if self.next_wall is None or not speed:
+            self.next_wall = now
+        else:
+            self.next_wall = max(self.next_wall, now - 1.0) + seconds / speed
+        return self.next_wall - now
+
+
+class ReplaySource(PacedSource):
+    """A recorded WAV file served as capture audio, paced at a speed multiplier (None = as fast as possible)"""
+
+    def __init__(self, path, speed=1.0):
+        self.path = path
+        self.speed = speed
+        self.pcm_by_rate = {}
+        self.position = 0.0
+        self.finished = path is None
+        self.duration = len(self.pcm_at(16000)) / 2 / 16000 if path else 0.0
+        self.lock = threading.Lock()
+
+    def pcm_at(self, rate):
+        if not self.path:
+            return b""
+        if rate not in self.pcm_by_rate:
+            self.pcm_by_rate[rate] = read_wav_pcm(self.path, rate)
+        return self.pcm_by_rate[rate]
+
+    def read(self, frames, rate):
+        with self.lock:
+            pcm = self.pcm_at(rate)
+            start = int(self.position * rate) * 2
+            chunk = pcm[start:start + frames * 2]
+            if len(chunk) < frames * 2:
+                chunk += b"\x00" * (frames * 2 - len(chunk))
+                self.finished = True
+            self.position += frames / rate
+
+            # After the file ends keep feeding silence at 1x so recognizers can endpoint
+            delay = self._pace(frames / rate, self.speed if not self.finished else 1.0)
+
+        if delay > 0:
+            time.sleep(delay)
+        return chunk
+
+
+class ReplayInputStream:
+    """PyAudio-style input stream reading from a paced source, in blocking or callback mode"""
+
+    def __init__(self, source, rate, frames_per_buffer=1600, stream_callback=None):
+        self.source = source
+        self.rate = rate
+        self.frames_per_buffer = frames_per_buffer
+        self.active = True
+        if stream_callback:
+            threading.Thread(target=self._feed, args=(frames_per_buffer, stream_callback),
+                             name="replay-capture", daemon=True).start()
+
+    def _feed(self, frames, stream_callback):
+        while self.active:
+            chunk = self.source.read(frames, self.rate)
+            if self.active:
+                stream_callback(chunk, frames, {}, 0)
+
+    def read(self, frames, exception_on_overflow=True):
+        return self.source.read(frames, self.rate)
+
+    def get_input_latency(self):
+        # A simulated device hands over each buffer as soon as it is full
+        return self.frames_per_buffer / self.rate
+
+    def is_active(self):
+        return self.active
+
+    def stop_stream(self):
+        self.active = False
+
+    def close(self):
+        self.active = False
+
+
+class NullOutputStream:
+    """Output sink that discards audio, counting what was written"""
+
+    def __init__(self, rate, speed=None):
+        self.rate = rate
+        self.speed = speed
+        self.bytes_written = 0
+
+    def write(self, data):
+        self.bytes_written += len(data)
+        if self.speed:
+            # Block like a real device would, scaled by the replay speed
+            time.sleep(len(data) / 2 / self.rate / self.speed)
+
+    @property
+    def seconds_written(self):
+        return self.bytes_written / 2 / self.rate
+
+    def get_output_latency(self):
+        return 0.0
+
+    def is_active(self):
+        return True
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class WavFileOutputStream(NullOutputStream):
+    """Output sink that records everything written to a WAV file"""
+
+    def __init__(self, path, rate, speed=None):
+        super().__init__(rate, speed)
+        self.path = Path(path)
+        self.wav = wave.open(str(self.path), 'wb')
+        self.wav.setnchannels(1)
+        self.wav.setsampwidth(2)
+        self.wav.setframerate(rate)
+
+    def write(self, data):
+        self.wav.writeframes(data)
+        super().write(data)
+
+    def close(self):
+        if self.wav:
+            self.wav.close()
+            self.wav = None
+
+
+class LoopbackChannel:
+    """In-memory audio cable: PCM written to its output side is heard on its input side"""
+
+    def __init__(self, rate=48000, max_seconds=30.0):
+        self.rate = rate
+        self.buffer = bytearray()
+        self.max_bytes = int(rate * max_seconds) * 2
+        self.lock = threading.Lock()
+        self.bytes_written = 0
+        self.bytes_dropped = 0
+
+    def write(self, data, rate):
+        data = resample_pcm(bytes(data), rate, self.rate)
+        with self.lock:
+            self.buffer += data
+            self.bytes_written += len(data)
+            overflow = len(self.buffer) - self.max_bytes
+            if overflow > 0:
+                # Nobody is listening: keep only the most recent audio, like a real cable
+                del self.buffer[:overflow]
+                self.bytes_dropped += overflow
+
+    def read(self, frames, rate):
+        """Take frames at the caller's rate, padding with silence when the cable is quiet"""
+        size = int(frames * self.rate / rate) * 2
+        with self.lock:
+            chunk = bytes(self.buffer[:size])
+            del self.buffer[:size]
+        chunk += b"\x00" * (size - len(chunk))
+        return resample_pcm(chunk, self.rate, rate)[:frames * 2].ljust(frames * 2, b"\x00")
+
+
+class LoopbackSource(PacedSource):
+    """Capture side of a LoopbackChannel, paced like a device"""
+
+    def __init__(self, channel, speed=1.0):
+        self.channel = channel
+        self.speed = speed
+        self.lock = threading.Lock()
+
+    def read(self, frames, rate):
+        with self.lock:
+            delay = self._pace(frames / rate, self.speed)
+        if delay > 0:
+            time.sleep(delay)
+        return self.channel.read(frames, rate)
+
+
+class LoopbackOutputStream(NullOutputStream):
+    """Playback side of a LoopbackChannel"""
+
+    def __init__(self, channel, rate, speed=1.0):
+        super().__init__(rate, speed)
+        self.channel = channel
+
+    def write(self, data):
+        self.channel.write(data, self.rate)
+        super().write(data)
+
+
+class AudioBackend:
+    """Audio device layer every stream is opened through; mirrors pyaudio.PyAudio's calls"""
+
+    name = "audio"
+    # False when an output is a recording that opening the device again would start over
+    reopen_outputs = True
+
+    def list_devices(self):
+        """Device dicts with index, name, max_input_channels, max_output_channels and defaultSampleRate"""
+        raise NotImplementedError
+
+    def open(self, rate, channels=1, format=PA_INT16, input=False, output=False, input_device_index=None,
+             output_device_index=None, frames_per_buffer=1024, stream_callback=None):
+        raise NotImplementedError
+
+    def get_device_info_by_index(self, index):
+        for device in self.list_devices():
+            if device["index"] == index:
+                return device
+        raise ValueError(f"No audio device {index}")
+
+    def is_format_supported(self, rate, **kwargs):
+        return True
+
+    def terminate(self):
+        pass
+
+
+class PyAudioBackend(AudioBackend):
+    """Sound hardware through PortAudio"""
+
+    name = "pyaudio"
+
+    def __init__(self):
+        if pyaudio is None:
+            raise RuntimeError("PyAudio is not installed; set AUDIO_BACKEND=null or loopback to run without sound hardware")
+        self.pa = pyaudio.PyAudio()
+
+    def list_devices(self):
+        # sounddevice and PyAudio number the same PortAudio devices but name the fields differently
+        devices = []
+        if sd is not None:
+            for idx, info in enumerate(sd.query_devices()):
+                devices.append({
+                    "index": idx,
+                    "name": info["name"],
+                    "max_input_channels": info["max_input_channels"],
+                    "max_output_channels": info["max_output_channels"],
+                    "defaultSampleRate": info["default_samplerate"]
+                })
+            return devices
+        for idx in range(self.pa.get_device_count()):
+            info = self.pa.get_device_info_by_index(idx)
+            devices.append({
+                "index": idx,
+                "name": info["name"],
+                "max_input_channels": info["maxInputChannels"],
+                "max_output_channels": info["maxOutputChannels"],
+                "defaultSampleRate": info["defaultSampleRate"]
+            })
+        return devices
+
+    def open(self, **kwargs):
+        return self.pa.open(**kwargs)
+
+    def get_device_info_by_index(self, index):
+        return self.pa.get_device_info_by_index(index)
+
+    def is_format_supported(self, rate, **kwargs):
+        return self.pa.is_format_supported(rate, **kwargs)
+
+    def terminate(self):
+        self.pa.terminate()
+
+
+class VirtualAudioBackend(AudioBackend):
+    """Simulated devices: inputs read from paced sources, outputs write to in-process sinks"""
+
+    name = "virtual"
+
+    def __init__(self, speed=1.0):
+        self.speed = speed
+        self.devices = []
+        self.sources = {}
+        self.sink_factories = {}
+        self.outputs = {}
+
+    def add_device(self, name, source=None, sink_factory=None, rate=48000):
+        """Register a device; source makes it an input, sink_factory(rate) makes it an output"""
+        index = len(self.devices)
+        self.devices.append({
+            "index": index,
+            "name": name,
+            "max_input_channels": 1 if source else 0,
+            "max_output_channels": 1 if sink_factory else 0,
+            "defaultSampleRate": float(rate)
+        })
+        if source:
+            self.sources[index] = source
+        if sink_factory:
+            self.sink_factories[index] = sink_factory
+        return index
+
+    def list_devices(self):
+        return [dict(device) for device in self.devices]
+
+    def open(self, rate=16000, channels=1, format=PA_INT16, input=False, output=False, input_device_index=None,
+             output_device_index=None, frames_per_buffer=1024, stream_callback=None, **kwargs):
+        if input:
+            # The first input device is the default (microphone)
+            index = input_device_index if input_device_index is not None else min(self.sources)
+            return ReplayInputStream(self.sources[index], rate, frames_per_buffer, stream_callback)
+        index = output_device_index if output_device_index is not None else min(self.sink_factories)
+        stream = self.sink_factories[index](rate)
+        self.outputs[self.devices[index]["name"]] = stream
+        return stream
+
+
+class NullAudioBackend(VirtualAudioBackend):
+    """Headless devices: silent inputs and outputs that discard audio, both paced in real time"""
+
+    name = "null"
+
+    def __init__(self, speed=1.0):
+        super().__init__(speed)
+        self.add_device("Null Microphone", source=ReplaySource(None), rate=16000)
+        self.add_device("Null Meeting In", source=ReplaySource(None), rate=16000)
+        self.add_device("Null Meeting Out", sink_factory=lambda rate: NullOutputStream(rate, speed), rate=44100)
+        self.add_device("Null Speakers", sink_factory=lambda rate: NullOutputStream(rate, speed), rate=44100)
+
+
+class WavFileAudioBackend(VirtualAudioBackend):
+    """Recorded WAV files as the microphone and meeting inputs; outputs written to WAV files.
+    
+    Outputs go to <out_dir>/to_meeting.wav and to_you.wav (discarded without out_dir);
+    speed None replays the inputs as fast as they are read.
+    """
+
+    name = "wav"
+    reopen_outputs = False
+
+    def __init__(self, mic_wav=None, meeting_wav=None, out_dir=None, speed=1.0):
+        super().__init__(speed)
+        self.out_dir = Path(out_dir) if out_dir else None
+        self.mic = ReplaySource(mic_wav, speed)
+        self.meeting = ReplaySource(meeting_wav, speed)
+        self.add_device("WAV Microphone", source=self.mic, rate=16000)
+        self.add_device("WAV Meeting In", source=self.meeting, rate=16000)
+        self.add_device("WAV Meeting Out", sink_factory=lambda rate: self._sink("to_meeting", rate), rate=44100)
+        self.add_device("WAV Speakers", sink_factory=lambda rate: self._sink("to_you", rate), rate=44100)
+
+    def _sink(self, name, rate):
+        if self.out_dir:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            return WavFileOutputStream(self.out_dir / f"{name}.wav", rate, self.speed)
+        return NullOutputStream(rate, self.speed)
+
+
+class LoopbackAudioBackend(VirtualAudioBackend):
+    """Devices wired in memory: whatever is played to the meeting comes back on the meeting input.
+    
+    Lets the outgoing translation feed the incoming recognizer for echo testing, and gives
+    deterministic throughput and latency measurements without sound hardware.
+    """
+
+    name = "loopback"
+
+    def __init__(self, mic_wav=None, speed=1.0, cable_rate=48000):
+        super().__init__(speed)
+        self.cable = LoopbackChannel(cable_rate)
+        self.mic = ReplaySource(mic_wav, speed)
+        self.add_device("Loopback Microphone", source=self.mic, rate=16000)
+        self.add_device("Loopback Cable", source=LoopbackSource(self.cable, speed),
+                        sink_factory=lambda rate: LoopbackOutputStream(self.cable, rate, speed), rate=cable_rate)
+        self.add_device("Loopback Speakers", sink_factory=lambda rate: NullOutputStream(rate, speed), rate=44100)
+
+
+def create_audio_backend(name, **options):
+    """Audio backend by AUDIO_BACKEND name; options go to its constructor"""
+    backends = {"pyaudio": PyAudioBackend, "null": NullAudioBackend, "loopback": LoopbackAudioBackend,
+                "wav": WavFileAudioBackend}
+    if name not in backends:
+        raise ValueError(f"Unknown audio backend '{name}' (choose from {', '.join(backends)})")
+    return backends[name](**options)
+
+
+class CaptureRing:
+    """Single-producer/single-consumer byte ring between an audio callback and its STT feeder.
+
+    Each side only advances its own position, so the data path takes no lock. When the ring is
+    full the incoming block is dropped and counted rather than blocking the audio callback.
+    """
+
+    def __init__(self, capacity):
+        self.buffer = bytearray(capacity)
+        self.capacity = capacity
+        self.write_pos = 0
+        self.read_pos = 0
+        self.data_ready = threading.Event()
+        self.dropped_bytes = 0
+        self.drop_events = 0
+        self.peak_fill = 0
+
+    def available(self):
+        return self.write_pos - self.read_pos
+
+    def push(self, data):
+        data = memoryview(data)
+        size = len(data)
+        fill = self.write_pos - self.read_pos
+        if fill + size > self.capacity:
+            self.dropped_bytes += size
+            self.drop_events += 1
+            self.data_ready.set()
+            return False
+
+        start = self.write_pos % self.capacity
+        first = min(size, self.capacity - start)
+        self.buffer[start:start + first] = data[:first]
+        if first < size:
+            self.buffer[:size - first] = data[first:]
+        self.write_pos += size
+        self.peak_fill = max(self.peak_fill, fill + size)
+        self.data_ready.set()
+        return True
+
+    def pop(self, size, timeout=0.25):
+        """Take exactly size bytes, or None if they did not arrive within timeout"""
+        deadline = time.monotonic() + timeout
+        while self.available() < size:
+            self.data_ready.clear()
+            if self.available() >= size:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.data_ready.wait(remaining):
+                return None
+
+        start = self.read_pos % self.capacity
+        first = min(size, self.capacity - start)
+        chunk = bytes(self.buffer[start:start + first])
+        if first < size:
+            chunk += bytes(self.buffer[:size - first])
+        self.read_pos += size
+        return chunk
+
+
+class CaptureStats:
+    """Overflow and drop counters for one capture stream, kept across stream restarts"""
+
+    def __init__(self, name):
+        self.name = name
+        self.captured_frames = 0
+        self.dropped_frames = 0
+        self.drop_events = 0
+        self.device_overflows = 0
+        self.peak_buffered_ms = 0.0
+
+    def snapshot(self):
+        return {
+            "captured_frames": self.captured_frames,
+            "dropped_frames": self.dropped_frames,
+            "drop_events": self.drop_events,
+            "device_overflows": self.device_overflows,
+            "peak_buffered_ms": round(self.peak_buffered_ms, 1)
+        }
+
+
+class CallbackCapture:
+    """Input stream opened in PyAudio callback mode, feeding a CaptureRing.
+
+    Exposes the blocking read() of a PyAudio stream so the STT generators can consume it
+    unchanged, while capture keeps running when the consumer falls behind.
+    """
+
+    def __init__(self, audio_interface, stats, rate, channels=1, frames_per_buffer=1600,
+                 input_device_index=None, buffer_seconds=2.0):
+        self.stats = stats
+        self.rate = rate
+        self.frame_bytes = 2 * channels
+        self.ring = CaptureRing(int(rate * buffer_seconds) * self.frame_bytes)
+        self.active = True
+        self.stream = audio_interface.open(
+            format=PA_INT16,
+            channels=channels,
+            rate=rate,
+            input=True,
+            input_device_index=input_device_index,
+            frames_per_buffer=frames_per_buffer,
+            stream_callback=self._callback
+        )
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        if status & PA_INPUT_OVERFLOW:
+            # PortAudio itself discarded input before handing it to us
+            self.stats.device_overflows += 1
+        if self.ring.push(in_data):
+            self.stats.captured_frames += frame_count
+            buffered_ms = self.ring.available() / self.frame_bytes / self.rate * 1000
+            self.stats.peak_buffered_ms = max(self.stats.peak_buffered_ms, buffered_ms)
+        else:
+            self.stats.dropped_frames += frame_count
+            self.stats.drop_events += 1
+        return (None, PA_CONTINUE)
+
+    def read(self, num_frames, exception_on_overflow=False):
+        while self.active:
+            chunk = self.ring.pop(num_frames * self.frame_bytes)
+            if chunk is not None:
+                return chunk
+        raise IOError("Capture stream closed")
+
+    def is_active(self):
+        return self.active and self.stream.is_active()
+
+    def stop_stream(self):
+        self.active = False
+        self.stream.stop_stream()
+
+    def close(self):
+        self.active = False
+        self.stream.close()
+
+
+class SharedPcmRing:
+    """Single-producer/single-consumer PCM ring in shared memory, for audio between processes.
+
+    The header holds write and read positions, a closed flag, the capacity and the stream's
+    sample rate as uint64 slots. Each side only advances its own position, so no lock is
+    shared across processes; waiting sides poll every couple of milliseconds. Pickling a ring
+    hands the other process an attachment to the same segment.
+    """
+
+    HEADER_SLOTS = 5
+    WRITE, READ, CLOSED, CAPACITY, RATE = range(HEADER_SLOTS)
+
+    def __init__(self, capacity=None, name=None):
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.HEADER_SLOTS * 8 + capacity)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.header = np.ndarray((self.HEADER_SLOTS,), dtype=np.uint64, buffer=self.shm.buf)
+        if self.owner:
+            self.header[:] = 0
+            self.header[self.CAPACITY] = capacity
+        self.capacity = int(self.header[self.CAPACITY])
+        self.data = self.shm.buf[self.HEADER_SLOTS * 8:self.HEADER_SLOTS * 8 + self.capacity]
+        self.dropped_bytes = 0
+
+    def __reduce__(self):
+        return (SharedPcmRing, (None, self.shm.name))
+
+    @property
+    def rate(self):
+        return int(self.header[self.RATE])
+
+    @rate.setter
+    def rate(self, value):
+        self.header[self.RATE] = value
+
+    @property
+    def closed(self):
+        return bool(self.header[self.CLOSED])
+
+    def close_stream(self):
+        """Tell both ends the stream is over; blocked reads and writes return"""
+        self.header[self.CLOSED] = 1
+
+    def available(self):
+        return int(self.header[self.WRITE]) - int(self.header[self.READ])
+
+    def push(self, data, timeout=0.0):
+        """Append data, waiting up to timeout (None = until closed) for space; False if dropped"""
+        data = memoryview(data).cast("B")
+        size = len(data)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.capacity - self.available() < size:
+            if self.closed or size > self.capacity or (deadline is not None and time.monotonic() >= deadline):
+                self.dropped_bytes += size
+                return False
+            time.sleep(0.002)
+
+        write_pos = int(self.header[self.WRITE])
+        start = write_pos % self.capacity
+        first = min(size, self.capacity - start)
+        self.data[start:start + first] = data[:first]
+        if first < size:
+            self.data[:size - first] = data[first:]
+        self.header[self.WRITE] = write_pos + size
+        return True
+
+    def pop(self, size, timeout=0.25, partial=False):
+        """Take exactly size bytes (up to size with partial), or None if nothing arrived in time"""
+        deadline = time.monotonic() + timeout
+        while True:
+            available = self.available()
+            if available >= size or (partial and available >= 2):
+                break
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.002)
+
+        size = min(size, available - available % 2)
+        read_pos = int(self.header[self.READ])
+        start = read_pos % self.capacity
+        first = min(size, self.capacity - start)
+        chunk = bytes(self.data[start:start + first])
+        if first < size:
+            chunk += bytes(self.data[:size - first])
+        self.header[self.READ] = read_pos + size
+        return chunk
+
+    def close(self):
+        """Detach from the segment; the creating process also frees it"""
+        if self.data is None:
+            return
+        self.header = None
+        self.data.release()
+        self.data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingSource:
+    """Capture side of a SharedPcmRing filled by an AudioHub in another process"""
+
+    def __init__(self, ring):
+        self.ring = ring
+
+    def wait_rate(self, timeout=10.0):
+        """The rate the hub opened the device at, once it has"""
+        deadline = time.monotonic() + timeout
+        while not self.ring.rate and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.ring.rate
+
+    def read(self, frames, rate):
+        while True:
+            chunk = self.ring.pop(frames * 2)
+            if chunk is not None:
+                return chunk
+            if self.ring.closed:
+                raise IOError("Audio hub stopped")
+
+
+class RingOutputStream(NullOutputStream):
+    """Playback side of a SharedPcmRing; blocks like a device while the hub drains it"""
+
+    def __init__(self, ring, rate):
+        super().__init__(rate)
+        self.ring = ring
+        self.ring.rate = rate
+
+    def write(self, data):
+        data = memoryview(data).cast("B")
+        step = self.ring.capacity // 4
+        for offset in range(0, len(data), step):
+            if not self.ring.push(data[offset:offset + step], timeout=None):
+                return
+        self.bytes_written += len(data)
+
+
+class RingAudioBackend(VirtualAudioBackend):
+    """Worker-side devices backed by SharedPcmRings, which an AudioHub pumps to the real devices.
+
+    inputs maps device names to rings; outputs maps device names to (ring, native_rate).
+    Input devices only accept the rate the hub captures at.
+    """
+
+    name = "ring"
+
+    def __init__(self, inputs=None, outputs=None):
+        super().__init__()
+        for name, ring in (inputs or {}).items():
+            self.add_device(name, source=RingSource(ring), rate=0)
+        for name, (ring, rate) in (outputs or {}).items():
+            self.add_device(name, sink_factory=lambda stream_rate, ring=ring: RingOutputStream(ring, stream_rate),
+                            rate=rate)
+
+    def get_device_info_by_index(self, index):
+        info = super().get_device_info_by_index(index)
+        if index in self.sources:
+            info["defaultSampleRate"] = float(self.sources[index].wait_rate())
+        return info
+
+    def is_format_supported(self, rate, input_device=None, **kwargs):
+        if input_device in self.sources and rate != self.sources[input_device].wait_rate():
+            raise ValueError("Invalid sample rate")
+        return True
+
+    def open(self, rate=16000, input=False, input_device_index=None, **kwargs):
+        if input:
+            index = input_device_index if input_device_index is not None else min(self.sources)
+            self.is_format_supported(rate, input_device=index)
+        return super().open(rate=rate, input=input, input_device_index=input_device_index, **kwargs)
+
+
+class JitterStats:
+    """How far each capture buffer's arrival lands from its nominal period"""
+
+    def __init__(self, name, period, window=3000):
+        self.name = name
+        self.period = period
+        self.deviations = deque(maxlen=window)
+        self.buffers = 0
+        self.max_gap = 0.0
+        self.last = None
+
+    def record(self, now=None):
+        now = now or time.perf_counter()
+        if self.last is not None:
+            interval = now - self.last
+            self.deviations.append(abs(interval - self.period))
+            self.max_gap = max(self.max_gap, interval)
+        self.last = now
+        self.buffers += 1
+
+    def snapshot(self):
+        deviations = sorted(self.deviations)
+        if not deviations:
+            return {"buffers": self.buffers}
+
+        def pct(p):
+            return round(deviations[min(len(deviations) - 1, int(len(deviations) * p))] * 1000, 2)
+
+        return {
+            "buffers": self.buffers,
+            "period_ms": round(self.period * 1000, 2),
+            "jitter_p50_ms": pct(0.50),
+            "jitter_p95_ms": pct(0.95),
+            "jitter_p99_ms": pct(0.99),
+            "jitter_max_ms": round(deviations[-1] * 1000, 2),
+            "max_gap_ms": round(self.max_gap * 1000, 2)
+        }
+
+
+class AudioHub:
+    """Moves PCM between audio devices and SharedPcmRings, measuring capture jitter.
 
-# API Keys from .env
-MURF_API_KEY = os.getenv("MURF_API_KEY")
-GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    In process-per-direction mode it runs alone in its own process, so device I/O never
+    waits on a GIL held by a pipeline or the GUI.
+    """
 
-# Set Google credentials
-if GOOGLE_APPLICATION_CREDENTIALS:
-    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = GOOGLE_APPLICATION_CREDENTIALS
+    def __init__(self, backend, frame_ms=AUDIO_FRAME_MS):
+        self.backend = backend
+        self.frame_ms = frame_ms
+        self.running = True
+        self.threads = []
+        self.jitter = {}
+        self.rings = {}
+        # Stream name -> device index; set_device() changes it and the stream's loop reopens
+        self.devices = {}
 
-# Murf URLs
-MURF_WS_URL = "wss://api.murf.ai/v1/speech/stream-input"
-MURF_TRANSLATE_URL = "https://api.murf.ai/v1/text/translate"
+    def add_input(self, name, ring, device_index=None, rates=None):
+        """Capture a device into ring (None only measures), at the first of rates it accepts"""
+        self.devices[name] = device_index
+        self._start(f"hub-capture-{name}", self._capture_loop, name, ring, device_index, rates)
 
-# Audio storage folders
-OUTGOING_AUDIO_FOLDER = "outgoing_translations"
-INCOMING_AUDIO_FOLDER = "incoming_translations"
+    def add_output(self, name, ring, device_index=None):
+        """Play ring to a device at the rate its writer set"""
+        self.devices[name] = device_index
+        self._start(f"hub-playback-{name}", self._playback_loop, name, ring, device_index)
 
-# Supported languages
-SUPPORTED_LANGUAGES = {
-    "English (US)": {
-        "stt_code": "en-US",
-        "murf_translate_code": "en-US",
-        "voices": {
-            "Natalie (Female)": "en-US-natalie",
-            "Miles (Male)": "en-US-miles",
-            "Ken (Male)": "en-US-ken",
-            "Clint (Male)": "en-US-clint",
-            "Amara (Female)": "en-US-amara"
-        }
-    },
-    "English (UK)": {
-        "stt_code": "en-GB",
-        "murf_translate_code": "en-UK",
-        "voices": {
-            "Ruby (Female)": "en-UK-ruby",
-            "Oliver (Male)": "en-UK-oliver"
-        }
-    },
-    "English (India)": {
-        "stt_code": "en-IN",
-        "murf_translate_code": "en-IN",
-        "voices": {
-            "Priya (Female)": "en-IN-priya",
-            "Rahul (Male)": "en-IN-rahul"
-        }
-    },
-    "Hindi": {
-        "stt_code": "hi-IN",
-        "murf_translate_code": "hi-IN",
-        "voices": {
-            "Kabir (Male)": "hi-IN-kabir",
-            "Ayushi (Female)": "hi-IN-ayushi",
-            "Shaan (Male)": "hi-IN-shaan",
-            "Shweta (Female)": "hi-IN-shweta"
-        }
-    },
-    "Tamil": {
-        "stt_code": "ta-IN",
-        "murf_translate_code": "ta-IN",
-        "voices": {
-            "Iniya (Female)": "ta-IN-iniya",
-            "Suresh (Male)": "ta-IN-suresh"
-        }
-    },
-    "Bengali": {
-        "stt_code": "bn-IN",
-        "murf_translate_code": "bn-IN",
-        "voices": {
-            "Anwesha (Female)": "bn-IN-anwesha",
-            "Abhik (Male)": "bn-IN-abhik"
-        }
-    },
-    "Marathi": {
-        "stt_code": "mr-IN",
-        "murf_translate_code": "mr-IN",
-        "voices": {
-            "Mira (Female)": "mr-IN-mira",
-            "Aarav (Male)": "mr-IN-aarav"
-        }
-    },
-    "Telugu": {
-        "stt_code": "te-IN",
-        "murf_translate_code": "te-IN",
-        "voices": {
-            "Vani (Female)": "te-IN-vani",
-            "Ravi (Male)": "te-IN-ravi"
-        }
-    },
-    "Kannada": {
-        "stt_code": "kn-IN",
-        "murf_translate_code": "kn-IN",
-        "voices": {
-            "Deepa (Female)": "kn-IN-deepa",
-            "Kiran (Male)": "kn-IN-kiran"
-        }
-    },
-    "Gujarati": {
-        "stt_code": "gu-IN",
-        "murf_translate_code": "gu-IN",
-        "voices": {
-            "Diya (Female)": "gu-IN-diya",
-            "Jay (Male)": "gu-IN-jay"
-        }
-    },
-    "Spanish (Spain)": {
-        "stt_code": "es-ES",
-        "murf_translate_code": "es-ES",
-        "voices": {
-            "Sofia (Female)": "es-ES-sofia",
-            "Carlos (Male)": "es-ES-carlos"
-        }
-    },
-    "French": {
-        "stt_code": "fr-FR",
-        "murf_translate_code": "fr-FR",
-        "voices": {
-            "Isabelle (Female)": "fr-FR-isabelle",
-            "Pierre (Male)": "fr-FR-pierre"
-        }
-    },
-    "German": {
-        "stt_code": "de-DE",
-        "murf_translate_code": "de-DE",
-        "voices": {
-            "Anna (Female)": "de-DE-anna",
-            "Klaus (Male)": "de-DE-klaus"
+    def _start(self, thread_name, target, *args):
+        thread = threading.Thread(target=target, args=args, name=thread_name, daemon=True)
+        self.threads.append(thread)
+        thread.start()
+
+    def _open(self, device_index, rates, is_input):
+        if not rates:
+            native_rate = int(self.backend.get_device_info_by_index(device_index)['defaultSampleRate'])
+            rates = [native_rate, 48000, 44100, 16000]
+        for rate in dict.fromkeys(rates):
+            try:
+                stream = self.backend.open(
+                    format=PA_INT16,
+                    channels=1,
+                    rate=rate,
+                    input=is_input,
+                    output=not is_input,
+                    input_device_index=device_index if is_input else None,
+                    output_device_index=None if is_input else device_index,
+                    frames_per_buffer=max(1, int(rate * self.frame_ms / 1000))
+                )
+                return stream, rate
+            except Exception:
+                continue
+        raise RuntimeError(f"Device {device_index} accepts none of {list(rates)}Hz")
+
+    def set_device(self, name, device_index):
+        """Move a stream to another device; its loop reopens it between frames"""
+        self.devices[name] = device_index
+
+    def _capture_loop(self, name, ring, device_index, rates):
+        stream = None
+        try:
+            stream, rate = self._open(device_index, rates, is_input=True)
+            ring_rate = rate
+            frames = max(1, int(rate * self.frame_ms / 1000))
+            stats = self.jitter[name] = JitterStats(name, frames / rate)
+            if ring is not None:
+                ring.rate = rate
+                self.rings[name] = ring
+            logger.info(f"🎛️ Hub capturing {name} at {rate}Hz")
+            while self.running and not (ring is not None and ring.closed):
+                if self.devices[name] != device_index:
+                    stream.close()
+                    stream = None
+                    device_index = self.devices[name]
+                    # Readers keep the ring's rate: a device that refuses it is resampled into it
+                    try:
+                        stream, rate = self._open(device_index, [ring_rate], is_input=True)
+                    except RuntimeError:
+                        stream, rate = self._open(device_index, rates, is_input=True)
+                    frames = max(1, int(rate * self.frame_ms / 1000))
+                    logger.info(f"🎛️ Hub capturing {name} from device {device_index} at {rate}Hz")
+                chunk = stream.read(frames, exception_on_overflow=False)
+                stats.record()
+                if ring is not None:
+                    ring.push(resample_pcm(chunk, rate, ring_rate))
+        except Exception as e:
+            if self.running:
+                logger.error(f"❌ Hub capture {name} failed: {e}")
+        finally:
+            if stream:
+                stream.close()
+
+    def _playback_loop(self, name, ring, device_index):
+        stream = None
+        try:
+            while self.running and not ring.rate and not ring.closed:
+                time.sleep(0.01)
+            if not ring.rate:
+                return
+            rate = ring.rate
+            # Fall back to the device's own rate (and resample) if it refuses the writer's
+            rates = [rate] if self._accepts(device_index, rate) else None
+            stream, device_rate = self._open(device_index, rates, is_input=False)
+            chunk_bytes = max(1, int(rate * self.frame_ms / 1000)) * 2
+            logger.info(f"🎛️ Hub playing {name} at {device_rate}Hz")
+            while self.running:
+                if self.devices[name] != device_index:
+                    stream.close()
+                    stream = None
+                    device_index = self.devices[name]
+                    rates = [rate] if self._accepts(device_index, rate) else None
+                    stream, device_rate = self._open(device_index, rates, is_input=False)
+                    logger.info(f"🎛️ Hub playing {name} on device {device_index} at {device_rate}Hz")
+                chunk = ring.pop(chunk_bytes, timeout=0.1, partial=True)
+                if chunk is None:
+                    if ring.closed:
+                        break
+                    continue
+                stream.write(resample_pcm(chunk, rate, device_rate))
+        except Exception as e:
+            if self.running:
+                logger.error(f"❌ Hub playback {name} failed: {e}")
+        finally:
+            if stream:
+                stream.close()
+
+    def _accepts(self, device_index, rate):
+        try:
+            return self.backend.is_format_supported(rate, output_device=device_index, output_channels=1,
+                                                    output_format=PA_INT16)
+        except Exception:
+            return False
+
+    def snapshot(self):
+        report = {name: stats.snapshot() for name, stats in list(self.jitter.items())}
+        for name, ring in list(self.rings.items()):
+            report[name]["dropped_bytes"] = ring.dropped_bytes
+        return report
+
+    def stop(self, timeout=2.0):
+        self.running = False
+        for thread in self.threads:
+            thread.join(timeout)
+
+
+def batch_audio_frames(frames, batch_bytes):
+    """Join small capture frames into requests of at least batch_bytes for the recognizer"""
+    pending = []
+    pending_bytes = 0
+    for frame in frames:
+        pending.append(frame)
+        pending_bytes += len(frame)
+        if pending_bytes >= batch_bytes:
+            yield pending[0] if len(pending) == 1 else b"".join(pending)
+            pending = []
+            pending_bytes = 0
+    if pending:
+        yield b"".join(pending)
+
+
+# A final transcript handed from an STT thread to its translation pipeline
+Transcript = namedtuple("Transcript", ["text", "speech_end", "recognized_at"])
+
+
+class TranslationJob:
+    """One utterance moving through a direction's translate → synthesize → playback stages"""
+
+    def __init__(self, seq, original_text, speech_end=None, recognized_at=None):
+        self.seq = seq
+        self.original_text = original_text
+        self.created_at = time.time()
+        self.speech_end = speech_end or self.created_at
+        self.recognized_at = recognized_at or self.created_at
+        self.translated_at = None
+        self.first_audio_at = None
+        self.completed_at = None
+        self.translated_parts = []
+        self.segments = queue.Queue()
+        self.audio = queue.Queue()
+        self.audio_bytes = 0
+        self.audio_path = None
+        self.sample_rate = None
+        self.voice_config = None
+        self.cache_key = None
+        self.cached_audio = None
+        # Codes, voice and language in effect when the job was created (reconfigure() may change them)
+        self.settings = None
+
+    @property
+    def translated_text(self):
+        return " ".join(self.translated_parts) or self.original_text
+
+    def __getstate__(self):
+        # Finished jobs cross process boundaries without their hand-off queues or audio
+        state = dict(self.__dict__)
+        state.update(segments=None, audio=None,
+                     cached_audio=b"" if self.cached_audio is not None else None)
+        return state
+
+    def stage_latencies(self):
+        """Seconds spent in each stage, measured from the end of speech"""
+        end = self.completed_at or self.created_at
+        return {
+            "recognition_lag": round(self.recognized_at - self.speech_end, 3),
+            "queue_wait": round(self.created_at - self.recognized_at, 3),
+            "translate": round((self.translated_at or end) - self.created_at, 3),
+            "first_audio": round((self.first_audio_at or end) - self.speech_end, 3),
+            "total": round(end - self.speech_end, 3)
         }
-    }
-}
+
+
+class Heartbeat:
+    """A supervised stage thread's liveness handle: beat() on progress, stop when not current"""
+
+    def __init__(self, name, generation):
+        self.name = name
+        self.generation = generation
+        self.last_beat = time.monotonic()
+        self.current = True
+        self.work = None
+
+    def beat(self):
+        self.last_beat = time.monotonic()
+
+    @property
+    def age(self):
+        return time.monotonic() - self.last_beat
+
+
+class StageSupervisor:
+    """Restarts pipeline stage threads that die or stop beating while the session runs.
+
+    A stalled thread cannot be killed, so its Heartbeat is retired and a replacement started;
+    the old thread exits at its next check. on_abandon(name, work) lets the pipeline release
+    the item a retired stage was holding so the stages downstream are not left waiting.
+    """
+
+    def __init__(self, stall_timeout=20.0, check_interval=0.5, max_backoff=10.0, on_event=None, on_abandon=None):
+        self.stall_timeout = stall_timeout
+        self.check_interval = check_interval
+        self.max_backoff = max_backoff
+        self.on_event = on_event
+        self.on_abandon = on_abandon
+        self.stages = {}
+        self.queues = {}
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            self.stages = {}
+            self.queues = {}
+        self.running = True
+        self.thread = threading.Thread(target=self._watch, name="supervisor", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        with self.lock:
+            for stage in self.stages.values():
+                stage["heartbeat"].current = False
+
+    def add(self, name, target, args=(), stall_timeout=None):
+        """Run target(*args, heartbeat) in a supervised thread named name"""
+        with self.lock:
+            self.stages[name] = {
+                "target": target, "args": args, "stall_timeout": stall_timeout or self.stall_timeout,
+                "heartbeat": None, "thread": None, "restarts": 0, "stalls": 0, "deaths": 0,
+                "next_restart": 0.0
+            }
+            self._launch(name)
+
+    def watch_queue(self, name, q, enqueued_at):
+        """Report the age of q's oldest item; enqueued_at(item) gives its enqueue time"""
+        with self.lock:
+            self.queues[name] = (q, enqueued_at)
+
+    def _launch(self, name):
+        stage = self.stages[name]
+        generation = stage["restarts"] + 1
+        heartbeat = Heartbeat(name, generation)
+        thread = threading.Thread(target=stage["target"], args=stage["args"] + (heartbeat,),
+                                  name=name if generation == 1 else f"{name}#{generation}", daemon=True)
+        stage["heartbeat"], stage["thread"] = heartbeat, thread
+        thread.start()
+
+    def _watch(self):
+        while self.running:
+            time.sleep(self.check_interval)
+            events = []
+            with self.lock:
+                if not self.running:
+                    break
+                now = time.monotonic()
+                for name, stage in self.stages.items():
+                    heartbeat = stage["heartbeat"]
+                    if not stage["thread"].is_alive():
+                        reason = "died"
+                    elif heartbeat.age > stage["stall_timeout"]:
+                        reason = "stalled"
+                    else:
+                        continue
+                    if now < stage["next_restart"]:
+                        continue
+
+                    heartbeat.current = False
+                    stage["deaths" if reason == "died" else "stalls"] += 1
+                    stage["restarts"] += 1
+                    # Back off when a stage keeps failing, so a persistent fault cannot spin
+                    stage["next_restart"] = now + min(self.max_backoff, 2 ** (stage["restarts"] - 1) - 1)
+                    events.append((name, reason, heartbeat))
+                    self._launch(name)
+
+            for name, reason, heartbeat in events:
+                detail = f" (no heartbeat for {heartbeat.age:.1f}s)" if reason == "stalled" else ""
+                logger.warning(f"🩺 {name} {reason}{detail}, restarted as generation {heartbeat.generation + 1}")
+                if heartbeat.work is not None and self.on_abandon:
+                    try:
+                        self.on_abandon(name, heartbeat.work)
+                    except Exception as e:
+                        logger.error(f"❌ Releasing work abandoned by {name} failed: {e}")
+                if self.on_event:
+                    self.on_event(f"🩺 {name} {reason}, restarted")
+
+    def queue_ages(self):
+        ages = {}
+        now = time.time()
+        with self.lock:
+            queues = dict(self.queues)
+        for name, (q, enqueued_at) in queues.items():
+            with q.mutex:
+                oldest = q.queue[0] if q.queue else None
+            ages[name] = round(now - enqueued_at(oldest), 3) if oldest is not None else 0.0
+        return ages
+
+    def snapshot(self):
+        with self.lock:
+            stages = {
+                name: {
+                    "alive": stage["thread"].is_alive(),
+                    "heartbeat_age": round(stage["heartbeat"].age, 3),
+                    "generation": stage["heartbeat"].generation,
+                    "restarts": stage["restarts"],
+                    "stalls": stage["stalls"],
+                    "deaths": stage["deaths"]
+                }
+                for name, stage in self.stages.items()
+            }
+        return {"stages": stages, "queue_age": self.queue_ages()}
+
+
+Synthesis = namedtuple("Synthesis", ["audio_bytes", "audio_path"])
+
+
+class SessionStore:
+    """SQLite archive of sessions and utterances with an FTS5 index over both texts.
+
+    Writes are queued and committed in batches by a background thread that owns the write
+    connection; record calls never block, and a full queue drops (and counts) the record.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            started_at REAL NOT NULL,
+            ended_at REAL,
+            source_lang TEXT,
+            target_lang TEXT
+        );
+        CREATE TABLE IF NOT EXISTS utterances (
+            id INTEGER PRIMARY KEY,
+            session_id TEXT NOT NULL REFERENCES sessions(id),
+            direction TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            source_code TEXT,
+            target_code TEXT,
+            original_text TEXT NOT NULL,
+            translated_text TEXT,
+            spoken_at REAL NOT NULL,
+            recognition_lag REAL,
+            queue_wait REAL,
+            translate REAL,
+            first_audio REAL,
+            total REAL,
+            audio_path TEXT,
+            cached INTEGER NOT NULL DEFAULT 0,
+            played INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS utterances_session ON utterances(session_id, direction, seq);
+        CREATE INDEX IF NOT EXISTS utterances_spoken_at ON utterances(spoken_at);
+        CREATE TABLE IF NOT EXISTS translation_memory (
+            source_code TEXT NOT NULL,
+            target_code TEXT NOT NULL,
+            source_text TEXT NOT NULL,
+            translated_text TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (source_code, target_code, source_text)
+        );
+    """
+
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS utterances_fts USING fts5(
+            original_text, translated_text, content='utterances', content_rowid='id'
+        );
+        CREATE TRIGGER IF NOT EXISTS utterances_fts_insert AFTER INSERT ON utterances BEGIN
+            INSERT INTO utterances_fts(rowid, original_text, translated_text)
+            VALUES (new.id, new.original_text, new.translated_text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS utterances_fts_delete AFTER DELETE ON utterances BEGIN
+            INSERT INTO utterances_fts(utterances_fts, rowid, original_text, translated_text)
+            VALUES ('delete', old.id, old.original_text, old.translated_text);
+        END;
+    """
+
+    def __init__(self, path, batch_size=50, flush_interval=0.5, max_pending=10000):
+        self.path = str(path)
+        if self.path == ":memory:":
+            # Every connection here is opened anew, so an in-memory database would be a different,
+            # empty one for the writer, the schema and each reader
+            raise sqlite3.NotSupportedError("the session store needs a database file, not an in-memory database")
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.written = 0
+        self.dropped = 0
+        self.fts = True
+
+        conn = self._connect()
+        try:
+            conn.executescript(self.SCHEMA)
+            try:
+                conn.executescript(self.FTS_SCHEMA)
+            except sqlite3.OperationalError as e:
+                # SQLite built without FTS5: search falls back to LIKE scans
+                logger.warning(f"⚠️ FTS5 unavailable, transcript search will be slow: {e}")
+                self.fts = False
+            conn.commit()
+        finally:
+            conn.close()
+
+        self.writer = threading.Thread(target=self._writer_loop, name="session-store", daemon=True)
+        self.writer.start()
+        logger.info(f"🗄️ Session store: {self.path}")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _enqueue(self, op, row):
+        try:
+            self.pending.put_nowait((op, row))
+        except queue.Full:
+            self.dropped += 1
+
+    def start_session(self, source_lang, target_lang):
+        """Queue a new session row and return its id"""
+        session_id = uuid.uuid4().hex
+        self._enqueue("session", (session_id, time.time(), source_lang, target_lang))
+        return session_id
+
+    def end_session(self, session_id):
+        self._enqueue("end", (time.time(), session_id))
+
+    def record_utterance(self, session_id, direction, job, played, source_code, target_code, audio_path=None):
+        latencies = job.stage_latencies()
+        self._enqueue("utterance", (
+            session_id, direction, job.seq, source_code, target_code,
+            job.original_text, job.translated_text, job.speech_end,
+            latencies["recognition_lag"], latencies["queue_wait"], latencies["translate"],
+            latencies["first_audio"], latencies["total"],
+            str(audio_path) if audio_path else None, int(job.cached_audio is not None), int(played)
+        ))
+
+    def record_translation(self, source_code, target_code, source_text, translated_text):
+        self._enqueue("memory", (source_code, target_code, source_text, translated_text, time.time()))
+
+    def load_translation_memory(self, limit):
+        """Most recently stored translation memory rows, oldest first"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT source_code, target_code, source_text, translated_text FROM translation_memory "
+                "ORDER BY updated_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return rows[::-1]
+
+    def _writer_loop(self):
+        conn = self._connect()
+        try:
+            while True:
+                try:
+                    batch = [self.pending.get(timeout=self.flush_interval)]
+                except queue.Empty:
+                    continue
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.pending.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(op == "close" for op, _ in batch)
+                try:
+                    with conn:
+                        self._write_batch(conn, batch)
+                except sqlite3.Error as e:
+                    logger.error(f"❌ Session store write failed ({len(batch)} records): {e}")
+                for _ in batch:
+                    self.pending.task_done()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn, batch):
+        for op, row in batch:
+            if op == "session":
+                conn.execute(
+                    "INSERT INTO sessions (id, started_at, source_lang, target_lang) VALUES (?, ?, ?, ?)", row
+                )
+            elif op == "end":
+                conn.execute("UPDATE sessions SET ended_at = ? WHERE id = ?", row)
+            elif op == "utterance":
+                conn.execute(
+                    "INSERT INTO utterances (session_id, direction, seq, source_code, target_code, "
+                    "original_text, translated_text, spoken_at, recognition_lag, queue_wait, translate, "
+                    "first_audio, total, audio_path, cached, played) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+                )
+                self.written += 1
+            elif op == "memory":
+                conn.execute(
+                    "INSERT OR REPLACE INTO translation_memory "
+                    "(source_code, target_code, source_text, translated_text, updated_at) VALUES (?, ?, ?, ?, ?)", row
+                )
+
+    def search(self, text, limit=50, session_id=None):
+        """Utterances whose original or translated text matches an FTS5 query, best first"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            where = " AND u.session_id = ?" if session_id else ""
+            params = [session_id] if session_id else []
+            if self.fts:
+                sql = ("SELECT u.* FROM utterances_fts f JOIN utterances u ON u.id = f.rowid "
+                       f"WHERE utterances_fts MATCH ?{where} ORDER BY f.rank LIMIT ?")
+                try:
+                    return [dict(row) for row in conn.execute(sql, [text] + params + [limit])]
+                except sqlite3.OperationalError:
+                    # Not valid query syntax (e.g. "can't" or "Hindi-IN"): search for it as a phrase
+                    phrase = '"' + text.replace('"', '""') + '"'
+                    return [dict(row) for row in conn.execute(sql, [phrase] + params + [limit])]
+            else:
+                sql = ("SELECT u.* FROM utterances u WHERE (u.original_text LIKE ? OR u.translated_text LIKE ?)"
+                       f"{where} ORDER BY u.spoken_at DESC LIMIT ?")
+                params = [f"%{text}%", f"%{text}%"] + params
+            return [dict(row) for row in conn.execute(sql, params + [limit])]
+        finally:
+            conn.close()
+
+    def session_utterances(self, session_id):
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in conn.execute(
+                "SELECT * FROM utterances WHERE session_id = ? ORDER BY spoken_at", (session_id,)
+            )]
+        finally:
+            conn.close()
+
+    def flush(self):
+        """Block until everything queued so far is committed"""
+        self.pending.join()
+
+    def close(self):
+        if self.writer.is_alive():
+            self.pending.put(("close", None))
+            self.writer.join(timeout=5)
+
+    def snapshot(self):
+        return {"written": self.written, "pending": self.pending.qsize(), "dropped": self.dropped}
 
 
 class BidirectionalVoiceTranslator:
-    def __init__(self):
+    def __init__(self, require_google=True, audio_backend=None, session_db=SESSION_DB,
+                 local_stt_model=LOCAL_STT_MODEL, request_scheduler=None):
         self.is_running = False
         self.outgoing_text_queue = queue.Queue()
         self.incoming_text_queue = queue.Queue()
         self.audio_level_callback = None
+        self.utterance_callback = None
         
         # Track last processed text to prevent duplicates
         self.last_outgoing_text = ""
@@ -189,28 +3923,142 @@ class BidirectionalVoiceTranslator:
             self.speech_client = speech.SpeechClient()
             logger.info("✅ Google Speech-to-Text initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize Google Speech: {e}")
-            raise Exception("Google Cloud credentials not configured properly. Check your .env file.")
+            if require_google:
+                logger.error(f"Failed to initialize Google Speech: {e}")
+                raise Exception("Google Cloud credentials not configured properly. Check your .env file.")
+            logger.warning(f"⚠️ Google Speech unavailable, continuing without it: {e}")
+            self.speech_client = None
         
         # Audio settings
         self.sample_rate = 16000
-        self.chunk_size = int(self.sample_rate / 10)
         self.channels = 1
         
+        # Frame size for capture and playback streams, and audio batched into each STT request
+        self.frame_ms = AUDIO_FRAME_MS
+        self.stt_batch_ms = STT_BATCH_MS
+        
+        # Capture: "callback" buffers device audio in a ring so slow STT feeders cannot
+        # overrun the device ("blocking" reads the stream directly)
+        self.capture_mode = "callback"
+        self.capture_buffer_seconds = 2.0
+        self.capture_stats = {"mic": CaptureStats("mic"), "meeting": CaptureStats("meeting")}
+        
         # Device IDs and their supported sample rates
         self.output_device = None
         self.output_device_sample_rate = 44100
         self.input_device = None
         self.speaker_device = None
         self.speaker_device_sample_rate = 44100
+        # Output streams are swapped under device_lock when a device changes mid-session;
+        # switches themselves run one at a time
+        self.device_lock = threading.Lock()
+        self.device_switch_lock = threading.Lock()
+        self.device_switch_grace = 1.0
+        # One mixer per output stream: every write to a device goes through its mixer's thread
+        self.mixers = {}
+        
+        # Languages and voices of the running session; reconfigure() changes them live
+        self.session_config = None
+        self.stt_languages = {}
+        self.pipeline_specs = {}
         
         # Murf audio settings
         self.murf_sample_rate = 44100
         self.murf_format = "WAV"
         self.murf_channel_type = "MONO"
+
+        # Streaming synthesis: push translated clauses into a long-lived Murf context
+        # (False sends each utterance as a single segment)
+        self.streaming_synthesis = True
+        self.stream_min_segment_chars = 25
+        self.stream_max_segment_chars = 120
         
-        # PyAudio instances
-        self.pyaudio_instance = pyaudio.PyAudio()
+        # Resilient request layer: hedging, retries and circuit breakers per endpoint, all
+        # admitted by one scheduler (by default the one every translator in the process shares)
+        self.request_scheduler = request_scheduler or REQUEST_SCHEDULER
+        self.translate_caller = ResilientCaller("murf-translate", default_hedge_delay=2.0,
+                                                scheduler=self.request_scheduler)
+        self.tts_connect_caller = ResilientCaller("murf-tts-connect", default_hedge_delay=1.0,
+                                                  scheduler=self.request_scheduler)
+        # Scheduler priorities (lower is admitted first) and this translator's fair-queuing session
+        first, second = ("outgoing", "incoming") if REQUEST_PRIORITY == "outgoing" else ("incoming", "outgoing")
+        self.request_priority = {first: 0, second: 1, "background": 2}
+        self.request_session = uuid.uuid4().hex[:8]
+        
+        # Pluggable engines, routed per utterance by measured latency and errors
+        self.recognition_router = BackendRouter("recognition", [
+            GoogleRecognitionBackend(self.speech_client, STT_ENCODING, scheduler=self.request_scheduler)
+        ] if self.speech_client else [])
+        self.translation_router = BackendRouter("translation", [
+            MurfTranslationBackend(self.translate_caller)
+        ])
+        self.synthesis_router = BackendRouter("synthesis", [
+            MurfSynthesisBackend(self.tts_connect_caller, self.murf_channel_type, self.murf_format)
+        ])
+        self.voice_level_threshold = 300
+        self.local_recognizer_pool = None
+        if local_stt_model:
+            self.enable_local_recognizer(local_stt_model, LOCAL_STT_WORKERS)
+        
+        # Adaptive quality: per-direction controllers trade STT/TTS quality for latency under load
+        self.adaptive_quality = True
+        self.quality_tiers = QUALITY_TIERS
+        self.quality = {
+            name: AdaptiveLatencyController(name, self.quality_tiers, LATENCY_BUDGET_S)
+            for name in ("outgoing", "incoming")
+        }
+        
+        # Catch-up: a direction that falls behind real time plays compressed audio until it is back
+        self.catchup_enabled = True
+        self.catchup_backlog = CATCHUP_BACKLOG
+        self.catchup_max_speed = CATCHUP_MAX_SPEED
+        self.catchup_rate_boost = CATCHUP_RATE_BOOST
+        # Seconds behind the latency budget at which the full speed-up applies
+        self.catchup_horizon = 6.0
+        self.catchup_stats = {
+            name: {"utterances": 0, "seconds_saved": 0.0, "speed": 1.0}
+            for name in ("outgoing", "incoming")
+        }
+        
+        # Persistent transcript archive, written off the translation threads
+        self.session_store = None
+        self.session_id = None
+        if session_db:
+            try:
+                self.session_store = SessionStore(session_db)
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Session store unavailable: {e}")
+        
+        # Translation memory: exact and near-duplicate sentences skip the translation endpoint,
+        # persisted in the session store when there is one
+        self.translation_memory = TranslationMemory(store=self.session_store)
+        
+        # Per-direction pipeline: depth of the bounded hand-off queues between stages
+        self.pipeline_depth = 2
+        # Stage threads are supervised: dead or stalled stages restart without stopping the session
+        self.supervisor = StageSupervisor(STAGE_STALL_TIMEOUT_S, on_abandon=self._release_abandoned_work)
+        self.active_jobs = 0
+        self.active_jobs_lock = threading.Lock()
+        
+        # Connection warmup: STT, translation and TTS connections are opened in parallel at start();
+        # translation waits for them unless wait_for_connections is off (then it goes live cold)
+        self.connection_warmup = True
+        self.wait_for_connections = CONNECTION_WARMUP_WAIT
+        self.connection_warmup_timeout = 10.0
+        self.keepalive_interval = KEEPALIVE_INTERVAL_S
+        self.connection_status = {}
+        self.connection_status_lock = threading.Lock()
+        self.connections_ready = threading.Event()
+        self.last_translate_at = 0.0
+        
+        # Synthesized audio cache, pre-filled with stock phrases at session start
+        self.audio_cache = AudioCache()
+        self.audio_cache_max_chars = 60
+        self.warmup_enabled = True
+        self.warmup_phrases = list(WARMUP_PHRASES)
+
+        # Audio device layer (sound hardware unless AUDIO_BACKEND says otherwise) and open streams
+        self.audio_backend = audio_backend or create_audio_backend(AUDIO_BACKEND)
         self.mic_stream = None
         self.virtual_input_stream = None
         self.virtual_output_stream = None
@@ -304,7 +4152,7 @@ class BidirectionalVoiceTranslator:
     def get_supported_sample_rate(self, device_index, is_input=False):
         """Get the supported sample rate for a device"""
         try:
-            device_info = self.pyaudio_instance.get_device_info_by_index(device_index)
+            device_info = self.audio_backend.get_device_info_by_index(device_index)
             default_sample_rate = int(device_info['defaultSampleRate'])
             
             test_rates = [16000, 48000, 44100, 32000, 24000, 22050, 11025, 8000]
@@ -312,20 +4160,20 @@ class BidirectionalVoiceTranslator:
             for rate in test_rates:
                 try:
                     if is_input:
-                        if self.pyaudio_instance.is_format_supported(
+                        if self.audio_backend.is_format_supported(
                             rate,
                             input_device=device_index,
                             input_channels=1,
-                            input_format=pyaudio.paInt16
+                            input_format=PA_INT16
                         ):
                             logger.info(f"   ✓ Device {device_index} supports {rate}Hz (input)")
                             return rate
                     else:
-                        if self.pyaudio_instance.is_format_supported(
+                        if self.audio_backend.is_format_supported(
                             rate,
                             output_device=device_index,
                             output_channels=1,
-                            output_format=pyaudio.paInt16
+                            output_format=PA_INT16
                         ):
                             logger.info(f"   ✓ Device {device_index} supports {rate}Hz (output)")
                             return rate
@@ -339,72 +4187,87 @@ class BidirectionalVoiceTranslator:
             logger.warning(f"   ⚠️ Could not determine sample rate for device {device_index}, defaulting to 16000Hz")
             return 16000
     
-    def resample_audio(self, audio_data, original_rate, target_rate):
-        """Resample audio data to target sample rate"""
-        if original_rate == target_rate:
-            return audio_data
+    def negotiate_output_rate(self, device_index):
+        """Pick an output rate that Murf can synthesize at directly, so playback needs no resampling.
         
+        Prefers the device's native rate, then the configured Murf rate, then other Murf rates;
+        falls back to any rate the device supports (playback then resamples).
+        """
         try:
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            ratio = target_rate / original_rate
-            new_length = int(len(audio_array) * ratio)
-            resampled = np.interp(
-                np.linspace(0, len(audio_array) - 1, new_length),
-                np.arange(len(audio_array)),
-                audio_array
-            ).astype(np.int16)
-            
-            return resampled.tobytes()
-        except Exception as e:
-            logger.error(f"   ❌ Resampling failed: {e}")
-            return audio_data
+            native_rate = int(self.audio_backend.get_device_info_by_index(device_index)['defaultSampleRate'])
+        except Exception:
+            native_rate = None
+        
+        candidates = [native_rate, self.murf_sample_rate] + sorted(MURF_SAMPLE_RATES, reverse=True)
+        for rate in dict.fromkeys(candidates):
+            if rate not in MURF_SAMPLE_RATES:
+                continue
+            try:
+                if self.audio_backend.is_format_supported(
+                    rate,
+                    output_device=device_index,
+                    output_channels=1,
+                    output_format=PA_INT16
+                ):
+                    logger.info(f"   ✓ Device {device_index} plays {rate}Hz natively, synthesizing at {rate}Hz")
+                    return rate
+            except:
+                continue
+        
+        rate = self.get_supported_sample_rate(device_index, is_input=False)
+        logger.info(f"   ⚠️ Device {device_index} has no Murf-compatible rate, resampling to {rate}Hz")
+        return rate
+    
+    def synthesis_sample_rate(self, direction):
+        """Murf rate for a direction: its output device's rate when Murf supports it"""
+        device_rate = self.output_device_sample_rate if direction == "outgoing" else self.speaker_device_sample_rate
+        return device_rate if device_rate in MURF_SAMPLE_RATES else self.murf_sample_rate
     
     def get_output_devices(self):
         """Get list of available output audio devices"""
-        devices = sd.query_devices()
         output_devices = {}
         logger.info("🔊 Available OUTPUT devices:")
-        for idx, device in enumerate(devices):
+        for device in self.audio_backend.list_devices():
             if device['max_output_channels'] > 0:
-                output_devices[device['name']] = idx
-                logger.info(f"  [{idx}] {device['name']}")
+                output_devices[device['name']] = device['index']
+                logger.info(f"  [{device['index']}] {device['name']}")
         return output_devices
     
     def get_input_devices(self):
         """Get list of available input audio devices"""
-        devices = sd.query_devices()
         input_devices = {}
         logger.info("🎤 Available INPUT devices:")
-        for idx, device in enumerate(devices):
+        for device in self.audio_backend.list_devices():
             if device['max_input_channels'] > 0:
-                input_devices[device['name']] = idx
-                logger.info(f"  [{idx}] {device['name']}")
+                input_devices[device['name']] = device['index']
+                logger.info(f"  [{device['index']}] {device['name']}")
         return input_devices
     
+    def use_audio_backend(self, backend):
+        """Switch to another audio backend (e.g. null or loopback devices for headless runs)"""
+        for stream in (self.virtual_output_stream, self.speaker_stream, self.mic_stream, self.virtual_input_stream):
+            if stream:
+                try:
+                    stream.stop_stream()
+                    stream.close()
+                except Exception:
+                    pass
+        self.virtual_output_stream = self.speaker_stream = None
+        self.mic_stream = self.virtual_input_stream = None
+        self.output_device = self.speaker_device = self.input_device = None
+        if self.audio_backend:
+            self.audio_backend.terminate()
+        self.audio_backend = backend
+        self.output_devices = self.get_output_devices()
+        self.input_devices = self.get_input_devices()
+        logger.info(f"🔌 Audio backend: {backend.name}")
+    
     def set_output_device(self, device_name):
         """Set the output device (Virtual Cable - for speaking to meeting)"""
         if device_name in self.output_devices:
             self.output_device = self.output_devices[device_name]
             logger.info(f"✅ OUTPUT device set to: {device_name} (Device ID: {self.output_device})")
-            
-            self.output_device_sample_rate = self.get_supported_sample_rate(self.output_device, is_input=False)
-            
-            try:
-                if self.virtual_output_stream:
-                    self.virtual_output_stream.close()
-                
-                self.virtual_output_stream = self.pyaudio_instance.open(
-                    format=pyaudio.paInt16,
-                    channels=1,
-                    rate=self.output_device_sample_rate,
-                    output=True,
-                    output_device_index=self.output_device,
-                    frames_per_buffer=1024
-                )
-                logger.info(f"✅ Virtual OUTPUT stream opened at {self.output_device_sample_rate}Hz")
-            except Exception as e:
-                logger.error(f"❌ Failed to open virtual output stream: {e}")
-            
+            self._switch_output_stream("output")
             return True
         return False
     
@@ -413,6 +4276,7 @@ class BidirectionalVoiceTranslator:
         if device_name in self.input_devices:
             self.input_device = self.input_devices[device_name]
             logger.info(f"✅ INPUT device set to: {device_name} (Device ID: {self.input_device})")
+            # A running incoming STT thread notices and reopens capture on the new device
             return True
         return False
     
@@ -421,51 +4285,107 @@ class BidirectionalVoiceTranslator:
         if device_name in self.output_devices:
             self.speaker_device = self.output_devices[device_name]
             logger.info(f"✅ SPEAKER device set to: {device_name} (Device ID: {self.speaker_device})")
+            self._switch_output_stream("speaker")
+            return True
+        return False
+    
+    def _switch_output_stream(self, kind):
+        """Reopen an output stream on its device: in the background if a session is playing to it"""
+        if self.is_running:
+            threading.Thread(target=self._replace_output_stream, args=(kind,),
+                             name="device-switch", daemon=True).start()
+        else:
+            self._replace_output_stream(kind)
+    
+    def _replace_output_stream(self, kind):
+        """Open the "output" or "speaker" stream on its current device and swap it in.
+        
+        Mid-session the old stream keeps playing until the new one is open, and is closed
+        after a grace period so a chunk being written to it can finish.
+        """
+        with self.device_switch_lock:
+            label = "Virtual OUTPUT stream" if kind == "output" else "Speaker stream"
+            device_index = self.output_device if kind == "output" else self.speaker_device
+            running = self.is_running
+            old_stream = self.virtual_output_stream if kind == "output" else self.speaker_stream
+            rate = self.negotiate_output_rate(device_index)
             
-            self.speaker_device_sample_rate = self.get_supported_sample_rate(self.speaker_device, is_input=False)
+            if not running and old_stream:
+                try:
+                    old_stream.close()
+                except Exception:
+                    pass
+                old_stream = None
             
             try:
-                if self.speaker_stream:
-                    self.speaker_stream.close()
-                
-                self.speaker_stream = self.pyaudio_instance.open(
-                    format=pyaudio.paInt16,
+                stream = self.audio_backend.open(
+                    format=PA_INT16,
                     channels=1,
-                    rate=self.speaker_device_sample_rate,
+                    rate=rate,
                     output=True,
-                    output_device_index=self.speaker_device,
-                    frames_per_buffer=1024
+                    output_device_index=device_index,
+                    frames_per_buffer=self.frames_per_buffer(rate)
                 )
-                logger.info(f"✅ Speaker stream opened at {self.speaker_device_sample_rate}Hz")
             except Exception as e:
-                logger.error(f"❌ Failed to open speaker stream: {e}")
+                logger.error(f"❌ Failed to open {label.lower()}: {e}")
+                if running:
+                    # Keep playing to the old device
+                    return
+                stream = None
             
-            return True
-        return False
+            with self.device_lock:
+                if kind == "output":
+                    self.virtual_output_stream, self.output_device_sample_rate = stream, rate
+                else:
+                    self.speaker_stream, self.speaker_device_sample_rate = stream, rate
+            if stream:
+                logger.info(f"✅ {label} opened at {rate}Hz")
+            
+            if old_stream:
+                timer = threading.Timer(self.device_switch_grace, self._close_quietly, (old_stream,))
+                timer.daemon = True
+                timer.start()
     
-    def play_audio_to_device(self, audio_bytes, device_stream, device_name, target_sample_rate):
-        """Play audio to specified device with resampling if needed"""
+    def _close_quietly(self, stream):
         try:
-            if not device_stream:
-                logger.error(f"❌ {device_name} stream not initialized!")
-                return False
-            
-            if not audio_bytes or len(audio_bytes) == 0:
-                logger.warning("⚠️ No audio data to play")
-                return False
-            
-            if self.murf_sample_rate != target_sample_rate:
-                audio_bytes = self.resample_audio(audio_bytes, self.murf_sample_rate, target_sample_rate)
-            
-            device_stream.write(audio_bytes)
-            
-            return True
-        except Exception as e:
-            logger.error(f"❌ Error playing audio to {device_name}: {e}")
+            stream.close()
+        except Exception:
+            pass
+    
+    def mixer(self, direction):
+        """The output mixer for a direction's stream, created on first use"""
+        with self.device_lock:
+            mixer = self.mixers.get(direction)
+            if mixer is None:
+                name = "Virtual Cable" if direction == "outgoing" else "Speakers"
+                mixer = self.mixers[direction] = AudioMixer(name, lambda: self.output_target(direction),
+                                                            self.frame_ms)
+            return mixer
+    
+    def play_notification(self, direction, audio_bytes, sample_rate, expires_in=2.0):
+        """Mix a short sound (test tone, alert) into a direction's output, under any speech playing.
+        
+        Audio still unplayed after expires_in seconds is stale and is cut.
+        """
+        stream, _ = self.output_target(direction)
+        if not stream:
+            logger.error(f"❌ {self.mixer(direction).name} stream not initialized!")
             return False
+        source = self.mixer(direction).add_source("notification", MIXER_PRIORITIES["notification"],
+                                                  sample_rate, expires_in=expires_in)
+        source.write(audio_bytes)
+        source.close()
+        return True
     
-    def save_audio_to_file(self, audio_data, text, language, folder):
-        """Save audio data to a WAV file"""
+    def output_target(self, direction):
+        """The (stream, sample rate) a direction plays to right now"""
+        with self.device_lock:
+            if direction == "outgoing":
+                return self.virtual_output_stream, self.output_device_sample_rate
+            return self.speaker_stream, self.speaker_device_sample_rate
+    
+    def open_recording(self, text, language, folder, sample_rate=None):
+        """Open a WAV file for streamed writes (sizes in the header are patched on close); returns (writer, path)"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
             clean_text = "".join(c for c in text if c.isalnum() or c.isspace())[:30]
@@ -473,59 +4393,64 @@ class BidirectionalVoiceTranslator:
             
             filename = f"{timestamp}_{language}_{clean_text}.wav"
             filepath = folder / filename
+            recording = wave.open(str(filepath), 'wb')
+            recording.setnchannels(1)
+            recording.setsampwidth(2)
+            recording.setframerate(sample_rate or self.murf_sample_rate)
             
-            with open(filepath, 'wb') as f:
-                f.write(audio_data)
-            
-            logger.info(f"💾 Audio saved: {filename}")
-            return filepath
+            logger.info(f"💾 Recording audio: {filename}")
+            return recording, filepath
         except Exception as e:
             logger.error(f"Failed to save audio: {e}")
-            return None
+            return None, None
+    
+    def register_backend(self, kind, backend):
+        """Add a recognition, translation or synthesis backend to its router"""
+        routers = {
+            "recognition": self.recognition_router,
+            "translation": self.translation_router,
+            "synthesis": self.synthesis_router
+        }
+        routers[kind].register(backend)
+    
+    def enable_local_recognizer(self, model_size="base", workers=1):
+        """Load the on-device Whisper recognizer and prefer it over Google STT"""
+        try:
+            self.local_recognizer_pool = LocalRecognizerPool(model_size, workers)
+        except Exception as e:
+            logger.error(f"❌ Local recognizer unavailable: {e}")
+            return False
+        
+        backend = LocalWhisperRecognitionBackend(self.local_recognizer_pool, self.voice_level_threshold)
+        # Register ahead of Google so it is chosen until measurements say otherwise
+        self.recognition_router.register(backend)
+        self.recognition_router.backends.sort(key=lambda b: b.name != backend.name)
+        return True
     
-    def translate_with_murf(self, text, source_lang_code, target_lang_code, callback):
-        """Translate text using Murf Translation API"""
+    def translate_text(self, text, source_lang_code, target_lang_code, callback):
+        """Translate text with the best available translation backend"""
         if source_lang_code == target_lang_code:
             logger.info("ℹ️ Same language, no translation needed")
             return text
         
+        cached = self.translation_memory.lookup(text, source_lang_code, target_lang_code)
+        if cached:
+            logger.info(f"⚡ Cached translation: '{text[:30]}' → '{cached[:30]}'")
+            return cached
+        
         try:
-            headers = {
-                "api-key": MURF_API_KEY,
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "target_language": target_lang_code,
-                "texts": [text]
-            }
-            
             logger.info(f"🔄 Translating: {source_lang_code} → {target_lang_code}")
-            
-            response = requests.post(
-                MURF_TRANSLATE_URL,
-                headers=headers,
-                json=payload,
-                timeout=8
+            self.last_translate_at = time.time()
+            translated_text = self.translation_router.call(
+                lambda backend: backend.translate(text, source_lang_code, target_lang_code)
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                translations = result.get("translations", [])
-                
-                if translations and len(translations) > 0:
-                    translated_text = translations[0].get("translated_text", "")
-                    if translated_text:
-                        logger.info(f"✅ Translated: '{text[:30]}' → '{translated_text[:30]}'")
-                        return translated_text
-                
-                logger.warning("⚠️ Translation response empty")
-                return text
-            else:
-                error_msg = response.text
-                logger.error(f"❌ Translation error ({response.status_code}): {error_msg}")
-                return text
-                
+            logger.info(f"✅ Translated: '{text[:30]}' → '{translated_text[:30]}'")
+            self.translation_memory.add(text, source_lang_code, target_lang_code, translated_text)
+            return translated_text
+        
+        except CircuitOpenError:
+            logger.warning("⚠️ Translation endpoint degraded, using original text")
+            return text
         except requests.Timeout:
             logger.error("❌ Translation timeout")
             return text
@@ -533,189 +4458,330 @@ class BidirectionalVoiceTranslator:
             logger.error(f"❌ Translation error: {e}")
             return text
     
-    async def synthesize_with_websocket(self, voice_id, text, language, device_stream, device_name, target_sample_rate, folder):
-        """Synthesize speech using Murf WebSocket and play to specified device"""
-        ws = None
-        complete_audio = bytearray()
+    def get_resilience_metrics(self):
+        """Hedge, retry and circuit breaker metrics for each remote endpoint"""
+        return {
+            "translate": self.translate_caller.snapshot(),
+            "tts_connect": self.tts_connect_caller.snapshot(),
+            "audio_cache": self.audio_cache.snapshot(),
+            "translation_memory": self.translation_memory.snapshot(),
+            "local_recognizer": self.local_recognizer_pool.snapshot() if self.local_recognizer_pool else None,
+            "capture": self.get_capture_stats(),
+            "stt_encoding": {
+                backend.name: backend.encoding_snapshot()
+                for backend in self.recognition_router.backends if hasattr(backend, "encoding_snapshot")
+            },
+            "session_store": self.session_store.snapshot() if self.session_store else None,
+            "quality": {name: controller.snapshot() for name, controller in self.quality.items()},
+            "catchup": {name: dict(stats, seconds_saved=round(stats["seconds_saved"], 2))
+                        for name, stats in self.catchup_stats.items()},
+            "mixer": {name: mixer.snapshot() for name, mixer in list(self.mixers.items())},
+            "supervisor": self.supervisor.snapshot(),
+            "scheduler": self.request_scheduler.snapshot(),
+            "connections": self.connection_snapshot(),
+            "routing": {
+                "recognition": self.recognition_router.snapshot(),
+                "translation": self.translation_router.snapshot(),
+                "synthesis": self.synthesis_router.snapshot()
+            }
+        }
+    
+    def quality_tier(self, direction):
+        """Current quality tier for a direction (the best tier when adaptation is off)"""
+        if not self.adaptive_quality:
+            return self.quality_tiers[0]
+        return self.quality[direction].tier
+    
+    def catchup_speed(self, direction, lag, backlog):
+        """Playback speed for a direction lag seconds behind the speech with backlog utterances waiting"""
+        if not self.catchup_enabled or self.catchup_max_speed <= 1.0:
+            return 1.0
+        behind = lag - self.quality[direction].budget
+        if backlog < self.catchup_backlog and behind <= 0:
+            return 1.0
+        # Ease in with how far behind the direction is, so a small lag is barely audible
+        pressure = max(behind / self.catchup_horizon, backlog / (2.0 * max(1, self.catchup_backlog)))
+        return 1.0 + (self.catchup_max_speed - 1.0) * min(1.0, max(0.1, pressure))
+    
+    def _stt_options(self, direction, base_options):
+        overrides = self.quality_tier(direction)["stt"]
+        return dict(base_options, **overrides) if overrides else dict(base_options)
+    
+    def frames_per_buffer(self, rate):
+        """Device buffer size in frames for the configured frame duration"""
+        return max(1, int(rate * self.frame_ms / 1000))
+    
+    def set_frame_size(self, frame_ms, stt_batch_ms=None):
+        """Set capture/playback frame duration and STT request size; applies to streams opened afterwards"""
+        if frame_ms <= 0:
+            raise ValueError("frame_ms must be positive")
+        self.frame_ms = frame_ms
+        for mixer in self.mixers.values():
+            mixer.frame_ms = frame_ms
+        # Never send less than one frame per STT request
+        self.stt_batch_ms = max(frame_ms, stt_batch_ms if stt_batch_ms is not None else self.stt_batch_ms)
+        logger.info(f"🎚️ Audio frames: {self.frame_ms:g}ms, STT requests: {self.stt_batch_ms:g}ms")
+    
+    def _batch_for_stt(self, frames, rate):
+        batch_bytes = int(rate * self.stt_batch_ms / 1000) * 2 * self.channels
+        return batch_audio_frames(frames, batch_bytes)
+    
+    def measure_audio_latency(self, frames=50):
+        """Open the configured devices with the current frame size and report their latency.
         
-        try:
-            url = f"{MURF_WS_URL}?api-key={MURF_API_KEY}&sample_rate={self.murf_sample_rate}&channel_type={self.murf_channel_type}&format={self.murf_format}"
-            
-            ws = await asyncio.wait_for(
-                websockets.connect(url, ping_interval=20, ping_timeout=10),
-                timeout=5.0
-            )
-            
-            voice_config_msg = {
-                "voice_config": {
-                    "voiceId": voice_id,
-                    "style": "Conversational",
-                    "rate": 15,
-                    "pitch": 0,
-                    "variation": 1
+        Device latency is what PortAudio reports for each stream; capture timing comes from
+        reading frames back-to-back, so its jitter reflects the real device period.
+        """
+        report = {
+            "frame_ms": self.frame_ms,
+            "stt_batch_ms": self.stt_batch_ms,
+            "capture_buffer_ms": self.capture_buffer_seconds * 1000,
+            "inputs": {},
+            "outputs": {}
+        }
+        
+        inputs = {"mic": (None, self.sample_rate)}
+        if self.input_device is not None:
+            inputs["meeting"] = (self.input_device, self.get_supported_sample_rate(self.input_device, is_input=True))
+        for name, (index, rate) in inputs.items():
+            stream = None
+            try:
+                stream = self.audio_backend.open(
+                    format=PA_INT16, channels=self.channels, rate=rate, input=True,
+                    input_device_index=index, frames_per_buffer=self.frames_per_buffer(rate)
+                )
+                intervals = []
+                last = time.perf_counter()
+                for _ in range(frames):
+                    stream.read(self.frames_per_buffer(rate), exception_on_overflow=False)
+                    now = time.perf_counter()
+                    intervals.append((now - last) * 1000)
+                    last = now
+                intervals = intervals[1:] or intervals
+                device_ms = stream.get_input_latency() * 1000
+                report["inputs"][name] = {
+                    "rate": rate,
+                    "device_latency_ms": round(device_ms, 2),
+                    "frame_interval_ms": round(float(np.mean(intervals)), 2),
+                    "frame_jitter_ms": round(float(np.std(intervals)), 2),
+                    # Worst-case audio age when a request reaches the recognizer
+                    "to_stt_ms": round(device_ms + self.frame_ms + self.stt_batch_ms, 2)
                 }
-            }
-            
-            await ws.send(json.dumps(voice_config_msg))
-            
-            text_msg = {
-                "text": text,
-                "end": True
-            }
-            
-            await ws.send(json.dumps(text_msg))
-            
-            first_chunk = True
-            chunk_count = 0
-            
-            while True:
-                try:
-                    response = await asyncio.wait_for(ws.recv(), timeout=8.0)
-                    data = json.loads(response)
-                    
-                    if "audio" in data:
-                        audio_b64 = data["audio"]
-                        if audio_b64:
-                            audio_bytes = base64.b64decode(audio_b64)
-                            
-                            if first_chunk and len(audio_bytes) > 44:
-                                audio_bytes = audio_bytes[44:]
-                                first_chunk = False
-                            
-                            if len(audio_bytes) > 0:
-                                chunk_count += 1
-                                complete_audio.extend(audio_bytes)
-                                self.play_audio_to_device(audio_bytes, device_stream, device_name, target_sample_rate)
-                    
-                    if data.get("final"):
-                        break
-                    
-                    if "error" in data:
-                        logger.error(f"❌ WebSocket error: {data['error']}")
-                        break
-                        
-                except asyncio.TimeoutError:
-                    if chunk_count > 0:
-                        break
-                    else:
-                        return None
-            
-            if len(complete_audio) > 0:
-                wav_data = self.create_wav_file(bytes(complete_audio))
-                self.save_audio_to_file(wav_data, text, language, folder)
-                return wav_data
-            
-            return None
-            
+            except Exception as e:
+                report["inputs"][name] = {"error": str(e)}
+            finally:
+                if stream:
+                    stream.close()
+        
+        outputs = {"speaker": self.speaker_device}
+        if self.output_device is not None:
+            outputs["meeting"] = self.output_device
+        for name, index in outputs.items():
+            stream = None
+            try:
+                rate = self.negotiate_output_rate(index) if index is not None else self.murf_sample_rate
+                stream = self.audio_backend.open(
+                    format=PA_INT16, channels=1, rate=rate, output=True,
+                    output_device_index=index, frames_per_buffer=self.frames_per_buffer(rate)
+                )
+                device_ms = stream.get_output_latency() * 1000
+                report["outputs"][name] = {
+                    "rate": rate,
+                    "device_latency_ms": round(device_ms, 2),
+                    "to_ear_ms": round(device_ms + self.frame_ms, 2)
+                }
+            except Exception as e:
+                report["outputs"][name] = {"error": str(e)}
+            finally:
+                if stream:
+                    stream.close()
+        
+        return report
+    
+    def get_capture_stats(self):
+        """Captured, dropped and overflowed frame counts per input stream"""
+        return {name: stats.snapshot() for name, stats in self.capture_stats.items()}
+    
+    def _open_capture(self, name, rate, frames_per_buffer, input_device_index=None):
+        """Open an input stream in the configured capture mode"""
+        if self.capture_mode == "callback":
+            return CallbackCapture(
+                self.audio_backend, self.capture_stats[name], rate, self.channels,
+                frames_per_buffer, input_device_index, self.capture_buffer_seconds
+            )
+        return self.audio_backend.open(
+            format=PA_INT16,
+            channels=self.channels,
+            rate=rate,
+            input=True,
+            input_device_index=input_device_index,
+            frames_per_buffer=frames_per_buffer
+        )
+    
+    def split_into_segments(self, text):
+        """Split text into sentences, and long sentences into clauses, for incremental synthesis"""
+        sentences = [s.strip() for s in re.split(r'(?<=[.!?।॥。？！])\s+', text) if s.strip()]
+        segments = []
+
+        for sentence in sentences:
+            if len(sentence) <= self.stream_max_segment_chars:
+                segments.append(sentence)
+                continue
+
+            # Long sentence: break at clause boundaries, merging clauses that are too short to speak well
+            current = ""
+            for clause in re.split(r'(?<=[,;:،、，])\s+', sentence):
+                current = f"{current} {clause}".strip()
+                if len(current) >= self.stream_min_segment_chars:
+                    segments.append(current)
+                    current = ""
+            if current:
+                if segments and len(current) < self.stream_min_segment_chars:
+                    segments[-1] = f"{segments[-1]} {current}"
+                else:
+                    segments.append(current)
+
+        return segments or [text]
+
+    async def synthesize_streaming(self, sessions, direction, voice_id, text_segments, language, folder, on_audio,
+                                   sample_rate=None, voice_config=None):
+        """Speak text segments with the best synthesis backend, streaming audio to on_audio and disk.
+        
+        Returns a Synthesis with the number of PCM bytes produced (0 on failure) and the recording path.
+        """
+        sample_rate = sample_rate or self.murf_sample_rate
+        backend = self.synthesis_router.choose()
+        if backend.name in sessions and sessions[backend.name][2] != sample_rate:
+            # Output rate changed with the quality tier: reconnect at the new rate
+            await backend.close_session(sessions.pop(backend.name)[1])
+        if backend.name not in sessions:
+            sessions[backend.name] = (backend, backend.create_session(direction, sample_rate), sample_rate)
+        session = sessions[backend.name][1]
+        
+        spoken_text = []
+        timing = {"first_segment": None, "first_audio": None}
+        recording = {"file": None, "path": None, "bytes": 0}
+        
+        async def tracked_segments():
+            async for segment in text_segments:
+                spoken_text.append(segment)
+                if timing["first_segment"] is None:
+                    timing["first_segment"] = time.time()
+                yield segment
+        
+        def collect(audio_bytes):
+            if timing["first_audio"] is None:
+                timing["first_audio"] = time.time()
+                # Named after the text handed over so far; audio is streamed in, never buffered
+                recording["file"], recording["path"] = self.open_recording(
+                    " ".join(spoken_text), language, folder, sample_rate
+                )
+            audio_bytes = memoryview(audio_bytes)
+            if recording["file"]:
+                recording["file"].writeframesraw(audio_bytes)
+            recording["bytes"] += len(audio_bytes)
+            on_audio(audio_bytes)
+        
+        try:
+            produced = await backend.synthesize(session, voice_id, tracked_segments(), collect, voice_config)
         except asyncio.TimeoutError:
             logger.error("❌ WebSocket connection timeout")
-            return None
+            self.synthesis_router.record(backend, None, False)
+            return Synthesis(0, recording["path"])
         except Exception as e:
-            logger.error(f"❌ WebSocket synthesis error: {e}")
-            return None
+            logger.error(f"❌ Synthesis error ({backend.name}): {e}")
+            self.synthesis_router.record(backend, None, False)
+            return Synthesis(0, recording["path"])
         finally:
-            if ws:
-                try:
-                    await ws.close()
-                except:
-                    pass
-    
-    def create_wav_file(self, audio_data):
-        """Create a proper WAV file with header"""
-        num_channels = 1
-        sample_width = 2
-        sample_rate = self.murf_sample_rate
-        
-        wav_header = struct.pack(
-            '<4sI4s4sIHHIIHH4sI',
-            b'RIFF',
-            36 + len(audio_data),
-            b'WAVE',
-            b'fmt ',
-            16, 1, num_channels, sample_rate,
-            sample_rate * num_channels * sample_width,
-            num_channels * sample_width,
-            sample_width * 8,
-            b'data',
-            len(audio_data)
-        )
+            if recording["file"]:
+                recording["file"].close()
         
-        return wav_header + audio_data
+        if produced and timing["first_segment"] and timing["first_audio"]:
+            # Time to first audio after the first segment was handed over
+            self.synthesis_router.record(backend, max(0.0, timing["first_audio"] - timing["first_segment"]), True)
+        else:
+            self.synthesis_router.record(backend, None, produced)
+        
+        return Synthesis(recording["bytes"], recording["path"])
     
-    def _outgoing_stt_thread(self, source_lang_code, callback):
+    def _outgoing_stt_thread(self, source_lang_code, callback, heartbeat):
         """Listen to YOUR microphone with auto-restart"""
-        while self.is_running:
+        self._set_request_context("outgoing", heartbeat)
+        while self.is_running and heartbeat.current:
+            last_voice_time = [time.time()]
+            chunk_size = self.frames_per_buffer(self.sample_rate)
+            stt_options = self._stt_options("outgoing", {"model": "default"})
+            language_code = self.stt_languages.get("outgoing", source_lang_code)
+            rotating = [False]
+            
             def audio_generator():
-                while self.is_running:
+                while self.is_running and heartbeat.current:
+                    if (self._stt_options("outgoing", {"model": "default"}) != stt_options
+                            or self.stt_languages.get("outgoing", source_lang_code) != language_code) \
+                            and time.time() - last_voice_time[0] > 0.5:
+                        # Quality tier or language changed: end the stream in a pause and reopen
+                        # it with the new settings, keeping the microphone open
+                        rotating[0] = True
+                        return
                     try:
-                        chunk = self.mic_stream.read(self.chunk_size, exception_on_overflow=False)
+                        with TRACER.span("capture.read", "audio", stream="mic"):
+                            chunk = self.mic_stream.read(chunk_size, exception_on_overflow=False)
+                        heartbeat.beat()
                         
                         # Calculate audio level
                         audio_array = np.frombuffer(chunk, dtype=np.int16)
                         audio_level = np.abs(audio_array).mean()
                         if self.audio_level_callback:
                             self.audio_level_callback("mic", audio_level)
+                        if audio_level >= self.voice_level_threshold:
+                            last_voice_time[0] = time.time()
                         
                         yield chunk
                     except Exception as e:
-                        logger.error(f"Error in mic audio generator: {e}")
+                        if self.is_running:
+                            logger.error(f"Error in mic audio generator: {e}")
                         break
             
+            recognizer = self.recognition_router.choose()
+            
             try:
                 if not self.mic_stream or not self.mic_stream.is_active():
-                    self.mic_stream = self.pyaudio_instance.open(
-                        format=pyaudio.paInt16,
-                        channels=self.channels,
-                        rate=self.sample_rate,
-                        input=True,
-                        frames_per_buffer=self.chunk_size
-                    )
+                    self.mic_stream = self._open_capture("mic", self.sample_rate, chunk_size)
                 
-                logger.info(f"✅ Listening to YOUR microphone in {source_lang_code}")
+                logger.info(f"✅ Listening to YOUR microphone in {language_code} ({recognizer.name})")
                 callback("🎤 Listening to YOUR voice...")
                 
-                config = speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                    sample_rate_hertz=self.sample_rate,
-                    language_code=source_lang_code,
-                    enable_automatic_punctuation=True,
-                    model="default"
-                )
-                
-                streaming_config = speech.StreamingRecognitionConfig(
-                    config=config,
-                    interim_results=False,
-                    single_utterance=False
+                transcripts = TRACER.trace_iter(
+                    recognizer.transcribe_stream(
+                        self._batch_for_stt(audio_generator(), self.sample_rate),
+                        language_code, self.sample_rate, stt_options
+                    ),
+                    "stt.wait", "network", direction="outgoing", backend=recognizer.name
                 )
                 
-                audio_generator_iter = audio_generator()
-                requests_iter = (speech.StreamingRecognizeRequest(audio_content=content)
-                               for content in audio_generator_iter)
-                
-                responses = self.speech_client.streaming_recognize(streaming_config, requests_iter)
-                
-                for response in responses:
+                for transcript in transcripts:
                     if not self.is_running:
                         break
                     
-                    for result in response.results:
-                        if result.is_final:
-                            transcript = result.alternatives[0].transcript
-                            if transcript.strip():
-                                if not self.is_duplicate_text(
-                                    transcript, 
-                                    self.last_outgoing_text, 
-                                    self.last_outgoing_time,
-                                    "YOUR MIC"
-                                ):
-                                    logger.info(f"🎙️ YOU said: {transcript}")
-                                    self.last_outgoing_text = transcript
-                                    self.last_outgoing_time = time.time()
-                                    self.outgoing_text_queue.put(transcript)
-                                    callback(f"📢 You: {transcript[:50]}...")
+                    # Endpointing lag: how long after the last voiced chunk the transcript arrived
+                    self.recognition_router.record(recognizer, time.time() - last_voice_time[0], True)
+                    
+                    if transcript.strip():
+                        if not self.is_duplicate_text(
+                            transcript, 
+                            self.last_outgoing_text, 
+                            self.last_outgoing_time,
+                            "YOUR MIC"
+                        ):
+                            logger.info(f"🎙️ YOU said: {transcript}")
+                            self.last_outgoing_text = transcript
+                            self.last_outgoing_time = time.time()
+                            self.outgoing_text_queue.put(Transcript(transcript, last_voice_time[0], time.time()))
+                            callback(f"📢 You: {transcript[:50]}...")
                 
             except Exception as e:
                 if self.is_running:
+                    self.recognition_router.record(recognizer, None, False)
                     logger.error(f"Outgoing STT error: {e}")
                     logger.info("🔄 Restarting outgoing STT in 2 seconds...")
                     time.sleep(2)
@@ -723,7 +4789,8 @@ class BidirectionalVoiceTranslator:
                 else:
                     break
             finally:
-                if self.mic_stream:
+                # A retired thread leaves the stream to its replacement
+                if self.mic_stream and heartbeat.current and not rotating[0]:
                     try:
                         self.mic_stream.stop_stream()
                         self.mic_stream.close()
@@ -731,144 +4798,152 @@ class BidirectionalVoiceTranslator:
                     except:
                         pass
     
-    def _incoming_stt_thread(self, target_lang_code, callback):
+    def _incoming_stt_thread(self, target_lang_code, callback, heartbeat):
         """Listen to meeting audio with auto-restart"""
-        while self.is_running:
-            # Detect device sample rate
-            try:
-                device_info = self.pyaudio_instance.get_device_info_by_index(self.input_device)
-                native_rate = int(device_info['defaultSampleRate'])
-                logger.info(f"📊 Virtual Cable native rate: {native_rate}Hz")
-                
-                test_rates = [native_rate, 48000, 44100, 16000]
-                device_sample_rate = None
-                
-                for rate in test_rates:
-                    try:
-                        test_stream = self.pyaudio_instance.open(
-                            format=pyaudio.paInt16,
-                            channels=1,
-                            rate=rate,
-                            input=True,
-                            input_device_index=self.input_device,
-                            frames_per_buffer=int(rate / 10)
-                        )
-                        test_stream.close()
-                        device_sample_rate = rate
-                        logger.info(f"✅ Virtual Cable supports {rate}Hz")
+        self._set_request_context("incoming", heartbeat)
+        device_sample_rate = None
+        while self.is_running and heartbeat.current:
+            input_device = self.input_device
+            # Detect device sample rate, unless capture stayed open across a stream rotation
+            if not (self.virtual_input_stream and self.virtual_input_stream.is_active() and device_sample_rate):
+                try:
+                    device_info = self.audio_backend.get_device_info_by_index(input_device)
+                    native_rate = int(device_info['defaultSampleRate'])
+                    logger.info(f"📊 Virtual Cable native rate: {native_rate}Hz")
+                    
+                    test_rates = [native_rate, 48000, 44100, 16000]
+                    device_sample_rate = None
+                    
+                    for rate in test_rates:
+                        try:
+                            test_stream = self.audio_backend.open(
+                                format=PA_INT16,
+                                channels=1,
+                                rate=rate,
+                                input=True,
+                                input_device_index=input_device,
+                                frames_per_buffer=self.frames_per_buffer(rate)
+                            )
+                            test_stream.close()
+                            device_sample_rate = rate
+                            logger.info(f"✅ Virtual Cable supports {rate}Hz")
+                            break
+                        except:
+                            continue
+                    
+                    if not device_sample_rate:
+                        logger.error("❌ Could not find compatible sample rate!")
+                        callback("❌ Virtual Cable error!", error=True)
                         break
-                    except:
+                    
+                except Exception as e:
+                    logger.error(f"❌ Error detecting device sample rate: {e}")
+                    if self.is_running:
+                        time.sleep(2)
                         continue
-                
-                if not device_sample_rate:
-                    logger.error("❌ Could not find compatible sample rate!")
-                    callback("❌ Virtual Cable error!", error=True)
-                    break
-                
-            except Exception as e:
-                logger.error(f"❌ Error detecting device sample rate: {e}")
-                if self.is_running:
-                    time.sleep(2)
-                    continue
-                else:
-                    break
+                    else:
+                        break
             
-            device_chunk_size = int(device_sample_rate / 10)
+            device_chunk_size = self.frames_per_buffer(device_sample_rate)
+            last_voice_time = [time.time()]
+            base_options = {"model": "latest_long", "use_enhanced": True}
+            stt_options = self._stt_options("incoming", base_options)
+            language_code = self.stt_languages.get("incoming", target_lang_code)
+            rotating = [False]
             
             def audio_generator():
-                while self.is_running:
+                while self.is_running and heartbeat.current:
+                    if self.input_device != input_device:
+                        # Input device changed: reopen capture on it
+                        logger.info(f"🔌 Meeting input moved to device {self.input_device}")
+                        return
+                    if (self._stt_options("incoming", base_options) != stt_options
+                            or self.stt_languages.get("incoming", target_lang_code) != language_code) \
+                            and time.time() - last_voice_time[0] > 0.5:
+                        rotating[0] = True
+                        return
                     try:
-                        chunk = self.virtual_input_stream.read(
-                            device_chunk_size, 
-                            exception_on_overflow=False
-                        )
+                        with TRACER.span("capture.read", "audio", stream="meeting"):
+                            chunk = self.virtual_input_stream.read(
+                                device_chunk_size, 
+                                exception_on_overflow=False
+                            )
+                        heartbeat.beat()
                         
                         audio_array = np.frombuffer(chunk, dtype=np.int16)
                         audio_level = np.abs(audio_array).mean()
                         if self.audio_level_callback:
                             self.audio_level_callback("meeting", audio_level)
+                        if audio_level >= self.voice_level_threshold:
+                            last_voice_time[0] = time.time()
                         
                         if device_sample_rate != 16000:
-                            ratio = 16000 / device_sample_rate
-                            new_length = int(len(audio_array) * ratio)
-                            resampled = np.interp(
-                                np.linspace(0, len(audio_array) - 1, new_length),
-                                np.arange(len(audio_array)),
-                                audio_array
-                            ).astype(np.int16)
+                            with TRACER.span("resample", "cpu", src=device_sample_rate, dst=16000):
+                                ratio = 16000 / device_sample_rate
+                                new_length = int(len(audio_array) * ratio)
+                                resampled = np.interp(
+                                    np.linspace(0, len(audio_array) - 1, new_length),
+                                    np.arange(len(audio_array)),
+                                    audio_array
+                                ).astype(np.int16)
                             yield resampled.tobytes()
                         else:
                             yield chunk
                             
                     except Exception as e:
-                        logger.error(f"Error reading virtual input: {e}")
+                        if self.is_running:
+                            logger.error(f"Error reading virtual input: {e}")
                         break
             
+            recognizer = self.recognition_router.choose()
+            
             try:
                 logger.info(f"🔌 Opening virtual input stream at {device_sample_rate}Hz...")
                 
                 if not self.virtual_input_stream or not self.virtual_input_stream.is_active():
-                    self.virtual_input_stream = self.pyaudio_instance.open(
-                        format=pyaudio.paInt16,
-                        channels=1,
-                        rate=device_sample_rate,
-                        input=True,
-                        input_device_index=self.input_device,
-                        frames_per_buffer=device_chunk_size
+                    self.virtual_input_stream = self._open_capture(
+                        "meeting", device_sample_rate, device_chunk_size, input_device
                     )
                 
-                logger.info(f"✅ Listening to MEETING AUDIO in {target_lang_code}")
+                logger.info(f"✅ Listening to MEETING AUDIO in {language_code}")
                 logger.info(f"📊 Capturing at {device_sample_rate}Hz, resampling to 16000Hz")
-                callback(f"🎧 Listening to meeting ({target_lang_code})...")
-                
-                config = speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                    sample_rate_hertz=16000,
-                    language_code=target_lang_code,
-                    enable_automatic_punctuation=True,
-                    model="latest_long",
-                    use_enhanced=True
-                )
+                callback(f"🎧 Listening to meeting ({language_code})...")
                 
-                streaming_config = speech.StreamingRecognitionConfig(
-                    config=config,
-                    interim_results=False,
-                    single_utterance=False
+                logger.info(f"🎧 Starting {recognizer.name} STT streaming for meeting audio...")
+                transcripts = TRACER.trace_iter(
+                    recognizer.transcribe_stream(
+                        self._batch_for_stt(audio_generator(), 16000), language_code, 16000,
+                        stt_options
+                    ),
+                    "stt.wait", "network", direction="incoming", backend=recognizer.name
                 )
                 
-                audio_generator_iter = audio_generator()
-                requests_iter = (speech.StreamingRecognizeRequest(audio_content=content)
-                               for content in audio_generator_iter)
-                
-                logger.info("🎧 Starting Google STT streaming for meeting audio...")
-                responses = self.speech_client.streaming_recognize(streaming_config, requests_iter)
-                
-                for response in responses:
+                for transcript in transcripts:
                     if not self.is_running:
                         break
                     
-                    for result in response.results:
-                        if result.is_final:
-                            transcript = result.alternatives[0].transcript
-                            if transcript.strip():
-                                if self.is_echo(transcript):
-                                    logger.info(f"🔇 ECHO blocked: '{transcript[:40]}'")
-                                    continue
-                                
-                                if not self.is_duplicate_text(
-                                    transcript, 
-                                    self.last_incoming_text, 
-                                    self.last_incoming_time,
-                                    "MEETING"
-                                ):
-                                    logger.info(f"🎧 THEY said: {transcript}")
-                                    self.last_incoming_text = transcript
-                                    self.last_incoming_time = time.time()
-                                    self.incoming_text_queue.put(transcript)
-                                    callback(f"👥 Them: {transcript[:50]}...")
+                    self.recognition_router.record(recognizer, time.time() - last_voice_time[0], True)
+                    
+                    if transcript.strip():
+                        if self.is_echo(transcript):
+                            logger.info(f"🔇 ECHO blocked: '{transcript[:40]}'")
+                            continue
+                        
+                        if not self.is_duplicate_text(
+                            transcript, 
+                            self.last_incoming_text, 
+                            self.last_incoming_time,
+                            "MEETING"
+                        ):
+                            logger.info(f"🎧 THEY said: {transcript}")
+                            self.last_incoming_text = transcript
+                            self.last_incoming_time = time.time()
+                            self.incoming_text_queue.put(Transcript(transcript, last_voice_time[0], time.time()))
+                            callback(f"👥 Them: {transcript[:50]}...")
                 
             except Exception as e:
                 if self.is_running:
+                    self.recognition_router.record(recognizer, None, False)
                     logger.error(f"Incoming STT error: {e}")
                     logger.info("🔄 Restarting incoming STT in 2 seconds...")
                     time.sleep(2)
@@ -876,7 +4951,7 @@ class BidirectionalVoiceTranslator:
                 else:
                     break
             finally:
-                if self.virtual_input_stream:
+                if self.virtual_input_stream and heartbeat.current and not rotating[0]:
                     try:
                         self.virtual_input_stream.stop_stream()
                         self.virtual_input_stream.close()
@@ -884,118 +4959,607 @@ class BidirectionalVoiceTranslator:
                     except:
                         pass
     
-    def _outgoing_translation_thread(self, source_lang, target_lang, voice_id, 
-                                    source_lang_code, target_lang_code, callback):
-        """OUTGOING: YOUR language → THEIR language → Meeting"""
+    def _put_while_running(self, q, item, heartbeat=None):
+        """Put into a bounded hand-off queue, giving up if the service stops (or the stage is retired)"""
+        while self.is_running and (heartbeat is None or heartbeat.current):
+            if heartbeat:
+                heartbeat.beat()
+            try:
+                q.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _set_request_context(self, direction, heartbeat=None):
+        """Tag this thread's API requests with the direction's scheduler priority.
+        
+        With a heartbeat, requests stop queueing once the service stops or the stage is retired.
+        """
+        active = None
+        if heartbeat:
+            active = lambda: self.is_running and heartbeat.current
+        self.request_scheduler.set_context(self.request_priority.get(direction, self.request_priority["background"]),
+                                           self.request_session, active)
+    
+    def _get_while_running(self, q, heartbeat=None):
+        """Get from a hand-off queue, returning None if the service stops (or the stage is retired)"""
+        while self.is_running and (heartbeat is None or heartbeat.current):
+            if heartbeat:
+                heartbeat.beat()
+            try:
+                return q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+        return None
+    
+    def _track_active_job(self, delta):
+        with self.active_jobs_lock:
+            self.active_jobs = max(0, self.active_jobs + delta)
+    
+    def _pipeline_busy(self):
+        """True while live utterances are queued or in flight in either direction"""
+        return (self.active_jobs > 0 or not self.outgoing_text_queue.empty()
+                or not self.incoming_text_queue.empty())
+    
+    def _wait_until_idle(self):
+        while self.is_running and self._pipeline_busy():
+            time.sleep(0.1)
+        return self.is_running
+    
+    def _record_connection(self, label, state, started, error=None):
+        with self.connection_status_lock:
+            self.connection_status[label] = {
+                "state": state,
+                "seconds": round(time.time() - started, 3),
+                "error": str(error) if error else None
+            }
+        if error:
+            logger.warning(f"⚠️ {label} connection warmup failed: {error}")
+    
+    def connection_snapshot(self):
+        """Per-connection warmup state and time taken"""
+        with self.connection_status_lock:
+            return {label: dict(status) for label, status in self.connection_status.items()}
+    
+    def _warm_connections(self, directions, callback):
+        """Open the STT and translation connections in parallel, wait for the TTS ones, then go live"""
+        start_time = time.time()
+        targets = [(f"stt-{backend.name}", backend.warm) for backend in self.recognition_router.backends]
+        targets += [(f"translate-{backend.name}", backend.warm) for backend in self.translation_router.backends]
+        
+        def warm(label, connect):
+            started = time.time()
+            self._record_connection(label, "connecting", started)
+            try:
+                connect()
+                self._record_connection(label, "ready", started)
+            except Exception as e:
+                self._record_connection(label, "failed", started, e)
+        
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(targets)),
+                                                       thread_name_prefix="connect") as pool:
+                concurrent.futures.wait([pool.submit(warm, label, connect) for label, connect in targets],
+                                        timeout=self.connection_warmup_timeout)
+            
+            # The synthesis stages open their own WebSockets, on the event loops that will use them
+            tts_labels = [f"tts-{direction}" for direction in directions]
+            deadline = start_time + self.connection_warmup_timeout
+            while self.is_running and time.time() < deadline:
+                status = self.connection_snapshot()
+                if all(status.get(label, {}).get("state") in ("ready", "failed") for label in tts_labels):
+                    break
+                time.sleep(0.05)
+            
+            status = self.connection_snapshot()
+            summary = ", ".join(
+                f"{label} {'✓' if info['state'] == 'ready' else '✗'} {info['seconds']:.2f}s"
+                for label, info in status.items()
+            )
+            failed = [label for label, info in status.items() if info["state"] != "ready"]
+            logger.info(f"🔌 Connections warm in {time.time() - start_time:.2f}s: {summary}")
+            if failed:
+                callback(f"⚠️ Live with cold connections: {', '.join(failed)}", error=True)
+            elif self.is_running:
+                callback(f"🟢 Connections warm ({time.time() - start_time:.2f}s)")
+        except Exception as e:
+            logger.error(f"Connection warmup error: {e}")
+        finally:
+            # Never hold translation back beyond the warmup phase, warm or not
+            self.connections_ready.set()
+    
+    def _keepalive_stage(self, heartbeat):
+        """Touch the translation endpoints when idle so their pooled HTTPS connections stay open"""
+        while self.is_running and heartbeat.current:
+            heartbeat.beat()
+            time.sleep(0.5)
+            if time.time() - self.last_translate_at < self.keepalive_interval:
+                continue
+            self.last_translate_at = time.time()
+            for backend in self.translation_router.backends:
+                try:
+                    backend.warm()
+                except Exception as e:
+                    logger.debug(f"Keepalive to {backend.name} failed: {e}")
+    
+    def _warmup_thread(self, directions, callback):
+        """Low-priority pre-translation and pre-synthesis of stock phrases into the audio cache"""
+        self._set_request_context("background")
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        sessions = {}
+        warmed = 0
+        start_time = time.time()
+        
+        async def one_segment(text):
+            yield text
+        
+        try:
+            for direction, source_code, target_code, voice_id in directions:
+                sample_rate = self.synthesis_sample_rate(direction)
+                for phrase in self.warmup_phrases:
+                    if not self._wait_until_idle():
+                        return
+                    
+                    # The phrase list is English; work out how the speaker would say it
+                    original = phrase
+                    if not source_code.lower().startswith("en"):
+                        original = self.translate_text(phrase, "en-US", source_code, None)
+                    
+                    key = AudioCache.key(voice_id, source_code, target_code, sample_rate, original)
+                    if self.audio_cache.get(key, count=False):
+                        continue
+                    
+                    if not self._wait_until_idle():
+                        return
+                    translated = self.translate_text(original, source_code, target_code, None)
+                    
+                    if not self._wait_until_idle():
+                        return
+                    backend = self.synthesis_router.choose()
+                    session_key = (backend.name, sample_rate)
+                    if session_key not in sessions:
+                        sessions[session_key] = (backend, backend.create_session("warmup", sample_rate))
+                    
+                    pcm = bytearray()
+                    try:
+                        loop.run_until_complete(
+                            backend.synthesize(sessions[session_key][1], voice_id,
+                                               one_segment(translated), pcm.extend)
+                        )
+                    except Exception as e:
+                        logger.warning(f"⚠️ Warmup synthesis failed for '{phrase}': {e}")
+                        continue
+                    
+                    self.audio_cache.put(key, translated, bytes(pcm))
+                    warmed += 1
+                    
+                    # Leave gaps so warmup never holds the network when live speech arrives
+                    time.sleep(0.1)
+            
+            logger.info(f"🔥 Warmup complete: {warmed} phrases cached in {time.time() - start_time:.1f}s")
+            callback(f"🔥 Warmup ready ({warmed} phrases)")
+        
+        except Exception as e:
+            logger.error(f"Warmup thread error: {e}")
+        finally:
+            for backend, session in sessions.values():
+                try:
+                    loop.run_until_complete(backend.close_session(session))
+                except Exception:
+                    pass
+            loop.close()
+    
+    def _run_translation_pipeline(self, spec, callback):
+        """Run one direction as overlapping translate → synthesize → playback stages, each supervised"""
+        name = spec["name"]
+        synth_queue = queue.Queue(maxsize=self.pipeline_depth)
+        playback_queue = queue.Queue(maxsize=self.pipeline_depth)
+        
+        self.supervisor.watch_queue(f"{name}-text", spec["text_queue"], lambda transcript: transcript.recognized_at)
+        self.supervisor.watch_queue(f"{name}-synthesize", synth_queue, lambda job: job.created_at)
+        self.supervisor.watch_queue(f"{name}-playback", playback_queue, lambda job: job.created_at)
+        self.supervisor.add(f"{name}-translate", self._translation_stage, (spec, synth_queue, callback))
+        self.supervisor.add(f"{name}-synthesize", self._synthesis_stage, (spec, synth_queue, playback_queue, callback))
+        self.supervisor.add(f"{name}-playback", self._playback_stage, (spec, playback_queue, callback))
+    
+    def _release_abandoned_work(self, stage_name, job):
+        """Unblock the stages downstream of a job whose stage thread was retired as stalled"""
+        direction, stage = stage_name.rsplit("-", 1)
+        if stage == "translate":
+            job.segments.put(None)
+        elif stage == "synthesize":
+            job.audio.put(None)
+        elif stage == "playback":
+            job.completed_at = time.time()
+            self._track_active_job(-1)
+            if self.utterance_callback:
+                self.utterance_callback(direction, job, False)
+    
+    def _translation_stage(self, spec, synth_queue, callback, heartbeat):
+        """Stage 1: dequeue transcripts and translate them segment by segment"""
+        try:
+            self._translate_transcripts(spec, synth_queue, callback, heartbeat)
+        except Exception as e:
+            logger.error(f"{spec['name'].capitalize()} translation stage error: {e}")
+    
+    def _translate_transcripts(self, spec, synth_queue, callback, heartbeat):
+        # A restarted stage carries on numbering where its predecessor stopped
+        seq = spec.get("last_seq", 0)
+        controller = self.quality[spec["name"]]
+        self._set_request_context(spec["name"], heartbeat)
+        tier_name = None
+        
+        # Speech recognized meanwhile stays queued and is translated once the connections are warm
+        while self.wait_for_connections and self.is_running and heartbeat.current:
+            heartbeat.beat()
+            if self.connections_ready.wait(0.2):
+                break
+        
+        while self.is_running and heartbeat.current:
+            heartbeat.beat()
+            try:
+                transcript = spec["text_queue"].get(timeout=0.2)
+            except queue.Empty:
+                controller.observe_queue(0)
+                continue
+            
+            backlog = spec["text_queue"].qsize()
+            controller.observe_queue(backlog)
+            tier = self.quality_tier(spec["name"])
+            if tier["name"] != tier_name:
+                if tier_name is not None:
+                    callback(f"⚙️ {spec['name'].capitalize()} quality: {tier['name']}")
+                tier_name = tier["name"]
+            
+            # Under load, skip speech that has been overtaken by newer speech waiting behind it
+            if backlog and tier["max_backlog_age"] and time.time() - transcript.recognized_at > tier["max_backlog_age"]:
+                logger.warning(f"⏭️ Skipping stale {spec['name']} utterance: '{transcript.text[:30]}'")
+                controller.record_drop()
+                continue
+            
+            seq += 1
+            spec["last_seq"] = seq
+            original_text = transcript.text
+            job = TranslationJob(seq, original_text, transcript.speech_end, transcript.recognized_at)
+            job.settings = {key: spec[key] for key in ("source_code", "target_code", "voice_id", "language")}
+            job.sample_rate = tier["tts_sample_rate"] or self.synthesis_sample_rate(spec["name"])
+            job.voice_config = {"rate": tier["speech_rate"]}
+            if self.catchup_enabled and self.catchup_rate_boost and backlog >= self.catchup_backlog:
+                # Behind real time: Murf speaks faster too (its rate tops out at 50)
+                job.voice_config["rate"] = min(50, tier["speech_rate"] + self.catchup_rate_boost)
+            TRACER.set_utterance(f"{spec['name']}-{seq}")
+            callback(spec["original_msg"].format(text=original_text))
+            self._track_active_job(1)
+            
+            job.cache_key = AudioCache.key(job.settings["voice_id"], job.settings["source_code"],
+                                           job.settings["target_code"], job.sample_rate, original_text)
+            cached = self.audio_cache.get(job.cache_key)
+            if cached:
+                logger.info(f"⚡ Cached audio: '{original_text[:30]}'")
+                job.translated_parts.append(cached[0])
+                job.cached_audio = cached[1]
+                job.segments.put(None)
+                job.translated_at = time.time()
+                if not self._put_while_running(synth_queue, job, heartbeat):
+                    break
+                callback(spec["translated_msg"].format(text=job.translated_text))
+                continue
+            
+            # Hand the job on before translating so synthesis can start on the first segment
+            if not self._put_while_running(synth_queue, job, heartbeat):
+                break
+            
+            heartbeat.work = job
+            segments = self.split_into_segments(original_text) if self.streaming_synthesis else [original_text]
+            try:
+                for segment in segments:
+                    with TRACER.span("translate", chars=len(segment)):
+                        translated = self.translate_text(
+                            segment, job.settings["source_code"], job.settings["target_code"], callback
+                        )
+                    if translated is None:
+                        translated = segment
+                    job.translated_parts.append(translated)
+                    job.segments.put(translated)
+            finally:
+                job.segments.put(None)
+                job.translated_at = time.time()
+                heartbeat.work = None
+            
+            if job.translated_text != original_text:
+                callback(spec["translated_msg"].format(text=job.translated_text))
+    
+    def _synthesis_stage(self, spec, synth_queue, playback_queue, callback, heartbeat):
+        """Stage 2: synthesize translated segments over the direction's Murf stream context"""
+        self._set_request_context(spec["name"], heartbeat)
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        sessions = {}
+        
+        async def job_segments(job):
+            while True:
+                segment = await loop.run_in_executor(None, self._get_while_running, job.segments, heartbeat)
+                if segment is None:
+                    return
+                yield segment
         
         try:
-            while self.is_running:
-                try:
-                    original_text = self.outgoing_text_queue.get(timeout=0.2)
-                except queue.Empty:
-                    continue
-                
-                callback(f"📢 You ({source_lang}): {original_text}")
-                start_time = time.time()
-                
-                translated_text = self.translate_with_murf(
-                    original_text, source_lang_code, target_lang_code, callback
-                )
-                
-                if translated_text is None:
-                    translated_text = original_text
-                
-                if translated_text != original_text:
-                    callback(f"💬 To meeting ({target_lang}): {translated_text}")
-                
-                callback("🎤 Generating speech...")
-                
-                self.last_outgoing_translated_text = translated_text
-                self.last_outgoing_translated_time = time.time()
-                
-                audio_data = loop.run_until_complete(
-                    self.synthesize_with_websocket(
-                        voice_id, translated_text, target_lang, 
-                        self.virtual_output_stream, "Virtual Cable",
-                        self.output_device_sample_rate,
-                        self.outgoing_folder
-                    )
+            if self.connection_warmup:
+                self._warm_synthesis_session(loop, sessions, spec["name"])
+            
+            while self.is_running and heartbeat.current:
+                # Wait inside the event loop so the idle WebSocket keeps answering pings
+                job = loop.run_until_complete(
+                    loop.run_in_executor(None, self._get_while_running, synth_queue, heartbeat)
                 )
+                if job is None:
+                    break
                 
-                total_latency = time.time() - start_time
+                callback(spec["synth_msg"])
+                TRACER.set_utterance(f"{spec['name']}-{job.seq}")
+                if not self._put_while_running(playback_queue, job, heartbeat):
+                    break
+                heartbeat.work = job
                 
-                if audio_data:
-                    callback(f"📡 Sent! (⚡ {total_latency:.2f}s)")
+                try:
+                    if job.cached_audio is not None:
+                        cached = memoryview(job.cached_audio)
+                        for offset in range(0, len(cached), 8192):
+                            job.audio.put(cached[offset:offset + 8192])
+                        continue
                     
-                    if audio_data and len(audio_data) > 44:
-                        audio_duration = (len(audio_data) - 44) / (self.murf_sample_rate * 2 * 1)
-                        time.sleep(min(audio_duration + 0.3, 3.0))
-                else:
-                    callback("⚠️ Failed!", error=True)
+                    # Short phrases keep their chunks for the audio cache; the chunks are shared, not copied
+                    cache_chunks = [] if len(job.original_text) <= self.audio_cache_max_chars else None
+                    
+                    def on_audio(chunk, job=job, cache_chunks=cache_chunks):
+                        heartbeat.beat()
+                        if cache_chunks is not None:
+                            cache_chunks.append(chunk)
+                        job.audio.put(chunk)
+                    
+                    with TRACER.span("synthesize"):
+                        job.audio_bytes, job.audio_path = loop.run_until_complete(
+                            self.synthesize_streaming(
+                                sessions, spec["name"], job.settings["voice_id"], job_segments(job),
+                                job.settings["language"], spec["folder"], on_audio,
+                                job.sample_rate, job.voice_config
+                            )
+                        )
+                    
+                    if job.audio_bytes and cache_chunks:
+                        self.audio_cache.put(job.cache_key, job.translated_text, b"".join(cache_chunks))
+                finally:
+                    job.audio.put(None)
+                    heartbeat.work = None
         
         except Exception as e:
-            logger.error(f"Outgoing translation thread error: {e}")
+            logger.error(f"{spec['name'].capitalize()} synthesis stage error: {e}")
         finally:
+            for backend, session, _ in sessions.values():
+                try:
+                    loop.run_until_complete(backend.close_session(session))
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to close {backend.name} synthesis session: {e}")
             loop.close()
     
-    def _incoming_translation_thread(self, source_lang, target_lang, voice_id_to_you,
-                                    source_lang_code, target_lang_code, callback):
-        """INCOMING: THEIR language → YOUR language → Speakers"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    def _warm_synthesis_session(self, loop, sessions, direction):
+        """Open a direction's TTS connection now rather than on its first utterance"""
+        label = f"tts-{direction}"
+        started = time.time()
+        self._record_connection(label, "connecting", started)
+        try:
+            backend = self.synthesis_router.choose()
+            sample_rate = self.synthesis_sample_rate(direction)
+            session = backend.create_session(direction, sample_rate)
+            sessions[backend.name] = (backend, session, sample_rate)
+            loop.run_until_complete(asyncio.wait_for(backend.warm_session(session),
+                                                     self.connection_warmup_timeout))
+            self._record_connection(label, "ready", started)
+        except Exception as e:
+            self._record_connection(label, "failed", started, e)
+    
+    def _playback_stage(self, spec, playback_queue, callback, heartbeat):
+        """Stage 3: play synthesized audio to the direction's device in utterance order"""
+        last_seq = 0
         
         try:
-            while self.is_running:
-                try:
-                    original_text = self.incoming_text_queue.get(timeout=0.2)
-                except queue.Empty:
-                    continue
-                
-                callback(f"👥 Them ({target_lang}): {original_text}")
-                start_time = time.time()
+            while self.is_running and heartbeat.current:
+                job = self._get_while_running(playback_queue, heartbeat)
+                if job is None:
+                    break
+                heartbeat.work = job
                 
-                translated_text = self.translate_with_murf(
-                    original_text, 
-                    target_lang_code,
-                    source_lang_code,
-                    callback
-                )
+                TRACER.set_utterance(f"{spec['name']}-{job.seq}")
+                TRACER.counter(f"{spec['name']} queues", text=spec["text_queue"].qsize(),
+                               playback=playback_queue.qsize())
+                if job.seq <= last_seq:
+                    logger.warning(f"⚠️ {spec['name']} playback out of order: #{job.seq} after #{last_seq}")
+                last_seq = job.seq
                 
-                if translated_text is None:
-                    translated_text = original_text
+                source = None
+                stretcher = None
+                speed = 1.0
+                while True:
+                    chunk = self._get_while_running(job.audio, heartbeat)
+                    last = chunk is None
+                    if last and (stretcher is None or not self.is_running):
+                        break
+                    if job.first_audio_at is None:
+                        job.first_audio_at = time.time()
+                        speed = self.catchup_speed(spec["name"], job.first_audio_at - job.speech_end,
+                                                   spec["text_queue"].qsize() + playback_queue.qsize())
+                        if speed > 1.0:
+                            stretcher = WsolaStretcher(job.sample_rate)
+                            logger.info(f"⏩ {spec['name']} catching up at {speed:.2f}x")
+                    if stretcher is not None:
+                        with TRACER.span("catchup.stretch", "cpu", speed=round(speed, 2)):
+                            chunk = stretcher.flush(speed) if last else stretcher.process(chunk, speed)
+                    if chunk:
+                        if source is None:
+                            kind = "cached" if job.cached_audio is not None else "speech"
+                            source = self.mixer(spec["name"]).add_source(
+                                f"{spec['name']}-{job.seq}", MIXER_PRIORITIES[kind], job.sample_rate
+                            )
+                        source.write(chunk)
+                        if spec.get("on_played"):
+                            spec["on_played"](job)
+                    heartbeat.beat()
+                    if last:
+                        break
                 
-                if translated_text != original_text:
-                    callback(f"💬 For you ({source_lang}): {translated_text}")
+                played = False
+                if source is not None:
+                    source.close()
+                    played = self._wait_for_source(source, heartbeat)
                 
-                callback("🔊 Playing...")
+                stats = self.catchup_stats[spec["name"]]
+                stats["speed"] = round(speed, 2)
+                if stretcher is not None:
+                    stats["utterances"] += 1
+                    stats["seconds_saved"] += (stretcher.input_samples - stretcher.output_samples) / job.sample_rate
                 
-                audio_data = loop.run_until_complete(
-                    self.synthesize_with_websocket(
-                        voice_id_to_you, translated_text, source_lang,
-                        self.speaker_stream, "Speakers",
-                        self.speaker_device_sample_rate,
-                        self.incoming_folder
+                if not heartbeat.current:
+                    # Retired while stalled in the device: the supervisor already released the job
+                    break
+                heartbeat.work = None
+                job.completed_at = time.time()
+                total_latency = job.completed_at - job.created_at
+                self._track_active_job(-1)
+                if played:
+                    self.quality[spec["name"]].observe_latency(job.first_audio_at - job.speech_end)
+                if self.session_store and self.session_id:
+                    self.session_store.record_utterance(
+                        self.session_id, spec["name"], job, played,
+                        job.settings["source_code"], job.settings["target_code"], job.audio_path
                     )
-                )
+                if self.utterance_callback:
+                    self.utterance_callback(spec["name"], job, played)
                 
-                total_latency = time.time() - start_time
-                
-                if audio_data:
-                    callback(f"🔊 Heard! (⚡ {total_latency:.2f}s)")
-                else:
+                if played:
+                    callback(spec["done_msg"].format(latency=total_latency))
+                elif self.is_running:
                     callback("⚠️ Failed!", error=True)
         
         except Exception as e:
-            logger.error(f"Incoming translation thread error: {e}")
-        finally:
-            loop.close()
+            logger.error(f"{spec['name'].capitalize()} playback stage error: {e}")
+    
+    def _language_settings(self, direction, source_lang, target_lang, voice_id):
+        """The parts of a direction's pipeline spec that follow the session's languages and voice"""
+        source_lang_code = SUPPORTED_LANGUAGES[source_lang]["stt_code"]
+        target_lang_code = SUPPORTED_LANGUAGES[target_lang]["murf_translate_code"]
+        if direction == "outgoing":
+            return {
+                "source_code": source_lang_code,
+                "target_code": target_lang_code,
+                "voice_id": voice_id,
+                "language": target_lang,
+                "original_msg": f"📢 You ({source_lang}): {{text}}",
+                "translated_msg": f"💬 To meeting ({target_lang}): {{text}}"
+            }
+        return {
+            "source_code": target_lang_code,
+            "target_code": source_lang_code,
+            "voice_id": voice_id,
+            "language": source_lang,
+            "original_msg": f"👥 Them ({target_lang}): {{text}}",
+            "translated_msg": f"💬 For you ({source_lang}): {{text}}"
+        }
+    
+    def _wait_for_source(self, source, heartbeat):
+        """Wait for a mixer source to finish playing, beating while the device takes its audio"""
+        played_samples = source.played_samples
+        while not source.finished.wait(0.2):
+            if not self.is_running or not heartbeat.current:
+                # Stopped, or retired while the device stalled: drop the rest of the utterance,
+                # and give the mixer a fresh writer if the device write is what hung
+                source.cancel()
+                source.mixer.recover(self.supervisor.stall_timeout / 2)
+                return False
+            if source.played_samples != played_samples:
+                played_samples = source.played_samples
+                heartbeat.beat()
+        return source.played
+    
+    def _outgoing_translation_thread(self, source_lang, target_lang, voice_id, callback):
+        """OUTGOING: YOUR language → THEIR language → Meeting"""
+        def track_echo(job):
+            # Record what the meeting is hearing so the incoming side can ignore it
+            self.last_outgoing_translated_text = job.translated_text
+            self.last_outgoing_translated_time = time.time()
+        
+        spec = self.pipeline_specs["outgoing"] = {
+            "name": "outgoing",
+            "text_queue": self.outgoing_text_queue,
+            "folder": self.outgoing_folder,
+            "device_name": "Virtual Cable",
+            "on_played": track_echo,
+            "synth_msg": "🎤 Generating speech...",
+            "done_msg": "📡 Sent! (⚡ {latency:.2f}s)",
+            **self._language_settings("outgoing", source_lang, target_lang, voice_id)
+        }
+        self._run_translation_pipeline(spec, callback)
+    
+    def _incoming_translation_thread(self, source_lang, target_lang, voice_id_to_you, callback):
+        """INCOMING: THEIR language → YOUR language → Speakers"""
+        spec = self.pipeline_specs["incoming"] = {
+            "name": "incoming",
+            "text_queue": self.incoming_text_queue,
+            "folder": self.incoming_folder,
+            "device_name": "Speakers",
+            "synth_msg": "🔊 Playing...",
+            "done_msg": "🔊 Heard! (⚡ {latency:.2f}s)",
+            **self._language_settings("incoming", source_lang, target_lang, voice_id_to_you)
+        }
+        self._run_translation_pipeline(spec, callback)
     
-    def start(self, source_lang, target_lang, voice_id_to_meeting, voice_id_to_you, status_callback, audio_level_callback=None):
-        """Start the bidirectional translation service"""
+    def _merge_session_config(self, source_lang, target_lang, voice_id_to_meeting, voice_id_to_you):
+        """The session config with the given (non-None) changes applied"""
+        config = dict(self.session_config)
+        for key, value in (("source_lang", source_lang), ("target_lang", target_lang),
+                           ("voice_to_meeting", voice_id_to_meeting), ("voice_to_you", voice_id_to_you)):
+            if value is not None:
+                config[key] = value
+        
+        # A voice left over from the previous language falls back to the new language's default
+        for key, lang in (("voice_to_meeting", config["target_lang"]), ("voice_to_you", config["source_lang"])):
+            voices = SUPPORTED_LANGUAGES[lang]["voices"]
+            if config[key] not in voices.values():
+                config[key] = voices[next(iter(voices))]
+        return config
+    
+    def reconfigure(self, source_lang=None, target_lang=None, voice_id_to_meeting=None, voice_id_to_you=None):
+        """Change languages or voices of the running session without stopping it.
+        
+        Only the affected stages pick the change up: recognizers reopen in the new language
+        at the next pause, and the next utterance is translated and voiced with the new
+        settings. Audio capture keeps running throughout.
+        """
+        if not self.is_running or not self.session_config:
+            return False
+        started = time.time()
+        config = self.session_config = self._merge_session_config(
+            source_lang, target_lang, voice_id_to_meeting, voice_id_to_you
+        )
+        self.stt_languages = {
+            "outgoing": SUPPORTED_LANGUAGES[config["source_lang"]]["stt_code"],
+            "incoming": SUPPORTED_LANGUAGES[config["target_lang"]]["murf_translate_code"]
+        }
+        for direction, spec in self.pipeline_specs.items():
+            voice_id = config["voice_to_meeting"] if direction == "outgoing" else config["voice_to_you"]
+            spec.update(self._language_settings(direction, config["source_lang"], config["target_lang"], voice_id))
+        
+        logger.info(f"🔁 Reconfigured to {config['source_lang']} ⇄ {config['target_lang']} "
+                    f"in {(time.time() - started) * 1000:.1f}ms")
+        return True
+    
+    def start(self, source_lang, target_lang, voice_id_to_meeting, voice_id_to_you, status_callback,
+              audio_level_callback=None, directions=("outgoing", "incoming")):
+        """Start the bidirectional translation service (or only some of its directions)"""
         self.is_running = True
         self.audio_level_callback = audio_level_callback
+        self.active_jobs = 0
         
         # Reset tracking
         self.last_outgoing_text = ""
@@ -1010,23 +5574,33 @@ class BidirectionalVoiceTranslator:
         
         source_lang_code = source_info["stt_code"]
         target_lang_code = target_info["murf_translate_code"]
+        self.session_config = {"source_lang": source_lang, "target_lang": target_lang,
+                               "voice_to_meeting": voice_id_to_meeting, "voice_to_you": voice_id_to_you}
+        self.stt_languages = {"outgoing": source_lang_code, "incoming": target_lang_code}
+        self.pipeline_specs = {}
         
         logger.info(f"🚀 Starting BIDIRECTIONAL translation:")
         logger.info(f"  📤 OUTGOING: YOU speak {source_lang} → {target_lang} → Meeting")
         logger.info(f"  📥 INCOMING: THEY speak {target_lang} → {source_lang} → You")
         
-        if not self.virtual_output_stream:
+        if "outgoing" in directions and not self.virtual_output_stream:
             logger.error("❌ Virtual output stream not initialized!")
             status_callback("❌ Output device not set!", error=True)
             self.is_running = False
             return
         
-        if not self.speaker_stream:
+        if "incoming" in directions and not self.speaker_stream:
             logger.error("❌ Speaker stream not initialized!")
             status_callback("❌ Speaker device not set!", error=True)
             self.is_running = False
             return
         
+        for controller in self.quality.values():
+            controller.reset()
+        
+        if self.session_store:
+            self.session_id = self.session_store.start_session(source_lang, target_lang)
+        
         # Clear queues
         while not self.outgoing_text_queue.empty():
             try:
@@ -1040,38 +5614,55 @@ class BidirectionalVoiceTranslator:
             except:
                 break
         
-        # Start all threads
-        threading.Thread(
-            target=self._outgoing_stt_thread,
-            args=(source_lang_code, status_callback),
-            daemon=True
-        ).start()
-        
-        threading.Thread(
-            target=self._incoming_stt_thread,
-            args=(target_lang_code, status_callback),
-            daemon=True
-        ).start()
-        
-        threading.Thread(
-            target=self._outgoing_translation_thread,
-            args=(source_lang, target_lang, voice_id_to_meeting,
-                  source_lang_code, target_lang_code, status_callback),
-            daemon=True
-        ).start()
-        
-        threading.Thread(
-            target=self._incoming_translation_thread,
-            args=(source_lang, target_lang, voice_id_to_you,
-                  source_lang_code, target_lang_code, status_callback),
-            daemon=True
-        ).start()
+        # Warm the remote connections in parallel with the stage start-up
+        self.connections_ready.clear()
+        with self.connection_status_lock:
+            self.connection_status.clear()
+        self.last_translate_at = time.time()
+        if self.connection_warmup:
+            if self.wait_for_connections:
+                status_callback("🔌 Connecting...")
+            threading.Thread(
+                target=self._warm_connections,
+                name="connect-warmup",
+                args=([d for d in ("outgoing", "incoming") if d in directions], status_callback),
+                daemon=True
+            ).start()
+        else:
+            self.connections_ready.set()
+        
+        # Start all threads under the supervisor
+        self.supervisor.on_event = status_callback
+        self.supervisor.start()
+        if self.connection_warmup and self.keepalive_interval > 0:
+            self.supervisor.add("keepalive", self._keepalive_stage)
+        if "outgoing" in directions:
+            self.supervisor.add("outgoing-stt", self._outgoing_stt_thread, (source_lang_code, status_callback))
+            self._outgoing_translation_thread(source_lang, target_lang, voice_id_to_meeting, status_callback)
+        
+        if "incoming" in directions:
+            self.supervisor.add("incoming-stt", self._incoming_stt_thread, (target_lang_code, status_callback))
+            self._incoming_translation_thread(source_lang, target_lang, voice_id_to_you, status_callback)
+        
+        if self.warmup_enabled and self.warmup_phrases:
+            warmup_directions = [
+                spec for spec in [("outgoing", source_lang_code, target_lang_code, voice_id_to_meeting),
+                                  ("incoming", target_lang_code, source_lang_code, voice_id_to_you)]
+                if spec[0] in directions
+            ]
+            threading.Thread(
+                target=self._warmup_thread,
+                name="warmup",
+                args=(warmup_directions, status_callback),
+                daemon=True
+            ).start()
         
         status_callback("✅ Bidirectional translation active!")
     
     def stop(self):
         """Stop the translation service"""
         logger.info("ℹ️ Stopping bidirectional translation service...")
+        self.supervisor.stop()
         self.is_running = False
         self.audio_level_callback = None
         
@@ -1100,12 +5691,19 @@ class BidirectionalVoiceTranslator:
                 pass
         
         time.sleep(0.5)
+        if self.session_store and self.session_id:
+            self.session_store.end_session(self.session_id)
+            self.session_id = None
+        logger.info(f"📊 Resilience metrics: {self.get_resilience_metrics()}")
         logger.info("✅ Bidirectional translation service stopped")
     
     def cleanup(self):
         """Full cleanup"""
         self.stop()
         
+        for mixer in self.mixers.values():
+            mixer.stop()
+        
         if self.virtual_output_stream:
             try:
                 self.virtual_output_stream.stop_stream()
@@ -1120,12 +5718,797 @@ class BidirectionalVoiceTranslator:
             except:
                 pass
         
-        if self.pyaudio_instance:
-            self.pyaudio_instance.terminate()
+        if self.local_recognizer_pool:
+            self.local_recognizer_pool.shutdown()
+        
+        self.translate_caller.shutdown()
+        self.tts_connect_caller.shutdown()
+        
+        if self.session_store:
+            self.session_store.close()
+        
+        if TRACER.enabled and VOICEBRIDGE_TRACE:
+            TRACER.stop_sampler()
+            TRACER.export(VOICEBRIDGE_TRACE)
+        
+        if self.audio_backend:
+            self.audio_backend.terminate()
+
+
+def _audio_hub_main(backend_spec, inputs, outputs, frame_ms, conn):
+    """Audio hub process: owns the devices and pumps them to and from the workers' rings"""
+    name, options = backend_spec
+    backend = create_audio_backend(name, **options)
+    hub = AudioHub(backend, frame_ms)
+    for spec in inputs:
+        hub.add_input(*spec)
+    for spec in outputs:
+        hub.add_output(*spec)
+    try:
+        conn.send(("ready",))
+        # Report capture jitter every second until told to stop (or the front end goes away)
+        while True:
+            if not conn.poll(1.0):
+                conn.send(("capture", hub.snapshot()))
+                continue
+            message = conn.recv()
+            if message[0] != "device":
+                break
+            hub.set_device(*message[1:])
+    except (EOFError, OSError):
+        pass
+    hub.stop()
+    backend.terminate()
+    try:
+        conn.send(("stopped", hub.snapshot()))
+    except (EOFError, OSError):
+        pass
+    for spec in inputs + outputs:
+        if spec[1] is not None:
+            spec[1].close()
+
+
+def _direction_worker_main(config, input_ring, output_ring, conn):
+    """Worker process: one direction's pipeline, reading and writing the hub's rings"""
+    direction = config["direction"]
+    send_lock = threading.Lock()
+
+    def send(*message):
+        with send_lock:
+            try:
+                conn.send(message)
+            except (EOFError, OSError):
+                pass
+
+    last_level = {}
+
+    def on_level(source, level):
+        # Levels only drive meters, so ~20 updates a second is plenty across the pipe
+        now = time.monotonic()
+        if now - last_level.get(source, 0) >= 0.05:
+            last_level[source] = now
+            send("level", source, float(level))
+
+    def on_utterance(name, job, played):
+        send("utterance", name, job, played)
+        if name == "outgoing" and played:
+            send("echo", job.translated_text, time.time())
+
+    backend = RingAudioBackend(inputs={"Hub Input": input_ring},
+                               outputs={"Hub Output": (output_ring, config["output_rate"])})
+    try:
+        translator = BidirectionalVoiceTranslator(require_google=config["require_google"], audio_backend=backend,
+                                                  session_db=None)
+    except Exception as e:
+        send("status", f"❌ {direction.capitalize()} worker failed: {e}", True)
+        input_ring.close()
+        output_ring.close()
+        return
+    if config["stub_backends"]:
+        use_stub_backends(translator)
+    # The hub's ring already decouples the device from this pipeline
+    translator.capture_mode = "blocking"
+    translator.set_frame_size(config["frame_ms"], config["stt_batch_ms"])
+    translator.warmup_enabled = config["warmup_enabled"]
+    translator.adaptive_quality = config["adaptive_quality"]
+    if direction == "outgoing":
+        translator.set_output_device("Hub Output")
+    else:
+        translator.set_input_device("Hub Input")
+        translator.set_speaker_device("Hub Output")
+    translator.utterance_callback = on_utterance
+
+    translator.start(config["source_lang"], config["target_lang"], config["voice_to_meeting"],
+                     config["voice_to_you"], lambda message, error=False: send("status", message, error),
+                     on_level, directions=(direction,))
+    try:
+        while translator.is_running:
+            message = conn.recv()
+            if message[0] == "stop":
+                break
+            if message[0] == "echo":
+                # What the meeting just heard from the outgoing worker
+                translator.last_outgoing_translated_text, translator.last_outgoing_translated_time = message[1:]
+            elif message[0] == "reconfigure":
+                translator.reconfigure(**message[1])
+            elif message[0] == "notification":
+                translator.play_notification(direction, *message[1:])
+    except (EOFError, OSError):
+        pass
+    translator.stop()
+    send("metrics", translator.get_resilience_metrics())
+    translator.cleanup()
+    send("stopped")
+    input_ring.close()
+    output_ring.close()
+
+
+class ProcessTranslator(BidirectionalVoiceTranslator):
+    """Front end that runs each direction's pipeline in its own worker process.
+
+    An audio hub process owns the devices and exchanges PCM with the workers through
+    SharedPcmRings, so capture never waits on the GIL of a busy pipeline or the GUI.
+    Status, meter levels and finished utterances come back over one pipe per process.
+    """
+
+    def __init__(self, require_google=True, audio_backend_spec=(AUDIO_BACKEND, {}), stub_backends=False):
+        name, options = audio_backend_spec
+        # Device lists and test tones only: the engines live in the workers
+        super().__init__(require_google=False, audio_backend=create_audio_backend(name, **options),
+                         local_stt_model=None)
+        self.require_google = require_google
+        self.audio_backend_spec = audio_backend_spec
+        self.stub_backends = stub_backends
+        self.device_names = {}
+        self.processes = {}
+        self.connections = {}
+        self.listeners = []
+        self.rings = {}
+        self.send_lock = threading.Lock()
+        self.status_callback = None
+        self.direction_codes = {}
+        self.worker_metrics = {}
+        self.mp_context = multiprocessing.get_context("spawn")
+
+    def set_output_device(self, device_name):
+        self.device_names["output"] = device_name
+        if self.is_running and device_name in self.output_devices:
+            # The hub owns the devices during a session and moves the stream itself
+            self.output_device = self.output_devices[device_name]
+            logger.info(f"✅ OUTPUT device set to: {device_name} (Device ID: {self.output_device})")
+            self._send("audio-hub", "device", "to_meeting", self.output_device)
+            return True
+        return super().set_output_device(device_name)
+
+    def set_input_device(self, device_name):
+        if self.is_running and device_name in self.input_devices:
+            self.input_device = self.input_devices[device_name]
+            logger.info(f"✅ INPUT device set to: {device_name} (Device ID: {self.input_device})")
+            self._send("audio-hub", "device", "meeting", self.input_device)
+            return True
+        return super().set_input_device(device_name)
+
+    def set_speaker_device(self, device_name):
+        self.device_names["speaker"] = device_name
+        if self.is_running and device_name in self.output_devices:
+            self.speaker_device = self.output_devices[device_name]
+            logger.info(f"✅ SPEAKER device set to: {device_name} (Device ID: {self.speaker_device})")
+            self._send("audio-hub", "device", "to_you", self.speaker_device)
+            return True
+        return super().set_speaker_device(device_name)
+
+    def play_notification(self, direction, audio_bytes, sample_rate, expires_in=2.0):
+        # During a session the direction's worker owns the output and mixes the sound in
+        if self.is_running:
+            self._send(direction, "notification", audio_bytes, sample_rate, expires_in)
+            return True
+        return super().play_notification(direction, audio_bytes, sample_rate, expires_in)
+
+    def reconfigure(self, source_lang=None, target_lang=None, voice_id_to_meeting=None, voice_id_to_you=None):
+        """Hand a live language or voice change to both workers"""
+        if not self.is_running or not self.session_config:
+            return False
+        config = self.session_config = self._merge_session_config(
+            source_lang, target_lang, voice_id_to_meeting, voice_id_to_you
+        )
+        source_lang_code = SUPPORTED_LANGUAGES[config["source_lang"]]["stt_code"]
+        target_lang_code = SUPPORTED_LANGUAGES[config["target_lang"]]["murf_translate_code"]
+        self.direction_codes = {"outgoing": (source_lang_code, target_lang_code),
+                                "incoming": (target_lang_code, source_lang_code)}
+        for name in ("outgoing", "incoming"):
+            self._send(name, "reconfigure", {
+                "source_lang": config["source_lang"],
+                "target_lang": config["target_lang"],
+                "voice_id_to_meeting": config["voice_to_meeting"],
+                "voice_id_to_you": config["voice_to_you"]
+            })
+        logger.info(f"🔁 Reconfigured to {config['source_lang']} ⇄ {config['target_lang']}")
+        return True
+
+    def _send(self, name, *message):
+        with self.send_lock:
+            try:
+                self.connections[name].send(message)
+            except (KeyError, EOFError, OSError):
+                pass
+
+    def _spawn(self, name, target, *args):
+        parent_conn, child_conn = self.mp_context.Pipe()
+        process = self.mp_context.Process(target=target, args=args + (child_conn,), name=name, daemon=True)
+        process.start()
+        child_conn.close()
+        self.processes[name] = process
+        self.connections[name] = parent_conn
+        listener = threading.Thread(target=self._control_listener, args=(name, parent_conn),
+                                    name=f"{name}-control", daemon=True)
+        self.listeners.append(listener)
+        listener.start()
+
+    def _control_listener(self, name, conn):
+        """Dispatch one process's control messages to the front end's callbacks"""
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            kind = message[0]
+            if kind == "status" and self.status_callback:
+                self.status_callback(message[1], error=message[2])
+            elif kind == "level" and self.audio_level_callback:
+                self.audio_level_callback(message[1], message[2])
+            elif kind == "utterance":
+                _, direction, job, played = message
+                if self.session_store and self.session_id:
+                    source_code, target_code = (job.settings["source_code"], job.settings["target_code"]) \
+                        if job.settings else self.direction_codes[direction]
+                    self.session_store.record_utterance(self.session_id, direction, job, played,
+                                                        source_code, target_code, job.audio_path)
+                if self.utterance_callback:
+                    self.utterance_callback(direction, job, played)
+            elif kind == "echo":
+                self._send("incoming", *message)
+            elif kind == "metrics":
+                self.worker_metrics[name] = message[1]
+            elif kind in ("capture", "stopped") and name == "audio-hub" and len(message) > 1:
+                self.worker_metrics["capture_jitter"] = message[1]
+            if kind == "stopped":
+                return
+        if self.is_running:
+            logger.error(f"❌ {name} process exited unexpectedly")
+            if self.status_callback:
+                self.status_callback(f"❌ {name} process exited!", error=True)
+
+    def start(self, source_lang, target_lang, voice_id_to_meeting, voice_id_to_you, status_callback,
+              audio_level_callback=None):
+        """Start the hub and one worker process per direction"""
+        for device, message in ((self.output_device, "❌ Output device not set!"),
+                                (self.speaker_device, "❌ Speaker device not set!"),
+                                (self.input_device, "❌ Input device not set!")):
+            if device is None:
+                status_callback(message, error=True)
+                return
+
+        self.is_running = True
+        self.status_callback = status_callback
+        self.audio_level_callback = audio_level_callback
+        self.worker_metrics = {}
+        source_lang_code = SUPPORTED_LANGUAGES[source_lang]["stt_code"]
+        target_lang_code = SUPPORTED_LANGUAGES[target_lang]["murf_translate_code"]
+        self.direction_codes = {"outgoing": (source_lang_code, target_lang_code),
+                                "incoming": (target_lang_code, source_lang_code)}
+        self.session_config = {"source_lang": source_lang, "target_lang": target_lang,
+                               "voice_to_meeting": voice_id_to_meeting, "voice_to_you": voice_id_to_you}
+        logger.info(f"🚀 Starting BIDIRECTIONAL translation with a process per direction "
+                    f"({source_lang} ⇄ {target_lang})")
+
+        # The hub opens the output devices for the session, so release ours
+        for stream in (self.virtual_output_stream, self.speaker_stream):
+            if stream:
+                stream.close()
+        self.virtual_output_stream = self.speaker_stream = None
+
+        # Capture rings hold capture_buffer_seconds at up to 48kHz, playback rings two seconds
+        capture_bytes = int(48000 * max(self.capture_buffer_seconds, 0.5)) * 2
+        self.rings = {
+            "mic": SharedPcmRing(capture_bytes),
+            "meeting": SharedPcmRing(capture_bytes),
+            "to_meeting": SharedPcmRing(48000 * 2 * 2),
+            "to_you": SharedPcmRing(48000 * 2 * 2)
+        }
+        self._spawn("audio-hub", _audio_hub_main, self.audio_backend_spec,
+                    [("mic", self.rings["mic"], None, [self.sample_rate]),
+                     ("meeting", self.rings["meeting"], self.input_device, None)],
+                    [("to_meeting", self.rings["to_meeting"], self.output_device),
+                     ("to_you", self.rings["to_you"], self.speaker_device)],
+                    self.frame_ms)
+
+        if self.session_store:
+            self.session_id = self.session_store.start_session(source_lang, target_lang)
+
+        config = {
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "voice_to_meeting": voice_id_to_meeting,
+            "voice_to_you": voice_id_to_you,
+            "require_google": self.require_google,
+            "stub_backends": self.stub_backends,
+            "frame_ms": self.frame_ms,
+            "stt_batch_ms": self.stt_batch_ms,
+            "warmup_enabled": self.warmup_enabled,
+            "adaptive_quality": self.adaptive_quality
+        }
+        self._spawn("outgoing", _direction_worker_main,
+                    dict(config, direction="outgoing", output_rate=self.output_device_sample_rate),
+                    self.rings["mic"], self.rings["to_meeting"])
+        self._spawn("incoming", _direction_worker_main,
+                    dict(config, direction="incoming", output_rate=self.speaker_device_sample_rate),
+                    self.rings["meeting"], self.rings["to_you"])
+
+        status_callback("✅ Bidirectional translation active (process per direction)!")
+
+    def stop(self, timeout=10.0):
+        """Stop the workers, then the hub, and free the rings"""
+        if not self.processes:
+            self.is_running = False
+            return
+        logger.info("ℹ️ Stopping process-per-direction translation...")
+        self.is_running = False
+        self.audio_level_callback = None
+
+        # Closing the capture rings ends the workers' recognizer streams
+        for name in ("mic", "meeting"):
+            self.rings[name].close_stream()
+        for name in ("outgoing", "incoming"):
+            self._send(name, "stop")
+        deadline = time.time() + timeout
+        for name in ("outgoing", "incoming", "audio-hub"):
+            if name == "audio-hub":
+                for ring in self.rings.values():
+                    ring.close_stream()
+                self._send(name, "stop")
+            process = self.processes[name]
+            process.join(max(0.1, deadline - time.time()))
+            if process.is_alive():
+                logger.warning(f"⚠️ {name} process did not stop, terminating it")
+                process.terminate()
+                process.join()
+        for listener in self.listeners:
+            listener.join(1.0)
+        for conn in self.connections.values():
+            conn.close()
+        for ring in self.rings.values():
+            ring.close()
+        self.processes, self.connections, self.listeners, self.rings = {}, {}, [], {}
+
+        if self.session_store and self.session_id:
+            self.session_store.end_session(self.session_id)
+            self.session_id = None
+
+        # Take the output devices back for test tones, unless that would overwrite the hub's recordings
+        if self.audio_backend.reopen_outputs:
+            if "output" in self.device_names:
+                super().set_output_device(self.device_names["output"])
+            if "speaker" in self.device_names:
+                super().set_speaker_device(self.device_names["speaker"])
+        logger.info(f"📊 Worker metrics: {self.get_resilience_metrics()}")
+        logger.info("✅ Bidirectional translation service stopped")
+
+    def get_resilience_metrics(self):
+        """Each worker's metrics from its last report, plus the hub's capture jitter"""
+        return dict(self.worker_metrics)
+
+
+def _jitter_load(stop_event):
+    """Pipeline-like GIL load: decode Murf-sized JSON/base64 chunks and meter them in Python"""
+    payload = json.dumps({"audio": base64.b64encode(os.urandom(96000)).decode(), "final": False})
+    while not stop_event.is_set():
+        pcm = base64.b64decode(json.loads(payload)["audio"])
+        sum(pcm[:20000])
+
+
+def benchmark_capture_jitter(seconds=10.0, frame_ms=20.0, load_threads=2, backend_spec=("null", {})):
+    """Capture jitter idle, under pipeline-like load in the same interpreter, and with capture
+    moved to the audio hub process while the same load runs in this one"""
+    name, options = backend_spec
+    report = {"frame_ms": frame_ms, "seconds": seconds, "load_threads": load_threads}
+
+    def threaded_run():
+        hub = AudioHub(create_audio_backend(name, **options), frame_ms)
+        hub.add_input("mic", None, None, [16000])
+        time.sleep(seconds)
+        hub.stop()
+        hub.backend.terminate()
+        return hub.snapshot().get("mic", {})
+
+    logger.info(f"⏱️ Capture jitter, idle ({seconds:.0f}s)...")
+    report["idle"] = threaded_run()
+
+    stop_load = threading.Event()
+    loaders = [threading.Thread(target=_jitter_load, args=(stop_load,), name=f"load-{i}", daemon=True)
+               for i in range(load_threads)]
+    for loader in loaders:
+        loader.start()
+    try:
+        logger.info(f"⏱️ Capture jitter, threads engine under load ({seconds:.0f}s)...")
+        report["threads"] = threaded_run()
+
+        logger.info(f"⏱️ Capture jitter, hub process under load ({seconds:.0f}s)...")
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        hub = context.Process(target=_audio_hub_main, name="audio-hub", daemon=True,
+                              args=(backend_spec, [("mic", None, None, [16000])], [], frame_ms, child_conn))
+        hub.start()
+        parent_conn.recv()
+        time.sleep(seconds)
+        parent_conn.send(("stop",))
+        message = parent_conn.recv()
+        while message[0] != "stopped":
+            message = parent_conn.recv()
+        hub.join()
+        report["processes"] = message[1].get("mic", {})
+    finally:
+        stop_load.set()
+        for loader in loaders:
+            loader.join()
+    return report
+
+
+class ReplayHarness:
+    """Push recorded meeting audio through the translator and report per-utterance latency"""
+
+    def __init__(self, translator, mic_wav=None, meeting_wav=None, speed=1.0, out_dir=None):
+        self.translator = translator
+        self.mic_wav = mic_wav
+        self.meeting_wav = meeting_wav
+        self.speed = speed
+        self.out_dir = out_dir
+
+    def run(self, source_lang, target_lang, voice_to_meeting=None, voice_to_you=None,
+            idle_grace=3.0, drain_timeout=60.0):
+        """Replay both recordings through a full session and return the report"""
+        translator = self.translator
+        backend = WavFileAudioBackend(self.mic_wav, self.meeting_wav, self.out_dir, self.speed)
+        mic, meeting = backend.mic, backend.meeting
+
+        translator.use_audio_backend(backend)
+        translator.set_input_device("WAV Meeting In")
+        translator.set_output_device("WAV Meeting Out")
+        translator.set_speaker_device("WAV Speakers")
+        if not self.speed:
+            # Unpaced replay outruns any consumer, so a capture ring would only drop audio
+            translator.capture_mode = "blocking"
+        sinks = {"to_meeting": backend.outputs["WAV Meeting Out"], "to_you": backend.outputs["WAV Speakers"]}
+
+        voice_to_meeting = voice_to_meeting or next(iter(SUPPORTED_LANGUAGES[target_lang]["voices"].values()))
+        voice_to_you = voice_to_you or next(iter(SUPPORTED_LANGUAGES[source_lang]["voices"].values()))
+
+        records = []
+        records_lock = threading.Lock()
+
+        def on_utterance(direction, job, played):
+            with records_lock:
+                records.append((direction, job, played))
+
+        translator.utterance_callback = on_utterance
+        wall_start = time.time()
+        translator.start(source_lang, target_lang, voice_to_meeting, voice_to_you,
+                         lambda message, error=False: logger.debug(f"[replay] {message}"))
+        if not translator.is_running:
+            raise RuntimeError("Translator failed to start for replay")
+
+        logger.info(f"▶️ Replaying mic={self.mic_wav} meeting={self.meeting_wav} at "
+                    f"{'max' if not self.speed else f'{self.speed}x'} speed")
+        while not (mic.finished and meeting.finished):
+            time.sleep(0.1)
+
+        # Drain: wait until the pipelines have been idle for idle_grace seconds
+        drain_start = last_busy = time.time()
+        while time.time() - last_busy < idle_grace and time.time() - drain_start < drain_timeout:
+            if translator._pipeline_busy():
+                last_busy = time.time()
+            time.sleep(0.1)
+
+        # Measure up to the last completed utterance, not the idle grace period
+        finished_at = max([drain_start] + [job.completed_at or 0 for _, job, _ in records])
+        wall_seconds = finished_at - wall_start
+        translator.stop()
+        translator.utterance_callback = None
+        for sink in sinks.values():
+            sink.close()
+
+        return self._report(records, wall_seconds, mic, meeting, sinks)
+
+    def _report(self, records, wall_seconds, mic, meeting, sinks):
+        utterances = []
+        summary = {}
+
+        for direction, job, played in sorted(records, key=lambda r: r[1].completed_at or 0):
+            utterances.append(dict({
+                "direction": direction,
+                "seq": job.seq,
+                "original": job.original_text,
+                "translated": job.translated_text,
+                "played": played,
+                "cached": job.cached_audio is not None
+            }, **job.stage_latencies()))
+
+        for direction, sink_name in (("outgoing", "to_meeting"), ("incoming", "to_you")):
+            rows = [u for u in utterances if u["direction"] == direction]
+            totals = LatencyTracker(window=max(1, len(rows)))
+            first_audio = LatencyTracker(window=max(1, len(rows)))
+            for row in rows:
+                totals.record(row["total"])
+                first_audio.record(row["first_audio"])
+            summary[direction] = {
+                "utterances": len(rows),
+                "failed": sum(1 for row in rows if not row["played"]),
+                "total_p50": totals.percentile(50),
+                "total_p95": totals.percentile(95),
+                "first_audio_p50": first_audio.percentile(50),
+                "first_audio_p95": first_audio.percentile(95),
+                "utterances_per_minute": round(len(rows) / wall_seconds * 60, 2) if wall_seconds else None,
+                "output_audio_seconds": round(sinks[sink_name].seconds_written, 2)
+            }
+            if self.out_dir:
+                # Read the recording back after stop(), which must not have reopened (and emptied) it
+                path = Path(self.out_dir) / f"{sink_name}.wav"
+                with wave.open(str(path), "rb") as recording:
+                    recorded = recording.getnframes() / recording.getframerate()
+                summary[direction]["recorded_seconds"] = round(recorded, 2)
+                if abs(recorded - sinks[sink_name].seconds_written) > 0.05:
+                    logger.warning(f"⚠️ {path} holds {recorded:.2f}s of the {sinks[sink_name].seconds_written:.2f}s played")
+
+        audio_seconds = max(mic.duration, meeting.duration)
+        return {
+            "speed": self.speed or "max",
+            "wall_seconds": round(wall_seconds, 2),
+            "audio_seconds": {"mic": round(mic.duration, 2), "meeting": round(meeting.duration, 2)},
+            "speedup": round(audio_seconds / wall_seconds, 2) if wall_seconds else None,
+            "summary": summary,
+            "utterances": utterances,
+            "metrics": self.translator.get_resilience_metrics()
+        }
+
+
+def segment_speech(pcm, sample_rate, threshold, frame_ms=30, min_silence_ms=500, pad_ms=200, max_segment_s=30.0):
+    """Split mono int16 PCM into (start, end) sample ranges of speech separated by silence.
+
+    A frame is speech when its mean absolute level reaches threshold (the same measure the
+    live STT threads use). Segments longer than max_segment_s are cut at their quietest frame.
+    """
+    audio = np.frombuffer(pcm, dtype=np.int16)
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    count = len(audio) // frame
+    if not count:
+        return []
+    levels = np.abs(audio[:count * frame].reshape(count, frame).astype(np.int32)).mean(axis=1)
+    voiced = np.flatnonzero(levels >= threshold)
+    if not len(voiced):
+        return []
+
+    breaks = np.flatnonzero(np.diff(voiced) > max(1, int(min_silence_ms / frame_ms)))
+    starts = np.concatenate(([voiced[0]], voiced[breaks + 1]))
+    ends = np.concatenate((voiced[breaks], [voiced[-1]])) + 1
+    pad = int(pad_ms / frame_ms)
+    max_frames = max(2, int(max_segment_s * 1000 / frame_ms))
+
+    segments = []
+    for start, end in zip(starts, ends):
+        start, end = max(0, start - pad), min(count, end + pad)
+        while end - start > max_frames:
+            # Cut at the quietest frame in the last 40% of the allowed length
+            lo = start + int(max_frames * 0.6)
+            cut = lo + int(np.argmin(levels[lo:start + max_frames]))
+            segments.append((start * frame, cut * frame))
+            start = cut
+        segments.append((start * frame, end * frame))
+    return segments
+
+
+class BatchTranslator:
+    """Translate a recorded meeting offline, much faster than real time.
+
+    The recording is cut into speech segments, which worker threads recognize, translate and
+    synthesize concurrently. Translated audio that would run into the next segment is
+    compressed with WSOLA (up to max_speed) by the same workers, then laid out on a track
+    at the times the segments were spoken.
+    """
+
+    def __init__(self, translator, workers=4, max_speed=1.5, output_rate=None):
+        self.translator = translator
+        self.workers = max(1, workers)
+        self.max_speed = max_speed
+        self.output_rate = output_rate or translator.murf_sample_rate
+
+    def _worker(self, pending, results, progress, source_code, target_code, voice_id):
+        translator = self.translator
+        translator._set_request_context("background")
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        sessions = {}
+
+        async def one_segment(text):
+            yield text
+
+        try:
+            while True:
+                try:
+                    segment = pending.get_nowait()
+                except queue.Empty:
+                    return
+                chunk_bytes = int(16000 * translator.stt_batch_ms / 1000) * 2
+                pcm = segment["pcm"]
+                try:
+                    transcripts = translator.recognition_router.call(lambda backend: list(backend.transcribe_stream(
+                        (pcm[i:i + chunk_bytes] for i in range(0, len(pcm), chunk_bytes)),
+                        source_code, 16000, {"model": "default"}
+                    )))
+                    segment["original"] = " ".join(t.strip() for t in transcripts if t.strip())
+                    if segment["original"]:
+                        segment["translated"] = translator.translate_text(segment["original"], source_code,
+                                                                          target_code, None)
+                        backend = translator.synthesis_router.choose()
+                        if backend.name not in sessions:
+                            sessions[backend.name] = (backend, backend.create_session("batch", self.output_rate))
+                        audio = bytearray()
+                        start = time.time()
+                        produced = loop.run_until_complete(backend.synthesize(
+                            sessions[backend.name][1], voice_id, one_segment(segment["translated"]), audio.extend
+                        ))
+                        translator.synthesis_router.record(backend, time.time() - start, produced)
+                        segment["audio"] = self._fit(segment, bytes(audio))
+                except Exception as e:
+                    segment["error"] = str(e)
+                    logger.error(f"❌ Batch segment at {segment['start']:.1f}s failed: {e}")
+                segment["pcm"] = None
+                results.append(segment)
+                progress()
+        finally:
+            for backend, session in sessions.values():
+                try:
+                    loop.run_until_complete(backend.close_session(session))
+                except Exception:
+                    pass
+            loop.close()
+
+    def _fit(self, segment, audio):
+        """Compress audio that would run into the next segment, within what stays intelligible"""
+        room = segment["room"]
+        length = len(audio) // 2
+        if room is None or length <= room * self.output_rate:
+            return audio
+        speed = min(self.max_speed, length / max(room * self.output_rate, 1))
+        if speed <= 1.01:
+            return audio
+        segment["speed"] = round(speed, 2)
+        stretcher = WsolaStretcher(self.output_rate)
+        return stretcher.process(audio, speed) + stretcher.flush(speed)
+
+    def run(self, wav_path, source_lang, target_lang, voice_id=None, output_wav=None, transcript_path=None):
+        """Translate wav_path from source_lang to target_lang and return the report"""
+        translator = self.translator
+        source_code = SUPPORTED_LANGUAGES[source_lang]["stt_code"]
+        target_code = SUPPORTED_LANGUAGES[target_lang]["murf_translate_code"]
+        voice_id = voice_id or next(iter(SUPPORTED_LANGUAGES[target_lang]["voices"].values()))
+        wall_start = time.time()
+
+        pcm = read_wav_pcm(wav_path, 16000)
+        audio_seconds = len(pcm) / 2 / 16000
+        ranges = segment_speech(pcm, 16000, translator.voice_level_threshold)
+        pending = queue.Queue()
+        for i, (start, end) in enumerate(ranges):
+            # Seconds until the next segment starts: how long the translation can play uncompressed
+            room = (ranges[i + 1][0] - start) / 16000 if i + 1 < len(ranges) else None
+            pending.put({"start": round(int(start) / 16000, 3), "end": round(int(end) / 16000, 3),
+                         "room": room, "pcm": pcm[start * 2:end * 2], "speed": 1.0,
+                         "original": "", "translated": "", "audio": b"", "error": None})
+        logger.info(f"📼 Batch: {len(ranges)} segments in {audio_seconds:.0f}s of audio, {self.workers} workers")
+
+        results = []
+        progress_lock = threading.Lock()
+        done = [0]
+
+        def progress():
+            with progress_lock:
+                done[0] += 1
+                if done[0] % max(1, len(ranges) // 10) == 0 or done[0] == len(ranges):
+                    logger.info(f"📼 Batch: {done[0]}/{len(ranges)} segments translated")
+
+        workers = [
+            threading.Thread(target=self._worker, name=f"batch-{i}",
+                             args=(pending, results, progress, source_code, target_code, voice_id), daemon=True)
+            for i in range(min(self.workers, len(ranges)))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        segments = sorted(results, key=lambda segment: segment["start"])
+        track = self._assemble(segments, audio_seconds)
+        wall_seconds = time.time() - wall_start
+
+        if output_wav:
+            with wave.open(str(output_wav), "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(self.output_rate)
+                wav.writeframes(track.tobytes())
+            logger.info(f"💾 Translated track written to {output_wav}")
+
+        transcript = [
+            {key: segment[key] for key in ("start", "end", "audio_start", "audio_end", "original", "translated", "error")}
+            for segment in segments
+        ]
+        if transcript_path:
+            self._write_transcript(transcript, transcript_path)
+
+        return {
+            "input": str(wav_path),
+            "output": str(output_wav) if output_wav else None,
+            "audio_seconds": round(audio_seconds, 2),
+            "wall_seconds": round(wall_seconds, 2),
+            "speedup": round(audio_seconds / wall_seconds, 2) if wall_seconds else None,
+            "workers": self.workers,
+            "segments": len(segments),
+            "failed": sum(1 for segment in segments if segment["error"]),
+            "compressed": sum(1 for segment in segments if segment["speed"] > 1.0),
+            "transcript": transcript,
+            "metrics": translator.get_resilience_metrics()
+        }
+
+    def _assemble(self, segments, audio_seconds):
+        """Lay translated audio out at its source times; returns the int16 track"""
+        rate = self.output_rate
+        placed = []
+        cursor = 0
+        for segment in segments:
+            # Audio still too long after compression pushes the following segments back
+            position = max(int(segment["start"] * rate), cursor)
+            samples = np.frombuffer(segment["audio"], dtype=np.int16)
+            segment["audio_start"] = round(position / rate, 3)
+            segment["audio_end"] = round((position + len(samples)) / rate, 3)
+            placed.append((position, samples))
+            cursor = position + len(samples)
+
+        track = np.zeros(max(cursor, int(audio_seconds * rate)), dtype=np.int16)
+        for position, samples in placed:
+            track[position:position + len(samples)] = samples
+        return track
+
+    @staticmethod
+    def _write_transcript(transcript, path):
+        """JSON transcript, or SubRip subtitles timed to the translated track when path ends in .srt"""
+        path = Path(path)
+        if path.suffix.lower() != ".srt":
+            path.write_text(json.dumps(transcript, indent=2, ensure_ascii=False), encoding="utf-8")
+            return
+
+        def timestamp(seconds):
+            millis = int(round(seconds * 1000))
+            return f"{millis // 3600000:02d}:{millis // 60000 % 60:02d}:{millis // 1000 % 60:02d},{millis % 1000:03d}"
+
+        blocks = []
+        for entry in (e for e in transcript if e["translated"]):
+            blocks.append(f"{len(blocks) + 1}\n{timestamp(entry['audio_start'])} --> "
+                          f"{timestamp(max(entry['audio_end'], entry['audio_start'] + 1.0))}\n{entry['translated']}\n")
+        path.write_text("\n".join(blocks), encoding="utf-8")
+
+
+def use_stub_backends(translator):
+    """Swap every engine for its in-process stub (load and regression testing)"""
+    for kind, router, stub in (
+        ("recognition", translator.recognition_router, StubRecognitionBackend()),
+        ("translation", translator.translation_router, StubTranslationBackend()),
+        ("synthesis", translator.synthesis_router, StubSynthesisBackend())
+    ):
+        for backend in list(router.backends):
+            router.unregister(backend.name)
+        translator.register_backend(kind, stub)
 
 
 class TranslatorGUI:
-    def __init__(self, root):
+    def __init__(self, root, audio_backend=AUDIO_BACKEND, engine_mode=ENGINE_MODE, audio_options=None):
         self.root = root
         self.root.title("🌉 VoiceBridge - Bidirectional Real-Time Voice Translator")
         self.root.geometry("1100x950")
@@ -1142,7 +6525,12 @@ class TranslatorGUI:
             return
         
         try:
-            self.translator = BidirectionalVoiceTranslator()
+            if engine_mode == "processes":
+                self.translator = ProcessTranslator(audio_backend_spec=(audio_backend, audio_options or {}))
+            else:
+                self.translator = BidirectionalVoiceTranslator(
+                    audio_backend=create_audio_backend(audio_backend, **(audio_options or {}))
+                )
         except Exception as e:
             messagebox.showerror("Initialization Error", str(e))
             self.root.destroy()
@@ -1262,6 +6650,7 @@ class TranslatorGUI:
             font=("Arial", 9)
         )
         self.voice_to_meeting_dropdown.grid(row=2, column=1, padx=10, pady=5)
+        self.voice_to_meeting_dropdown.bind("<<ComboboxSelected>>", self.apply_live_settings)
         
         tk.Label(lang_frame, text="Voice to you:", font=("Arial", 10)).grid(row=3, column=0, sticky=tk.W, pady=5)
         self.voice_to_you_var = tk.StringVar()
@@ -1273,6 +6662,7 @@ class TranslatorGUI:
             font=("Arial", 9)
         )
         self.voice_to_you_dropdown.grid(row=3, column=1, padx=10, pady=5)
+        self.voice_to_you_dropdown.bind("<<ComboboxSelected>>", self.apply_live_settings)
         
         self.on_language_change()
         
@@ -1447,7 +6837,8 @@ class TranslatorGUI:
             messagebox.showwarning("No Device", "Select Virtual Cable OUT first!")
             return
         
-        self.translator.set_output_device(self.output_device_var.get())
+        if not self.is_running:
+            self.translator.set_output_device(self.output_device_var.get())
         self.update_status("🔊 Testing...")
         
         duration = 1.0
@@ -1458,12 +6849,8 @@ class TranslatorGUI:
         test_audio_bytes = test_audio.tobytes()
         
         try:
-            success = self.translator.play_audio_to_device(
-                test_audio_bytes, 
-                self.translator.virtual_output_stream, 
-                "Virtual Cable OUT",
-                self.translator.output_device_sample_rate
-            )
+            # Mixed in under any translation playing, so the test can run mid-meeting
+            success = self.translator.play_notification("outgoing", test_audio_bytes, 44100)
             
             if success:
                 self.update_status("✅ Test beep sent!")
@@ -1479,7 +6866,8 @@ class TranslatorGUI:
             messagebox.showwarning("No Device", "Select Speakers first!")
             return
         
-        self.translator.set_speaker_device(self.speaker_device_var.get())
+        if not self.is_running:
+            self.translator.set_speaker_device(self.speaker_device_var.get())
         self.update_status("🔊 Testing...")
         
         duration = 1.0
@@ -1490,12 +6878,7 @@ class TranslatorGUI:
         test_audio_bytes = test_audio.tobytes()
         
         try:
-            success = self.translator.play_audio_to_device(
-                test_audio_bytes,
-                self.translator.speaker_stream,
-                "Speakers",
-                self.translator.speaker_device_sample_rate
-            )
+            success = self.translator.play_notification("incoming", test_audio_bytes, 44100)
             
             if success:
                 self.update_status("✅ Test beep played!")
@@ -1521,6 +6904,23 @@ class TranslatorGUI:
             self.voice_to_you_dropdown['values'] = voices
             if voices:
                 self.voice_to_you_dropdown.set(voices[0])
+        
+        self.apply_live_settings()
+    
+    def apply_live_settings(self, event=None):
+        """Hand changed languages or voices to the running session (no restart needed)"""
+        if not self.is_running:
+            return
+        source_lang = self.source_lang_var.get()
+        target_lang = self.target_lang_var.get()
+        if source_lang == target_lang:
+            messagebox.showwarning("Invalid Selection", "Please select different languages!")
+            return
+        
+        voice_to_meeting = SUPPORTED_LANGUAGES[target_lang]["voices"].get(self.voice_to_meeting_var.get())
+        voice_to_you = SUPPORTED_LANGUAGES[source_lang]["voices"].get(self.voice_to_you_var.get())
+        if self.translator.reconfigure(source_lang, target_lang, voice_to_meeting, voice_to_you):
+            self.update_status(f"🔁 Now translating {source_lang} ⇄ {target_lang}")
     
     def update_status(self, message, error=False):
         """Update status"""
@@ -1559,8 +6959,6 @@ class TranslatorGUI:
             
             self.is_running = True
             self.start_button.config(text="🔴 Stop", bg="#E74C3C")
-            self.test_vb_out_button.config(state=tk.DISABLED)
-            self.test_speaker_button.config(state=tk.DISABLED)
             self.update_status("🚀 Starting...")
             
             try:
@@ -1575,15 +6973,11 @@ class TranslatorGUI:
             except Exception as e:
                 self.is_running = False
                 self.start_button.config(text="🟢 Start Translation", bg="#27AE60")
-                self.test_vb_out_button.config(state=tk.NORMAL)
-                self.test_speaker_button.config(state=tk.NORMAL)
                 messagebox.showerror("Start Failed", str(e))
         else:
             self.is_running = False
             self.translator.stop()
             self.start_button.config(text="🟢 Start Translation", bg="#27AE60")
-            self.test_vb_out_button.config(state=tk.NORMAL)
-            self.test_speaker_button.config(state=tk.NORMAL)
             self.update_status("ℹ️ Stopped")
             self.progress.stop()
             self.mic_level_bar.config(value=0)
@@ -1603,8 +6997,146 @@ class TranslatorGUI:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="VoiceBridge - bidirectional real-time voice translator")
+    parser.add_argument("--benchmark-stt", metavar="WAV",
+                        help="benchmark the local recognizer on a WAV file and exit")
+    parser.add_argument("--language", default="en-US", help="language code for --benchmark-stt")
+    parser.add_argument("--benchmark-encoding", metavar="WAV",
+                        help="compare LINEAR16, FLAC and Ogg Opus STT upload cost on a WAV file and exit")
+    parser.add_argument("--model", default=LOCAL_STT_MODEL or "base", help="local Whisper model size")
+    parser.add_argument("--replay-mic", metavar="WAV", help="replay a recording as YOUR microphone")
+    parser.add_argument("--replay-meeting", metavar="WAV", help="replay a recording as the meeting audio")
+    parser.add_argument("--speed", default="1.0", help="replay speed multiplier, or 'max' for as fast as possible")
+    parser.add_argument("--batch", metavar="WAV",
+                        help="translate a recorded meeting (spoken in --source-lang) offline and exit")
+    parser.add_argument("--batch-output", metavar="WAV",
+                        help="translated track for --batch (default <input>_<target>.wav)")
+    parser.add_argument("--transcript", metavar="FILE",
+                        help="time-aligned transcript for --batch: .srt subtitles, otherwise JSON")
+    parser.add_argument("--workers", type=int, default=4, help="segments translated in parallel by --batch")
+    parser.add_argument("--source-lang", default="English (US)", help="language you speak (replay, batch)")
+    parser.add_argument("--target-lang", default="Hindi", help="language they speak (replay, batch)")
+    parser.add_argument("--out-dir", help="write translated output to WAV files here instead of discarding it")
+    parser.add_argument("--report", help="write the replay or batch report to this JSON file")
+    parser.add_argument("--stub-backends", action="store_true",
+                        help="use in-process stand-in engines instead of Google and Murf")
+    parser.add_argument("--frame-ms", type=float, help="capture/playback frame size in ms (default AUDIO_FRAME_MS)")
+    parser.add_argument("--stt-batch-ms", type=float, help="audio per STT request in ms (default STT_BATCH_MS)")
+    parser.add_argument("--measure-latency", action="store_true",
+                        help="open the audio devices with the configured frame size, report their latency and exit")
+    parser.add_argument("--search", metavar="QUERY",
+                        help="full-text search past meeting transcripts in the session store and exit")
+    parser.add_argument("--audio-backend", choices=["pyaudio", "null", "loopback", "wav"],
+                        help="audio devices to use (default AUDIO_BACKEND); null, loopback and wav need no sound "
+                             "hardware, wav plays --replay-mic/--replay-meeting as live devices")
+    parser.add_argument("--engine", choices=["threads", "processes"],
+                        help="run both directions in one process, or each in its own (default ENGINE_MODE)")
+    parser.add_argument("--benchmark-jitter", metavar="SECONDS", type=float,
+                        help="measure capture jitter under load with the threads and processes engines and exit")
+    parser.add_argument("--trace", metavar="JSON", help="record a Chrome trace of the replay to this file")
+    parser.add_argument("--sample-ms", type=float,
+                        help="also sample thread stacks every N ms into <trace>.folded")
+    args = parser.parse_args()
+    audio_backend = args.audio_backend or AUDIO_BACKEND
+    audio_options = {}
+    if audio_backend == "wav":
+        audio_options = {"mic_wav": args.replay_mic, "meeting_wav": args.replay_meeting, "out_dir": args.out_dir}
+    
+    if args.trace:
+        TRACER.enable()
+        if args.sample_ms:
+            TRACER.start_sampler(args.sample_ms / 1000.0)
+    
+    if args.search:
+        if not SESSION_DB:
+            parser.error("the session store is disabled (VOICEBRIDGE_DB is empty)")
+        store = SessionStore(SESSION_DB)
+        try:
+            print(json.dumps(store.search(args.search), indent=2, ensure_ascii=False))
+        finally:
+            store.close()
+        return
+    
+    if args.measure_latency:
+        translator = BidirectionalVoiceTranslator(require_google=False,
+                                                  audio_backend=create_audio_backend(audio_backend, **audio_options))
+        if args.frame_ms or args.stt_batch_ms:
+            translator.set_frame_size(args.frame_ms or translator.frame_ms, args.stt_batch_ms)
+        try:
+            print(json.dumps(translator.measure_audio_latency(), indent=2))
+        finally:
+            translator.cleanup()
+        return
+    
+    if (args.replay_mic or args.replay_meeting) and audio_backend != "wav":
+        # The harness swaps in WAV-file devices, so replay never touches sound hardware
+        translator = BidirectionalVoiceTranslator(require_google=not args.stub_backends,
+                                                  audio_backend=NullAudioBackend())
+        if args.frame_ms or args.stt_batch_ms:
+            translator.set_frame_size(args.frame_ms or translator.frame_ms, args.stt_batch_ms)
+        if args.stub_backends:
+            use_stub_backends(translator)
+        translator.warmup_enabled = False
+        speed = None if args.speed == "max" else float(args.speed)
+        harness = ReplayHarness(translator, args.replay_mic, args.replay_meeting, speed, args.out_dir)
+        try:
+            report = harness.run(args.source_lang, args.target_lang)
+        finally:
+            translator.cleanup()
+            if args.trace:
+                TRACER.stop_sampler()
+                TRACER.export(args.trace)
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if args.report:
+            Path(args.report).write_text(output, encoding="utf-8")
+            logger.info(f"📊 Replay report written to {args.report}")
+        else:
+            print(output)
+        return
+    
+    if args.batch:
+        translator = BidirectionalVoiceTranslator(require_google=not args.stub_backends,
+                                                  audio_backend=NullAudioBackend())
+        if args.stub_backends:
+            use_stub_backends(translator)
+        target_code = SUPPORTED_LANGUAGES[args.target_lang]["murf_translate_code"]
+        output_wav = args.batch_output or Path(args.batch).with_name(f"{Path(args.batch).stem}_{target_code}.wav")
+        try:
+            report = BatchTranslator(translator, args.workers).run(
+                args.batch, args.source_lang, args.target_lang,
+                output_wav=output_wav, transcript_path=args.transcript
+            )
+        finally:
+            translator.cleanup()
+        logger.info(f"📼 Batch done: {report['audio_seconds']}s of audio in {report['wall_seconds']}s "
+                    f"({report['speedup']}x), {report['failed']} failed segments")
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if args.report:
+            Path(args.report).write_text(output, encoding="utf-8")
+            logger.info(f"📊 Batch report written to {args.report}")
+        else:
+            print(output)
+        return
+    
+    if args.benchmark_jitter:
+        report = benchmark_capture_jitter(args.benchmark_jitter, args.frame_ms or 20.0,
+                                          backend_spec=(args.audio_backend or "null", audio_options))
+        print(json.dumps(report, indent=2))
+        return
+    
+    if args.benchmark_encoding:
+        print(json.dumps(benchmark_stt_encoding(args.benchmark_encoding), indent=2))
+        return
+    
+    if args.benchmark_stt:
+        pool = LocalRecognizerPool(args.model, LOCAL_STT_WORKERS)
+        report = benchmark_recognizer(LocalWhisperRecognitionBackend(pool), args.benchmark_stt, args.language)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        pool.shutdown()
+        return
+    
     root = tk.Tk()
-    app = TranslatorGUI(root)
+    app = TranslatorGUI(root, audio_backend, args.engine or ENGINE_MODE, audio_options)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
     root.mainloop()
 